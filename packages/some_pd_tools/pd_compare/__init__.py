@@ -1,4 +1,15 @@
 from ._module_compare import compare
+from ._module_compare_async import compare_async
 from ._module_compare_dtypes import compare_dtypes
+from ._module_compare_iter import compare_iter
 from ._module_compare_lists import compare_lists
-from ._module_compute_equality_df import compute_equality_df
\ No newline at end of file
+from ._module_compare_many import compare_many
+from ._module_compare_n import compare_n
+from ._module_comparator import Comparator
+from ._module_comparators import (
+    datetime_comparator,
+    decimal_comparator,
+    float_tolerance_comparator,
+    normalized_str_comparator,
+)
+from ._module_compute_equality_df import compute_equality_df
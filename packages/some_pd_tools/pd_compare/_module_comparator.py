@@ -0,0 +1,53 @@
+import pandas as pd
+
+from . import _module_compare
+
+
+class Comparator:
+    """Compares many DataFrames to the same baseline using `pd_compare.compare()`, doing once the work that only depends on the baseline.
+
+    When created, the baseline is sorted (rows and columns), its columns and indexes are listed with their sets and duplicates, and their sorted lists are computed. Every call to `compare()` reuses them, as well as the hash table of the sorted baseline's index (built by pandas the first time it's used) and the hashes of the baseline's columns (computed the first time a column is hashed, when using `renamed_cols` or `match_rows`). The result is the same as `pd_compare.compare(baseline, df2, ...)`.
+
+    The baseline must not be modified after creating the Comparator. When using `on`, rows are sorted using the keys of both DataFrames, so only the parameters are reused.
+
+    Parameters
+    ----------
+    baseline : pd.DataFrame
+        The DataFrame every other DataFrame is compared to, the first DataFrame of `pd_compare.compare()`.
+    df1_name : str, optional
+        The baseline's name, by default 'df1'.
+    **kwargs
+        Parameters of `pd_compare.compare()` used for every comparison, they can be overridden in `compare()`.
+
+    Raises
+    ------
+    ValueError
+        'baseline must be of type pd.DataFrame.'
+    ValueError
+        'df1_name must be of type str.'
+    """
+
+    def __init__(self, baseline: pd.DataFrame, df1_name: str = 'df1', **kwargs):
+        if not isinstance(baseline, pd.DataFrame):
+            raise ValueError('baseline must be of type pd.DataFrame.')
+        if not isinstance(df1_name, str):
+            raise ValueError('df1_name must be of type str.')
+        self.baseline = baseline
+        self.df1_name = df1_name
+        self.kwargs = kwargs
+        self._baseline = _module_compare._prepare_baseline(baseline)
+
+    def compare(
+        self, df2: pd.DataFrame, df2_name: str = 'df2', **kwargs
+    ) -> tuple[bool, bool, dict]:
+        '''Compare the baseline to df2, see `pd_compare.compare()` for `**kwargs` and what it returns.'''
+        return _module_compare._run_compare_gen(
+            _module_compare._compare_gen(
+                df1=self.baseline,
+                df2=df2,
+                df1_name=self.df1_name,
+                df2_name=df2_name,
+                **{**self.kwargs, **kwargs},
+                _baseline=self._baseline,
+            )
+        )
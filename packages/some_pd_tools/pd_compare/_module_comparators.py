@@ -0,0 +1,183 @@
+import decimal
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+
+def datetime_comparator() -> Callable:
+    """Return a comparator for datetime and timedelta columns that compares their int64 values.
+
+    Timezone aware datetimes are compared as UTC instants, so the same instant in different
+    timezones is equal. Different units (e.g. 'ns' and 'us') are converted to 'ns'.
+
+    Returns
+    -------
+    Callable
+        A comparator to be used in the `comparators` parameter of `pd_compare.compute_equality_df()` or `pd_compare.compare()`.
+    """
+
+    def comparator(values1: pd.Series, values2: pd.Series) -> np.ndarray:
+        return _datetimelike_as_int64(values1) == _datetimelike_as_int64(values2)
+
+    return comparator
+
+
+def _datetimelike_as_int64(values: pd.Series) -> np.ndarray:
+    '''Return the int64 values (nanoseconds, UTC if timezone aware) of datetime or timedelta values.'''
+    if not (
+        pd.api.types.is_datetime64_any_dtype(values.dtype)
+        or pd.api.types.is_timedelta64_dtype(values.dtype)
+    ):
+        values = pd.to_datetime(values)
+    # asi8 of a timezone aware array contains the UTC values, NaT is the minimum int64
+    return values.array.as_unit('ns').asi8
+
+
+def float_tolerance_comparator(rtol: float = 1e-05, atol: float = 1e-08) -> Callable:
+    """Return a comparator for numeric columns that considers close values equal.
+
+    Values are equal if `abs(value1 - value2) <= atol + rtol * abs(value2)`, see `numpy.isclose()`.
+
+    Parameters
+    ----------
+    rtol : float, optional
+        The relative tolerance, by default 1e-05.
+    atol : float, optional
+        The absolute tolerance, by default 1e-08.
+
+    Returns
+    -------
+    Callable
+        A comparator to be used in the `comparators` parameter of `pd_compare.compute_equality_df()` or `pd_compare.compare()`.
+
+    Raises
+    ------
+    ValueError
+        'rtol and atol must be non negative numbers.'
+    """
+    if (
+        isinstance(rtol, bool)
+        or isinstance(atol, bool)
+        or not isinstance(rtol, (int, float))
+        or not isinstance(atol, (int, float))
+        or rtol < 0
+        or atol < 0
+    ):
+        raise ValueError('rtol and atol must be non negative numbers.')
+
+    def comparator(values1: pd.Series, values2: pd.Series) -> np.ndarray:
+        return np.isclose(
+            values1.to_numpy(dtype='float64', na_value=np.nan),
+            values2.to_numpy(dtype='float64', na_value=np.nan),
+            rtol=rtol,
+            atol=atol,
+        )
+
+    return comparator
+
+
+def decimal_comparator(places: int) -> Callable:
+    """Return a comparator for columns containing decimal.Decimal values (or numbers).
+
+    Values are rounded to `places` decimal places (rounding half to even) and compared as scaled
+    integers, e.g. with `places=2` the values Decimal('1.005') and Decimal('1.00') are both 100.
+
+    Parameters
+    ----------
+    places : int
+        The number of decimal places to use when comparing.
+
+    Returns
+    -------
+    Callable
+        A comparator to be used in the `comparators` parameter of `pd_compare.compute_equality_df()` or `pd_compare.compare()`.
+
+    Raises
+    ------
+    ValueError
+        'places must be a positive integer.'
+    """
+    if isinstance(places, bool) or not isinstance(places, int) or places < 0:
+        raise ValueError('places must be a positive integer.')
+
+    def comparator(values1: pd.Series, values2: pd.Series) -> np.ndarray:
+        return _decimal_as_scaled_int(values1, places) == _decimal_as_scaled_int(values2, places)
+
+    return comparator
+
+
+def _decimal_as_scaled_int(values: pd.Series, places: int) -> np.ndarray:
+    '''Return an object array with the values multiplied by 10**places as int, None if missing.'''
+    scaled = np.empty(len(values), dtype=object)
+    for pos, value in enumerate(values):
+        if pd.isna(value):
+            scaled[pos] = None
+        else:
+            if not isinstance(value, decimal.Decimal):
+                value = decimal.Decimal(str(value))
+            scaled[pos] = int(
+                value.scaleb(places).to_integral_value(rounding=decimal.ROUND_HALF_EVEN)
+            )
+    return scaled
+
+
+def normalized_str_comparator(
+    strip: bool = True,
+    casefold: bool = True,
+    collapse_spaces: bool = True,
+    unicode_form: None | str = 'NFC',
+) -> Callable:
+    """Return a comparator for string columns that compares normalized strings.
+
+    Values that are not strings are converted to strings before being normalized.
+
+    Parameters
+    ----------
+    strip : bool, optional
+        Whether to remove leading and trailing whitespace, by default True.
+    casefold : bool, optional
+        Whether to ignore the case, by default True.
+    collapse_spaces : bool, optional
+        Whether to replace consecutive whitespace characters by a single space, by default True.
+    unicode_form : None | str, optional
+        The unicode normalization form ('NFC', 'NFKC', 'NFD' or 'NFKD'), by default 'NFC'. No unicode normalization is done if None.
+
+    Returns
+    -------
+    Callable
+        A comparator to be used in the `comparators` parameter of `pd_compare.compute_equality_df()` or `pd_compare.compare()`.
+
+    Raises
+    ------
+    ValueError
+        'strip, casefold and collapse_spaces must be of type bool.'
+    ValueError
+        "unicode_form must be None or one of 'NFC', 'NFKC', 'NFD' or 'NFKD'."
+    """
+    if (
+        not isinstance(strip, bool)
+        or not isinstance(casefold, bool)
+        or not isinstance(collapse_spaces, bool)
+    ):
+        raise ValueError('strip, casefold and collapse_spaces must be of type bool.')
+    if unicode_form not in (None, 'NFC', 'NFKC', 'NFD', 'NFKD'):
+        raise ValueError("unicode_form must be None or one of 'NFC', 'NFKC', 'NFD' or 'NFKD'.")
+
+    def normalize(values: pd.Series) -> pd.Series:
+        values = values.astype('string')
+        if unicode_form is not None:
+            values = values.str.normalize(unicode_form)
+        if collapse_spaces:
+            values = values.str.replace(r'\s+', ' ', regex=True)
+        if strip:
+            values = values.str.strip()
+        if casefold:
+            values = values.str.casefold()
+        return values
+
+    def comparator(values1: pd.Series, values2: pd.Series) -> np.ndarray:
+        equality = normalize(values1).array == normalize(values2).array
+        return equality.to_numpy(dtype=bool, na_value=False)
+
+    return comparator
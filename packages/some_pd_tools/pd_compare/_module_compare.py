@@ -1,30 +1,221 @@
+import concurrent.futures
+import functools
+import hashlib
+import importlib.util
 import io
 import os
 import pathlib
+import threading
+import time
+from typing import Callable, Generator
 
+import numpy as np
 import pandas as pd
 
 from .. import pd_format
+from . import _module_diff_files
 from . import _module_report_formatting as f
 from ._module_compare_dtypes import compare_dtypes
-from ._module_compare_lists import compare_lists
+from ._module_compare_lists import _compare_lists, _list_set_and_dups
 from ._module_compute_equality_df import compute_equality_df
+from ._module_profiling import StageProfiler
 
 __all__ = [
     'compare',
 ]
 
+# Maximum number of cell ranges added to a single conditional format rule in the Excel file
+_XLS_MAX_RANGES_PER_RULE = 1000
+# Excel's worksheet limits
+# See https://support.microsoft.com/en-us/office/excel-specifications-and-limits-1672b34d-7043-467e-8e27-269d656771c3
+_XLS_MAX_ROWS = 1_048_576
+_XLS_MAX_COLS = 16_384
+
+# Number of rows compared when looking for near-identical renamed columns
+_RENAMED_COLS_SAMPLE_ROWS = 1000
+
+# Number of row labels shown for every pattern of different columns
+_DIFF_PATTERNS_SAMPLE_ROWS = 5
+
+
+def _diff_ranges_for_excel(
+    equality_df: pd.DataFrame,
+    xls_df: pd.DataFrame,
+    df1_name: str,
+) -> list:
+    '''Return the ranges of cells in `xls_df` that contain different values.
+
+    Each range is a tuple (first_row, first_col, last_row, last_col) using `xls_df` positions
+    (0-based, not counting the index or the columns' header). A range covers the df1 and df2 columns
+    for a given compared column and consecutive rows where the values are different, so rows with
+    consecutive differences are grouped in a single range.
+    '''
+    ranges = []
+    diff_values = ~equality_df.to_numpy(dtype=bool)
+    for col_pos, col in enumerate(equality_df.columns):
+        diff_col = diff_values[:, col_pos]
+        if not diff_col.any():
+            continue
+        # Find the start and end of consecutive True values
+        edges = np.diff(np.concatenate(([0], diff_col.view(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
+        first_col = xls_df.columns.get_loc((col, df1_name))
+        ranges.extend(
+            (int(start), first_col, int(end), first_col + 1) for start, end in zip(starts, ends)
+        )
+    return ranges
+
+
+# strftime directives and their equivalent Excel number format
+# See https://support.microsoft.com/en-us/office/review-guidelines-for-customizing-a-number-format-c0a1d1fa-d3f4-4018-96b7-9c9354dd99f5
+_STRFTIME_TO_EXCEL = {
+    '%Y': 'yyyy',
+    '%y': 'yy',
+    '%m': 'mm',
+    '%B': 'mmmm',
+    '%b': 'mmm',
+    '%d': 'dd',
+    '%A': 'dddd',
+    '%a': 'ddd',
+    '%H': 'hh',
+    '%I': 'hh',
+    '%M': 'mm',
+    '%S': 'ss',
+    '%f': '000',
+    '%p': 'AM/PM',
+    '%%': '%',
+}
+
+
+def _strftime_to_excel_format(strftime_str: str) -> str:
+    '''Transform a strftime format (like '%Y-%m-%d %H:%M:%S') to an Excel number format (like 'yyyy-mm-dd hh:mm:ss').
+
+    Raises a ValueError if a directive can't be represented in Excel. Excel reads 'mm' as minutes
+    only right after the hours, so %M must follow %H or %I (only separators in between), and it
+    shows a 24-hour clock without 'AM/PM', so %I requires %p.
+    '''
+    excel_format = ''
+    directives = []
+    # The last directive, None if a character other than a separator was found after it
+    last_directive = None
+    i = 0
+    while i < len(strftime_str):
+        char = strftime_str[i]
+        if char == '%':
+            directive = strftime_str[i : i + 2]
+            if directive not in _STRFTIME_TO_EXCEL:
+                raise ValueError(
+                    f'xls_datetime_rpl contains a directive not supported in Excel: {directive}.'
+                )
+            if directive == '%M' and last_directive not in ('%H', '%I'):
+                raise ValueError(
+                    'xls_datetime_rpl must contain %M right after %H or %I (e.g. %H:%M).'
+                )
+            excel_format += _STRFTIME_TO_EXCEL[directive]
+            directives.append(directive)
+            last_directive = directive
+            i += 2
+            continue
+        # Characters with a meaning in Excel number formats must be escaped
+        if char in ' -:/.,()':
+            excel_format += char
+        else:
+            excel_format += f'\\{char}'
+            last_directive = None
+        i += 1
+    if '%I' in directives and '%p' not in directives:
+        raise ValueError('xls_datetime_rpl must contain %p when using %I.')
+    return excel_format
+
+
+def _excel_number_format(precision: None | int, thousands_sep: bool, is_float: bool) -> None | str:
+    '''Return the Excel number format for a numeric column, None if no format is needed.'''
+    if thousands_sep is False and (precision is None or is_float is False):
+        return None
+    number_format = '#,##0' if thousands_sep is True else '0'
+    if is_float is True and precision is not None and precision > 0:
+        number_format += '.' + '0' * precision
+    return number_format
+
+
+def _plan_excel_sheets(
+    df: pd.DataFrame,
+    freeze_on_colindex: int,
+) -> list:
+    '''Plan how `df` is split in sheets so every sheet fits Excel's limits.
+
+    Rows are split in chunks and compared columns are split in groups, a compared column (its values
+    for df1, df2 and optionally 'different') is never split between sheets. Every sheet contains the
+    fixed columns (the first `freeze_on_colindex` columns).
+
+    Returns a list of tuples (first_row, last_row_excl, col_positions) with positions in `df`.
+    '''
+    # The index is always shown in the Excel file, it uses one column per level and one header row
+    index_cols = df.index.nlevels
+    header_rows = df.columns.nlevels + 1
+    max_rows_per_sheet = _XLS_MAX_ROWS - header_rows
+    max_cols_per_sheet = _XLS_MAX_COLS - index_cols - freeze_on_colindex
+
+    # Group consecutive columns belonging to the same compared column
+    col_groups = []
+    for col_pos in range(freeze_on_colindex, len(df.columns)):
+        if len(col_groups) > 0 and df.columns[col_pos][0] == df.columns[col_groups[-1][0]][0]:
+            col_groups[-1].append(col_pos)
+        else:
+            col_groups.append([col_pos])
+
+    # Pack the groups of columns in as few sheets as possible
+    sheets_col_positions = [[]]
+    for col_group in col_groups:
+        if len(sheets_col_positions[-1]) + len(col_group) > max_cols_per_sheet:
+            sheets_col_positions.append([])
+        sheets_col_positions[-1].extend(col_group)
+
+    fixed_col_positions = list(range(freeze_on_colindex))
+    plan = []
+    for first_row in range(0, max(len(df.index), 1), max_rows_per_sheet):
+        for col_positions in sheets_col_positions:
+            plan.append(
+                (
+                    first_row,
+                    min(first_row + max_rows_per_sheet, len(df.index)),
+                    fixed_col_positions + col_positions,
+                )
+            )
+    return plan
+
+
+def _excel_sheet_names(plan: list) -> list:
+    '''Return the names of the sheets containing the data for a plan from `_plan_excel_sheets()`.'''
+    return ['Sheet1'] if len(plan) == 1 else [f'Sheet{i+1}' for i in range(len(plan))]
+
+
+def _excel_label(label: object) -> object:
+    '''Return a label that can be written in an Excel cell, tuples (from a MultiIndex) as str.'''
+    return str(label) if isinstance(label, tuple) else label
+
 
 def _save_excel(
     df: pd.DataFrame,
     path: str,
     freeze_on_colindex: list,
     datetime_rpl_str: str,
-):
-    if datetime_rpl_str != '':
-        for col in df.columns:
-            if pd.api.types.is_datetime64_any_dtype(df[col]):
-                df[col] = df[col].dt.strftime(datetime_rpl_str)
+    diff_ranges: None | list = None,
+    number_precision: None | int = None,
+    thousands_sep: bool = False,
+) -> list:
+    '''Save `df` to an Excel file, returns the list of sheet names containing the data.
+
+    If `df` doesn't fit Excel's limits (rows or columns), the data is split in several sheets and a
+    sheet called 'Summary' is added explaining what each sheet contains.
+    '''
+    # Excel doesn't support timezones, datetimes are written in their local time
+    tz_cols = [col for col in df.columns if isinstance(df[col].dtype, pd.DatetimeTZDtype)]
+    if len(tz_cols) > 0:
+        df = df.copy()  # Avoid modifying the DataFrame passed
+        for col in tz_cols:
+            df[col] = df[col].dt.tz_localize(None)
 
     # If needed directly save to Excel from Pandas
     # df.to_excel(f'tmp_comparison_{now_str()}.xlsx', freeze_panes=(1, 6))
@@ -32,23 +223,106 @@ def _save_excel(
     # From https://xlsxwriter.readthedocs.io/example_pandas_autofilter.html
 
     # Create a Pandas Excel writer using XlsxWriter as the engine.
-    writer = pd.ExcelWriter(path, engine="xlsxwriter")
+    # Datetimes are written as native Excel dates (not strings) using a number format
+    datetime_format = None
+    if datetime_rpl_str != '':
+        datetime_format = _strftime_to_excel_format(datetime_rpl_str)
+    writer = pd.ExcelWriter(
+        path,
+        engine="xlsxwriter",
+        datetime_format=datetime_format,
+        date_format=datetime_format,
+    )
 
     show_index = True
     add_if_show_index = 1 if show_index is True else 0
+    # The index uses one column per level (a MultiIndex uses several columns)
+    index_cols = df.index.nlevels if show_index is True else 0
+    # The header uses one row per column level plus one row for the index names
+    header_rows = df.columns.nlevels + add_if_show_index
+
+    # The split is planned before writing anything
+    plan = _plan_excel_sheets(df, freeze_on_colindex=freeze_on_colindex)
+    sheet_names = _excel_sheet_names(plan)
+
+    if len(plan) > 1:
+        summary_df = pd.DataFrame(
+            [
+                {
+                    'sheet': sheet_name,
+                    'first_row': _excel_label(df.index[first_row]) if len(df.index) > 0 else None,
+                    'last_row': (
+                        _excel_label(df.index[last_row_excl - 1]) if len(df.index) > 0 else None
+                    ),
+                    'rows_count': last_row_excl - first_row,
+                    'first_column': _excel_label(df.columns[col_positions[freeze_on_colindex]][0]),
+                    'last_column': _excel_label(df.columns[col_positions[-1]][0]),
+                }
+                for sheet_name, (first_row, last_row_excl, col_positions) in zip(sheet_names, plan)
+            ]
+        )
+        summary_df.to_excel(writer, sheet_name='Summary', index=False)
+        writer.sheets['Summary'].autofit()
+
+    workbook = writer.book
+    for sheet_name, (first_row, last_row_excl, col_positions) in zip(sheet_names, plan):
+        sheet_df = df.iloc[first_row:last_row_excl, col_positions]
+
+        # Diff ranges for this sheet, with positions relative to `sheet_df`
+        sheet_diff_ranges = None
+        if diff_ranges is not None:
+            new_col_positions = {old: new for new, old in enumerate(col_positions)}
+            sheet_diff_ranges = [
+                (
+                    max(range_first_row, first_row) - first_row,
+                    new_col_positions[range_first_col],
+                    min(range_last_row, last_row_excl - 1) - first_row,
+                    new_col_positions[range_last_col],
+                )
+                for range_first_row, range_first_col, range_last_row, range_last_col in diff_ranges
+                if range_first_col in new_col_positions
+                and range_first_row < last_row_excl
+                and range_last_row >= first_row
+            ]
+
+        # Convert the DataFrame to an XlsxWriter Excel object. We also turn off the
+        # index column at the left of the output DataFrame.
+        sheet_df.to_excel(
+            writer,
+            sheet_name=sheet_name,
+            index=show_index,
+        )
 
-    # Convert the DataFrame to an XlsxWriter Excel object. We also turn off the
-    # index column at the left of the output DataFrame.
-    df.to_excel(
-        writer,
-        sheet_name="Sheet1",
-        index=show_index,
-    )
+        _format_excel_sheet(
+            workbook=workbook,
+            worksheet=writer.sheets[sheet_name],
+            df=sheet_df,
+            freeze_on_colindex=freeze_on_colindex,
+            header_rows=header_rows,
+            index_cols=index_cols,
+            diff_ranges=sheet_diff_ranges,
+            number_precision=number_precision,
+            thousands_sep=thousands_sep,
+        )
+
+    # Close the Pandas Excel writer and output the Excel file.
+    writer.close()
+
+    return sheet_names
 
-    # Get the xlsxwriter workbook and worksheet objects.
-    # workbook = writer.book
-    worksheet = writer.sheets["Sheet1"]
 
+def _format_excel_sheet(
+    workbook,
+    worksheet,
+    df: pd.DataFrame,
+    freeze_on_colindex: int,
+    header_rows: int,
+    index_cols: int,
+    diff_ranges: None | list,
+    number_precision: None | int,
+    thousands_sep: bool,
+):
+    '''Add the autofilter, freeze panes, number formats and conditional formats to a sheet.'''
     # Get the dimensions of the DataFrame.
     (max_row, max_col) = df.shape
 
@@ -56,16 +330,65 @@ def _save_excel(
     # worksheet.set_column(0, max_col, 12)
 
     # Set the autofilter.
-    worksheet.autofilter(1, 1, max_row, max_col)
+    worksheet.autofilter(
+        header_rows - 2, index_cols, header_rows + max_row - 1, index_cols + max_col - 1
+    )
 
     # From https://xlsxwriter.readthedocs.io/example_panes.html
-    worksheet.freeze_panes(2, freeze_on_colindex + add_if_show_index)
+    worksheet.freeze_panes(2, freeze_on_colindex + index_cols)
+
+    # Numbers are written as native Excel numbers (not strings) using a number format
+    # This is done before `worksheet.autofit()` so the column width is not overwritten
+    for col_idx, col in enumerate(df.columns):
+        if not pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col]):
+            continue
+        number_format = _excel_number_format(
+            precision=number_precision,
+            thousands_sep=thousands_sep,
+            is_float=pd.api.types.is_float_dtype(df[col]),
+        )
+        if number_format is not None:
+            worksheet.set_column(
+                col_idx + index_cols,
+                col_idx + index_cols,
+                None,
+                workbook.add_format({'num_format': number_format}),
+            )
 
     # From https://stackoverflow.com/a/75120836/1071459
     worksheet.autofit()
 
-    # Close the Pandas Excel writer and output the Excel file.
-    writer.close()
+    # Highlight different cells using conditional formatting, this replaces the 'different' column
+    # See https://xlsxwriter.readthedocs.io/working_with_conditional_formats.html
+    if diff_ranges is not None and len(diff_ranges) > 0:
+        from xlsxwriter.utility import xl_range
+
+        first_data_row = header_rows
+        diff_format = workbook.add_format({'bg_color': '#FFC7CE', 'font_color': '#9C0006'})
+        for i in range(0, len(diff_ranges), _XLS_MAX_RANGES_PER_RULE):
+            ranges_chunk = diff_ranges[i : i + _XLS_MAX_RANGES_PER_RULE]
+            multi_range = ' '.join(
+                xl_range(
+                    first_row + first_data_row,
+                    first_col + index_cols,
+                    last_row + first_data_row,
+                    last_col + index_cols,
+                )
+                for first_row, first_col, last_row, last_col in ranges_chunk
+            )
+            first_row, first_col, last_row, last_col = ranges_chunk[0]
+            worksheet.conditional_format(
+                first_row + first_data_row,
+                first_col + index_cols,
+                last_row + first_data_row,
+                last_col + index_cols,
+                {
+                    'type': 'formula',
+                    'criteria': 'TRUE',
+                    'format': diff_format,
+                    'multi_range': multi_range,
+                },
+            )
 
 
 def _dtypes_simp_and_eqlty_check(
@@ -148,6 +471,598 @@ def _dtypes_simp_and_eqlty_check(
     )
 
 
+def _unify_categories(
+    df1: pd.DataFrame, df2: pd.DataFrame
+) -> tuple[list, pd.DataFrame, pd.DataFrame]:
+    """Make categorical columns with different categories in df1 and df2 use the same categories.
+
+    The categories used are df1's categories followed by df2's categories not in df1. Only columns
+    that are categorical in both DataFrames, with the same `ordered` value, are changed.
+    `Categorical.set_categories()` only remaps the codes, the values are not decoded.
+
+    Returns a tuple with the sorted list of changed columns and the (new) DataFrames.
+    """
+    cols_unified = []
+    for col in df1.columns:
+        dtype1 = df1[col].dtype
+        dtype2 = df2[col].dtype
+        if (
+            isinstance(dtype1, pd.CategoricalDtype)
+            and isinstance(dtype2, pd.CategoricalDtype)
+            and dtype1.ordered == dtype2.ordered
+            and dtype1 != dtype2
+        ):
+            cols_unified.append(col)
+
+    if len(cols_unified) == 0:
+        return [], df1, df2
+
+    # Shallow copies so the columns are only replaced in the returned DataFrames
+    df1 = df1.copy(deep=False)
+    df2 = df2.copy(deep=False)
+    for col in cols_unified:
+        categories = df1[col].cat.categories.append(
+            df2[col].cat.categories.difference(df1[col].cat.categories, sort=False)
+        )
+        df1[col] = df1[col].cat.set_categories(categories)
+        df2[col] = df2[col].cat.set_categories(categories)
+    return pd_format.obj_as_sorted_list(cols_unified), df1, df2
+
+
+def _index_by_keys(
+    df1: pd.DataFrame, df2: pd.DataFrame, on: list
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Return df1 and df2 without the `on` columns, indexed and sorted by them, columns sorted.
+
+    Every key column is factorized jointly for both DataFrames (with sorted uniques) and the codes
+    are combined into a single int64 code per row, which sorts like the keys. Rows are sorted with
+    a single argsort of these codes and the index is built from the codes, without factorizing
+    the keys again.
+    """
+    len_df1 = len(df1.index)
+    keys_codes = np.zeros(len_df1 + len(df2.index), dtype='int64')
+    levels = []
+    cols_codes = []
+    for col in on:
+        values = pd.concat((df1[col], df2[col]), ignore_index=True)
+        try:
+            col_codes, uniques = pd.factorize(values, sort=True, use_na_sentinel=False)
+        except TypeError:
+            # Values that can't be sorted (e.g. mixed types)
+            col_codes, uniques = pd.factorize(values, sort=False, use_na_sentinel=False)
+        if (
+            len(levels) > 0
+            and len(keys_codes) > 0
+            and keys_codes.max() >= np.iinfo('int64').max // max(len(uniques), 1)
+        ):
+            # Avoid an overflow, the combined codes are factorized (order is kept)
+            keys_codes = pd.factorize(keys_codes, sort=True)[0].astype('int64')
+        keys_codes = keys_codes * len(uniques) + col_codes
+        levels.append(uniques)
+        cols_codes.append(col_codes)
+
+    dfs_keyed = []
+    for df, rows_slice in ((df1, slice(0, len_df1)), (df2, slice(len_df1, None))):
+        # Not a stable sort (faster), only rows with duplicated keys could change their order
+        order = np.argsort(keys_codes[rows_slice])
+        if len(on) == 1:
+            index = pd.Index(levels[0].take(cols_codes[0][rows_slice][order]), name=on[0])
+        else:
+            index = pd.MultiIndex(
+                levels=levels,
+                codes=[col_codes[rows_slice][order] for col_codes in cols_codes],
+                names=on,
+                verify_integrity=False,
+            )
+        # A single copy: rows and columns sorted and key columns dropped
+        cols_pos = np.flatnonzero(~df.columns.isin(on))
+        cols_pos = cols_pos[df.columns[cols_pos].argsort(kind='stable')]
+        df_keyed = df.iloc[order, cols_pos]
+        df_keyed.index = index
+        dfs_keyed.append(df_keyed)
+    return dfs_keyed[0], dfs_keyed[1]
+
+
+def _cols_hashes(df: pd.DataFrame, cols: list) -> dict:
+    '''Return the hash of every row of every column in `cols`, see `pd.util.hash_pandas_object()`.'''
+    return {col: pd.util.hash_pandas_object(df[col], index=False).to_numpy() for col in cols}
+
+
+def _combine_hashes(cols_hashes: list, num_rows: int) -> np.ndarray:
+    """Combine the rows' hashes of many columns into the rows' hashes of the DataFrame.
+
+    The result is the same as `pd.util.hash_pandas_object(df, index=False)` (which uses the same
+    combination), so columns hashed once can be combined many times.
+    """
+    if len(cols_hashes) == 0:
+        return np.array([], dtype='uint64')
+    mult = np.uint64(1000003)
+    combined = np.full(num_rows, 0x345678, dtype='uint64')
+    for col_num, col_hashes in enumerate(cols_hashes):
+        inverse_num = len(cols_hashes) - col_num
+        combined ^= col_hashes
+        combined *= mult
+        mult += np.uint64(82520 + inverse_num + inverse_num)
+    combined += np.uint64(97531)
+    return combined
+
+
+def _detect_renamed_cols(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    min_similarity: float,
+    df1_name: str,
+    df2_name: str,
+    rows_hashes1: None | dict = None,
+) -> pd.DataFrame:
+    """Find pairs of columns (one from df1 and one from df2) with identical or similar content.
+
+    df1 and df2 must have the same index. Every column is hashed once (values and dtypes must be
+    equal to get the same hash), columns with the same hash are paired in order. If
+    `min_similarity` is lower than 1, the remaining columns are paired by the share of equal
+    values in a sample of `_RENAMED_COLS_SAMPLE_ROWS` rows, best pairs first.
+
+    `rows_hashes1` are the hashes of df1's columns (see `_cols_hashes()`), computed if None.
+
+    Returns a DataFrame with the columns `df1_name`, `df2_name` and 'similarity', empty if df1 and
+    df2 have no rows (all their columns would have the same hash).
+    """
+    if len(df1.index) == 0:
+        return pd.DataFrame([], columns=[df1_name, df2_name, 'similarity'])
+    if rows_hashes1 is None:
+        rows_hashes1 = _cols_hashes(df1, df1.columns)
+    rows_hashes2 = _cols_hashes(df2, df2.columns)
+
+    # Identical content, one hash per column
+    cols_by_digest = {}
+    for col, rows_hashes in rows_hashes2.items():
+        digest = hashlib.blake2b(rows_hashes.tobytes(), digest_size=16).digest()
+        cols_by_digest.setdefault(digest, []).append(col)
+    pairs = []
+    for col, rows_hashes in rows_hashes1.items():
+        digest = hashlib.blake2b(rows_hashes.tobytes(), digest_size=16).digest()
+        if len(cols_by_digest.get(digest, [])) > 0:
+            pairs.append((col, cols_by_digest[digest].pop(0), 1.0))
+
+    # Similar content, using a sample of rows
+    if min_similarity < 1 and len(df1.index) > 0:
+        sample_pos = np.unique(
+            np.linspace(0, len(df1.index) - 1, num=min(len(df1.index), _RENAMED_COLS_SAMPLE_ROWS))
+            .round()
+            .astype('int64')
+        )
+        cols1 = [col for col in df1.columns if col not in {pair[0] for pair in pairs}]
+        cols2 = [col for col in df2.columns if col not in {pair[1] for pair in pairs}]
+        candidates = []
+        for col1 in cols1:
+            for col2 in cols2:
+                similarity = float(
+                    np.mean(rows_hashes1[col1][sample_pos] == rows_hashes2[col2][sample_pos])
+                )
+                if similarity >= min_similarity:
+                    candidates.append((similarity, col1, col2))
+        paired1 = set()
+        paired2 = set()
+        for similarity, col1, col2 in sorted(candidates, key=lambda c: c[0], reverse=True):
+            if col1 not in paired1 and col2 not in paired2:
+                pairs.append((col1, col2, similarity))
+                paired1.add(col1)
+                paired2.add(col2)
+
+    return pd.DataFrame(pairs, columns=[df1_name, df2_name, 'similarity'])
+
+
+def _is_diff_stats_dtype(dtype) -> bool:
+    '''Whether the dtype is numeric and can be converted to float64 (not bool nor complex).'''
+    return (
+        pd.api.types.is_numeric_dtype(dtype)
+        and not pd.api.types.is_bool_dtype(dtype)
+        and not pd.api.types.is_complex_dtype(dtype)
+    )
+
+
+def _numeric_diff_stats(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    equality_arr: np.ndarray,
+    cols_all_equal: np.ndarray,
+) -> pd.DataFrame:
+    """Return statistics of the differences for every numeric column with different values.
+
+    Only the different cells (according to `equality_arr`) of each column are converted to
+    float64, no copy of the DataFrames is done. Absolute and relative differences are computed for
+    cells where both values are finite, the relative difference is `abs(value1 - value2) /
+    max(abs(value1), abs(value2))`.
+
+    Returns a DataFrame with a row for every column (the index) and the columns 'diff_count',
+    'nan_mismatch_count', 'max_abs_diff', 'mean_abs_diff', 'max_rel_diff' and 'mean_rel_diff'.
+    """
+    stats = {}
+    for col_pos in np.flatnonzero(~cols_all_equal):
+        col = df1.columns[col_pos]
+        if not (_is_diff_stats_dtype(df1[col].dtype) and _is_diff_stats_dtype(df2[col].dtype)):
+            continue
+        rows_pos = np.flatnonzero(~equality_arr[:, col_pos])
+        values1 = df1[col].iloc[rows_pos].to_numpy(dtype='float64', na_value=np.nan)
+        values2 = df2[col].iloc[rows_pos].to_numpy(dtype='float64', na_value=np.nan)
+
+        finite = np.isfinite(values1) & np.isfinite(values2)
+        abs_diff = np.abs(values1[finite] - values2[finite])
+        denominator = np.maximum(np.abs(values1[finite]), np.abs(values2[finite]))
+        rel_diff = np.divide(
+            abs_diff, denominator, out=np.zeros_like(abs_diff), where=denominator > 0
+        )
+        has_diffs = len(abs_diff) > 0
+        stats[col] = {
+            'diff_count': len(rows_pos),
+            'nan_mismatch_count': int(np.count_nonzero(np.isnan(values1) != np.isnan(values2))),
+            'max_abs_diff': abs_diff.max() if has_diffs else np.nan,
+            'mean_abs_diff': abs_diff.mean() if has_diffs else np.nan,
+            'max_rel_diff': rel_diff.max() if has_diffs else np.nan,
+            'mean_rel_diff': rel_diff.mean() if has_diffs else np.nan,
+        }
+
+    return pd.DataFrame.from_dict(
+        stats,
+        orient='index',
+        columns=[
+            'diff_count',
+            'nan_mismatch_count',
+            'max_abs_diff',
+            'mean_abs_diff',
+            'max_rel_diff',
+            'mean_rel_diff',
+        ],
+    )
+
+
+def _print_table(rows: list[list[str]], stream: io.StringIO) -> None:
+    '''Print `rows` (the first one is the header) as a table, the first column left aligned.'''
+    widths = [max(len(row[pos]) for row in rows) for pos in range(len(rows[0]))]
+    bar = '|' + '|'.join('-' * width for width in widths) + '|'
+    f.print_plain(1, bar, file=stream)
+    for row_num, row in enumerate(rows):
+        f.print_plain(
+            1,
+            '|'
+            + '|'.join(
+                f'{value:<{width}}' if pos == 0 else f'{value:>{width}}'
+                for pos, (value, width) in enumerate(zip(row, widths))
+            )
+            + '|',
+            file=stream,
+        )
+        if row_num == 0:
+            f.print_plain(1, bar, file=stream)
+    f.print_plain(1, bar, file=stream)
+
+
+def _print_diff_stats_table(diff_stats_df: pd.DataFrame, stream: io.StringIO) -> None:
+    '''Print `diff_stats_df` as a table, numbers are shown with 4 significant digits.'''
+    rows = [['column', 'diffs', 'nan_diffs', 'max_abs', 'mean_abs', 'max_rel', 'mean_rel']]
+    for col, col_stats in zip(diff_stats_df.index, diff_stats_df.itertuples(index=False)):
+        rows.append(
+            [str(col), str(col_stats.diff_count), str(col_stats.nan_mismatch_count)]
+            + [
+                f'{value:.4g}'
+                for value in (
+                    col_stats.max_abs_diff,
+                    col_stats.mean_abs_diff,
+                    col_stats.max_rel_diff,
+                    col_stats.mean_rel_diff,
+                )
+            ]
+        )
+    _print_table(rows, stream)
+
+
+def _print_profile_table(profile_df: pd.DataFrame, stream: io.StringIO) -> None:
+    '''Print `profile_df` as a table, memory is shown in MB.'''
+    rows = [['stage', 'wall', 'cpu', 'mem_peak', 'mem_net', 'df1_shape', 'df2_shape']]
+    for stage, stage_profile in zip(profile_df.index, profile_df.itertuples(index=False)):
+        rows.append(
+            [
+                stage,
+                f'{stage_profile.wall_time:.3f}',
+                f'{stage_profile.cpu_time:.3f}',
+                f'{stage_profile.mem_peak / 2**20:.1f}',
+                f'{stage_profile.mem_net / 2**20:.1f}',
+                '' if stage_profile.df1_shape is None else str(stage_profile.df1_shape),
+                '' if stage_profile.df2_shape is None else str(stage_profile.df2_shape),
+            ]
+        )
+    _print_table(rows, stream)
+
+
+def _change_types(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    equality_arr: np.ndarray,
+    cols_all_equal: np.ndarray,
+) -> pd.DataFrame:
+    """Count the different cells of every column with different values by type of change.
+
+    The change types are:
+    - 'null_to_value': missing in df1 and not missing in df2.
+    - 'value_to_null': not missing in df1 and missing in df2.
+    - 'type_change': the Python types of the values are different (only for object columns, other
+      dtypes have a single type).
+    - 'increase' and 'decrease': the value in df2 is greater or lower (only for numeric columns).
+    - 'value_change': any other change.
+
+    Null changes are counted for all the columns at once using the mismatch mask and `isna()`
+    masks, the remaining changes only look at the different cells of every column.
+
+    Returns a DataFrame with a row for every column (the index) and a column for every change type.
+    """
+    cols_diff_pos = np.flatnonzero(~cols_all_equal)
+    diff_arr = ~equality_arr[:, cols_diff_pos]
+    isna1_arr = df1.iloc[:, cols_diff_pos].isna().to_numpy()
+    isna2_arr = df2.iloc[:, cols_diff_pos].isna().to_numpy()
+    values_diff_arr = diff_arr & ~isna1_arr & ~isna2_arr
+
+    change_types_df = pd.DataFrame(
+        {
+            'null_to_value': (diff_arr & isna1_arr & ~isna2_arr).sum(axis=0),
+            'value_to_null': (diff_arr & ~isna1_arr & isna2_arr).sum(axis=0),
+            'type_change': 0,
+            'increase': 0,
+            'decrease': 0,
+            'value_change': values_diff_arr.sum(axis=0),
+        },
+        index=df1.columns[cols_diff_pos],
+    )
+
+    for pos, col_pos in enumerate(cols_diff_pos):
+        rows_pos = np.flatnonzero(values_diff_arr[:, pos])
+        if len(rows_pos) == 0:
+            continue
+        col1 = df1.iloc[:, col_pos]
+        col2 = df2.iloc[:, col_pos]
+        if _is_diff_stats_dtype(col1.dtype) and _is_diff_stats_dtype(col2.dtype):
+            values1 = col1.iloc[rows_pos].to_numpy(dtype='float64', na_value=np.nan)
+            values2 = col2.iloc[rows_pos].to_numpy(dtype='float64', na_value=np.nan)
+            increase = np.count_nonzero(values2 > values1)
+            decrease = np.count_nonzero(values2 < values1)
+            change_types_df.iloc[pos, 3:] = [
+                increase,
+                decrease,
+                len(rows_pos) - increase - decrease,
+            ]
+        elif pd.api.types.is_object_dtype(col1.dtype) or pd.api.types.is_object_dtype(col2.dtype):
+            type_change = sum(
+                type(value1) is not type(value2)
+                for value1, value2 in zip(col1.iloc[rows_pos], col2.iloc[rows_pos])
+            )
+            change_types_df.iloc[pos, 2] = type_change
+            change_types_df.iloc[pos, 5] = len(rows_pos) - type_change
+
+    return change_types_df
+
+
+def _top_k_diffs(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    equality_arr: np.ndarray,
+    cols_all_equal: np.ndarray,
+    k: int,
+    df1_name: str,
+    df2_name: str,
+) -> pd.DataFrame:
+    """Return the `k` largest absolute differences of every numeric column with different values.
+
+    Only the different cells (according to `equality_arr`) with finite values are used. The k
+    largest are selected with `np.argpartition()` (O(n)) and only those k are sorted.
+
+    Returns a DataFrame with the columns 'column', 'index', `df1_name`, `df2_name` and 'delta'
+    (`df2_name` value minus `df1_name` value), largest absolute deltas first for every column.
+    """
+    top_k_parts = []
+    for col_pos in np.flatnonzero(~cols_all_equal):
+        col = df1.columns[col_pos]
+        if not (_is_diff_stats_dtype(df1[col].dtype) and _is_diff_stats_dtype(df2[col].dtype)):
+            continue
+        rows_pos = np.flatnonzero(~equality_arr[:, col_pos])
+        values1 = df1[col].iloc[rows_pos].to_numpy(dtype='float64', na_value=np.nan)
+        values2 = df2[col].iloc[rows_pos].to_numpy(dtype='float64', na_value=np.nan)
+
+        finite = np.isfinite(values1) & np.isfinite(values2)
+        rows_pos, values1, values2 = rows_pos[finite], values1[finite], values2[finite]
+        delta = values2 - values1
+        abs_delta = np.abs(delta)
+        top_pos = np.arange(len(abs_delta))
+        if len(abs_delta) > k:
+            top_pos = np.argpartition(abs_delta, len(abs_delta) - k)[len(abs_delta) - k :]
+        top_pos = top_pos[np.argsort(-abs_delta[top_pos], kind='stable')]
+        top_k_parts.append(
+            pd.DataFrame(
+                {
+                    'column': [col] * len(top_pos),
+                    'index': df1.index[rows_pos[top_pos]],
+                    df1_name: values1[top_pos],
+                    df2_name: values2[top_pos],
+                    'delta': delta[top_pos],
+                }
+            )
+        )
+
+    if len(top_k_parts) == 0:
+        return pd.DataFrame(columns=['column', 'index', df1_name, df2_name, 'delta'])
+    return pd.concat(top_k_parts, ignore_index=True)
+
+
+def _diff_patterns(
+    equality_df: pd.DataFrame,
+    equality_arr: np.ndarray,
+    rows_all_equal: np.ndarray,
+    top: int,
+) -> tuple[int, pd.DataFrame]:
+    """Group the rows with different values by their pattern of different columns.
+
+    The mismatch mask of every different row is packed into a bit signature with
+    `np.packbits()`, viewed as a fixed width bytes value and factorized, so grouping is done in
+    linear time.
+
+    Returns the number of patterns and a DataFrame with the `top` most frequent patterns, with the
+    columns 'columns' (tuple of different columns), 'count' and 'rows_sample' (the first
+    `_DIFF_PATTERNS_SAMPLE_ROWS` row labels).
+    """
+    rows_diff_pos = np.flatnonzero(~rows_all_equal)
+    signatures = np.ascontiguousarray(np.packbits(~equality_arr[rows_diff_pos], axis=1))
+    signatures_bytes = signatures.view(f'S{signatures.shape[1]}').ravel()
+    codes, _ = pd.factorize(signatures_bytes)
+    counts = np.bincount(codes)
+    # Most frequent first, ties in order of first appearance
+    top_codes = np.argsort(-counts, kind='stable')[:top]
+
+    patterns = []
+    for code in top_codes:
+        code_rows_pos = rows_diff_pos[np.flatnonzero(codes == code)]
+        cols_mask = np.unpackbits(signatures[np.argmax(codes == code)], count=equality_arr.shape[1])
+        patterns.append(
+            {
+                'columns': tuple(equality_df.columns[cols_mask.astype(bool)]),
+                'count': len(code_rows_pos),
+                'rows_sample': list(equality_df.index[code_rows_pos[:_DIFF_PATTERNS_SAMPLE_ROWS]]),
+            }
+        )
+    return len(counts), pd.DataFrame(patterns, columns=['columns', 'count', 'rows_sample'])
+
+
+def _match_rows(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    df1_name: str,
+    df2_name: str,
+    rows_hashes1: None | np.ndarray = None,
+) -> tuple[bool, pd.DataFrame]:
+    """Match the rows of df1 and df2 by their values, ignoring the index.
+
+    Every row is hashed using `pd.util.hash_pandas_object()` (values and dtypes must be equal to
+    get the same hash) and rows are matched with a hash join, in O(n). `rows_hashes1` are the
+    hashes of df1's rows, computed if None.
+
+    Returns a tuple with:
+    - Whether df1 and df2 have the same rows, ignoring the index and the order of the rows
+      (multiset equality).
+    - A DataFrame with the pairs of rows that are equal but under a different index, the columns
+      are `df1_name` and `df2_name` containing the index of each row. Rows that are equal under
+      the same index are not included; if a row is duplicated, its k-th occurrence in df1 is
+      paired with its k-th occurrence in df2.
+    """
+    len_df1 = len(df1.index)
+    if rows_hashes1 is None:
+        rows_hashes1 = pd.util.hash_pandas_object(df1, index=False).to_numpy()
+    hashes = np.concatenate(
+        (
+            rows_hashes1,
+            pd.util.hash_pandas_object(df2, index=False).to_numpy(),
+        )
+    )
+    hashes_codes, hashes_uniques = pd.factorize(hashes)
+    hashes_codes1 = hashes_codes[:len_df1]
+    hashes_codes2 = hashes_codes[len_df1:]
+
+    rows_multiset_equality = np.array_equal(
+        np.bincount(hashes_codes1, minlength=len(hashes_uniques)),
+        np.bincount(hashes_codes2, minlength=len(hashes_uniques)),
+    )
+
+    # Rows equal under the same index are not moved, the index and the hash are combined into a
+    # single code to find them
+    # An empty index is skipped, pandas warns when appending it
+    idxs = [idx for idx in (df1.index, df2.index) if len(idx) > 0]
+    idxs_codes, idxs_uniques = pd.factorize(
+        idxs[0].append(idxs[1:]) if len(idxs) > 0 else df1.index
+    )
+    rows_codes = idxs_codes.astype('int64') * len(hashes_uniques) + hashes_codes
+    rows_codes1 = pd.Series(rows_codes[:len_df1])
+    rows_codes2 = pd.Series(rows_codes[len_df1:])
+    not_in_place1 = np.flatnonzero(~rows_codes1.isin(rows_codes2).to_numpy())
+    not_in_place2 = np.flatnonzero(~rows_codes2.isin(rows_codes1).to_numpy())
+
+    # The k-th occurrence of a hash in df1 is paired with the k-th occurrence in df2, occurrences
+    # are counted up to the length of the longest DataFrame
+    occurrences_max = max(len_df1, len(df2.index)) + 1
+    occurrence1 = pd.Series(hashes_codes1[not_in_place1]).groupby(hashes_codes1[not_in_place1])
+    occurrence2 = pd.Series(hashes_codes2[not_in_place2]).groupby(hashes_codes2[not_in_place2])
+    pair_codes1 = hashes_codes1[not_in_place1] * occurrences_max + occurrence1.cumcount().to_numpy()
+    pair_codes2 = hashes_codes2[not_in_place2] * occurrences_max + occurrence2.cumcount().to_numpy()
+    pairs_pos2 = pd.Index(pair_codes2).get_indexer(pair_codes1)
+    paired = pairs_pos2 != -1
+
+    rows_moved_df = pd.DataFrame(
+        {
+            df1_name: df1.index[not_in_place1[paired]],
+            df2_name: df2.index[not_in_place2[pairs_pos2[paired]]],
+        }
+    )
+    return bool(rows_multiset_equality), rows_moved_df
+
+
+def _prepare_baseline(df1: pd.DataFrame) -> dict:
+    """Do once the work of `compare()` that only depends on df1, to compare it many times.
+
+    Returns a dict used as the `_baseline` parameter of `_compare_gen()`, with the keys:
+    - **'df1_cp'**: df1 with rows and columns sorted. Its index keeps its hash table (built by
+      pandas the first time it's used) between comparisons.
+    - **'cols_list'** and **'idxs_list'**: the columns and the index of 'df1_cp' as lists.
+    - **'cols_set_and_dups'** and **'idxs_set_and_dups'**: the sets and the duplicates of the
+      lists, see `_list_set_and_dups()`.
+    - **'cols_list_sorted'** and **'idxs_list_sorted'**: the sets as sorted lists, the common
+      columns and indexes are taken from them.
+    - **'idxs_sorted_as_index'**: whether 'idxs_list_sorted' is in the order of the index of
+      'df1_cp', so the common rows can be selected by position.
+    - **'cols_hashes'**: the rows' hashes of the columns of 'df1_cp' (see `_cols_hashes()`),
+      filled by `_baseline_cols_hashes()` the first time a column is hashed.
+    """
+    df1_cp = pd.DataFrame(df1).sort_index(axis=0).sort_index(axis=1)
+    cols_list = list(df1_cp.columns)
+    idxs_list = list(df1_cp.index)
+    cols_set_and_dups = _list_set_and_dups(cols_list)
+    idxs_set_and_dups = _list_set_and_dups(idxs_list)
+    idxs_list_sorted = pd_format.obj_as_sorted_list(idxs_set_and_dups[0])
+    return {
+        'df1_cp': df1_cp,
+        'cols_list': cols_list,
+        'idxs_list': idxs_list,
+        'cols_set_and_dups': cols_set_and_dups,
+        'idxs_set_and_dups': idxs_set_and_dups,
+        'cols_list_sorted': pd_format.obj_as_sorted_list(cols_set_and_dups[0]),
+        'idxs_list_sorted': idxs_list_sorted,
+        'idxs_sorted_as_index': idxs_list == idxs_list_sorted,
+        'cols_hashes': {},
+    }
+
+
+def _baseline_cols_hashes(baseline: dict, cols: list, idxs: None | list = None) -> dict:
+    """Return the rows' hashes of the columns `cols` of the baseline (see `_prepare_baseline()`).
+
+    Columns are hashed only the first time. If `idxs` is not None, only the hashes of these
+    rows are returned, they are found using the hash table of the baseline's index.
+    """
+    cols_hashes = baseline['cols_hashes']
+    cols_hashes.update(
+        _cols_hashes(baseline['df1_cp'], [col for col in cols if col not in cols_hashes])
+    )
+    if idxs is None:
+        return {col: cols_hashes[col] for col in cols}
+    rows_pos = baseline['df1_cp'].index.get_indexer(idxs)
+    return {col: cols_hashes[col][rows_pos] for col in cols}
+
+
+def _run_exports(exports: list) -> None:
+    '''Run the export functions in order, used to export files in the background.'''
+    for export in exports:
+        export()
+
+
+def _write_report_file(report: str, report_file_path: str) -> None:
+    '''Save the report to a file.'''
+    with open(report_file_path, 'w', encoding='utf-8') as report_file:
+        report_file.write(report)
+
+
 def _returner_for_compare(
     equality_full: bool,
     equality_partial: bool,
@@ -155,12 +1070,32 @@ def _returner_for_compare(
     str_io: io.StringIO,
     report_print: bool,
     report_file_path,
+    export_in_background: bool = False,
+    exports: None | list = None,
+    profiler: None | StageProfiler = None,
 ) -> tuple[bool, bool, dict]:
 
     # Important note:
     # No verification of report_file_path and report_file_overwrite params
     # this was done in `compare()` as this function is not meant to be called by itself
 
+    # Files to export (besides the report file), these are functions to be called
+    if exports is None:
+        exports = []
+    if profiler is None:
+        profiler = StageProfiler(enabled=False)
+
+    # Profiling table, the time saving files is only in equality_metadata['profile']
+    profiler.end()
+    if profiler.enabled:
+        f.print_title(
+            1,
+            'Profiling stages',
+            'time in seconds, memory in MB, shapes (rows, columns)',
+            file=str_io,
+        )
+        _print_profile_table(profiler.profile_df(), str_io)
+
     # This is here to include the report of "saving the report to file"
     # but the actual report saving to file is done later.
     if report_file_path is not None:
@@ -169,6 +1104,14 @@ def _returner_for_compare(
             {'report_file_path': os.path.realpath(report_file_path)}
         )
 
+    if export_in_background is True and (report_file_path is not None or len(exports) > 0):
+        f.print_event(
+            1,
+            '⏳ Files are saved in the background, wait for them with'
+            + ' equality_metadata[\'variables\'][\'export_future\'].result()',
+            file=str_io,
+        )
+
     # Adding "Returning" to report
     f.print_title(
         1,
@@ -187,14 +1130,114 @@ def _returner_for_compare(
 
     # Saving report to file (optionally)
     if report_file_path is not None:
-        with open(report_file_path, 'w', encoding='utf-8') as report_file:
-            report_file.write(report)
+        exports.append(
+            functools.partial(_write_report_file, report=report, report_file_path=report_file_path)
+        )
+
+    # Saving files, optionally in a background thread
+    # The future's result() raises any exception that happened while saving the files
+    if export_in_background is True:
+        if len(exports) > 0:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            export_future = executor.submit(_run_exports, exports)
+            executor.shutdown(wait=False)
+            equality_metadata['variables'].update({'export_future': export_future})
+    else:
+        if len(exports) > 0:
+            profiler.stage('EXPORTS')
+        _run_exports(exports)
+
+    profiler.stop()
+    if profiler.enabled:
+        equality_metadata['profile'] = profiler.profile_df()
 
     # The actual return
     return [equality_full, equality_partial, equality_metadata]
 
 
-def compare(
+class _CompareCancelled(Exception):
+    '''Raised when the `deadline` of `compare()` is reached or its `cancel_event` is set.'''
+
+
+def _raise_if_cancelled(checkpoint: dict) -> None:
+    '''Raise `_CompareCancelled` if the deadline is reached or the cancel event is set.'''
+    if checkpoint['cancel_requested']:
+        raise _CompareCancelled('cancel requested')
+    params = checkpoint['equality_metadata']['params']
+    if params['deadline'] is not None and time.time() >= params['deadline']:
+        raise _CompareCancelled('deadline reached')
+    if params['cancel_event'] is not None and params['cancel_event'].is_set():
+        raise _CompareCancelled('cancel_event set')
+
+
+def _stage(checkpoint: dict, name: str, df1: pd.DataFrame = None, df2: pd.DataFrame = None):
+    '''Generator used with `yield from` between the stages of `_compare_gen()`.
+
+    Ends the current stage, yields `checkpoint` (with `name` as the stage about to start) to the
+    caller and starts the stage `name` when resumed, so the time spent by the caller is not
+    counted in any stage.
+    '''
+    checkpoint['profiler'].end()
+    checkpoint['stage'] = name
+    yield checkpoint
+    checkpoint['profiler'].stage(name, df1, df2)
+
+
+def _advance(checkpoint: dict, fraction: float) -> None:
+    '''Report the progress inside a stage and check for cancellation.'''
+    checkpoint['profiler'].advance(fraction)
+    _raise_if_cancelled(checkpoint)
+
+
+def _returner_for_cancelled(checkpoint: dict, reason: str) -> tuple[bool, bool, dict]:
+    '''Return what was computed up to `checkpoint` when the comparison is cancelled.'''
+    equality_metadata = checkpoint['equality_metadata']
+    str_io = checkpoint['str_io']
+    f.print_title(1, 'Cancelled', reason, file=str_io)
+    stage = checkpoint['stage']
+    f.print_event(1, f'⛔ Stage {stage} and the next ones were not done', file=str_io)
+    # Planned by a previous stage, the Excel file and the diff files are saved when returning
+    variables = equality_metadata['variables']
+    files_not_saved = []
+    if 'xls_path' in variables:
+        files_not_saved.append(variables.pop('xls_path'))
+        variables.pop('xls_sheets')
+    if 'diff_files' in variables:
+        files_not_saved.extend(variables.pop('diff_files').values())
+    if len(files_not_saved) > 0:
+        f.print_event(1, f'⛔ Files not saved (count={len(files_not_saved)}):', file=str_io)
+        f.pprint_wrap(1, files_not_saved, stream=str_io)
+    equality_metadata['cancelled'] = True
+    # Files are not saved, only the report file if required
+    return _returner_for_compare(
+        equality_full=False,
+        equality_partial=False,
+        equality_metadata=equality_metadata,
+        str_io=str_io,
+        report_print=equality_metadata['params']['report_print'],
+        report_file_path=equality_metadata['params']['report_file_path'],
+        export_in_background=equality_metadata['params']['export_in_background'],
+        profiler=checkpoint['profiler'],
+    )
+
+
+def _run_compare_gen(compare_gen: Generator) -> tuple[bool, bool, dict]:
+    '''Run `_compare_gen()` up to the end, checking for cancellation between stages.'''
+    checkpoint = None
+    try:
+        while True:
+            checkpoint = next(compare_gen)
+            _raise_if_cancelled(checkpoint)
+    except StopIteration as stop:
+        return stop.value
+    except _CompareCancelled as cancelled:
+        return _returner_for_cancelled(checkpoint, reason=str(cancelled))
+    finally:
+        # Closed after `_returner_for_cancelled()`, which still uses the profiler
+        compare_gen.close()
+
+
+def _compare_gen(
     df1: pd.DataFrame,
     df2: pd.DataFrame,
     df1_name: str = 'df1',
@@ -212,149 +1255,112 @@ def compare(
     xls_compare_str_diff: str = '*_diff_*',
     xls_fixed_cols: None | list = None,
     xls_datetime_rpl: str = '%Y-%m-%d %H:%M:%S',
-) -> tuple[bool, bool, dict]:
-    """Compares two DataFrames, creates a report and returns useful information (see the "Returns" section).
-
-    **When is this function useful**: This function should be run when `df1.equals(df2)` is False, but if that returns True, there is no use for this function.
+    xls_diff_mode: str = 'column',
+    xls_number_precision: None | int = None,
+    xls_thousands_sep: bool = False,
+    export_in_background: bool = False,
+    diff_path: None | str = None,
+    diff_format: str = 'parquet',
+    diff_overwrite: bool = False,
+    comparators: None | dict = None,
+    on: None | str | list = None,
+    match_rows: bool = False,
+    renamed_cols: None | str = None,
+    renamed_cols_min_similarity: float = 1.0,
+    diff_stats: bool = False,
+    top_k: None | int = None,
+    diff_patterns: None | int = None,
+    change_types: bool = False,
+    profile: bool = False,
+    progress: None | Callable = None,
+    deadline: None | float = None,
+    cancel_event: None | threading.Event = None,
+    _baseline: None | dict = None,
+) -> Generator[dict, None, tuple[bool, bool, dict]]:
+    """Do the work of `compare()`, see its parameters and what it returns.
+
+    `_baseline` is the result of `_prepare_baseline(df1)`, to reuse the work that only depends on
+    df1. It's ignored if `on` is not None, since rows are then sorted using both DataFrames' keys.
+
+    A checkpoint dict is yielded before every stage, with the keys 'stage' (the stage about to
+    start), 'equality_metadata', 'str_io', 'profiler' and 'cancel_requested'. The value returned
+    (see `StopIteration`) is the result of `compare()`. Parameters are validated when the generator
+    is first resumed.
+    """
+    equality_metadata = {
+        'params': {
+            'df1': df1,
+            'df2': df2,
+            'df1_name': df1_name,
+            'df2_name': df2_name,
+            'round_to': round_to,
+            'report_print': report_print,
+            'report_file_path': report_file_path,
+            'report_file_overwrite': report_file_overwrite,
+            'show_common_cols': show_common_cols,
+            'show_common_idxs': show_common_idxs,
+            'show_all_dtypes': show_all_dtypes,
+            'xls_path': xls_path,
+            'xls_overwrite': xls_overwrite,
+            'xls_compare_str_equal': xls_compare_str_equal,
+            'xls_compare_str_diff': xls_compare_str_diff,
+            'xls_fixed_cols': xls_fixed_cols,
+            'xls_datetime_rpl': xls_datetime_rpl,
+            'xls_diff_mode': xls_diff_mode,
+            'xls_number_precision': xls_number_precision,
+            'xls_thousands_sep': xls_thousands_sep,
+            'export_in_background': export_in_background,
+            'diff_path': diff_path,
+            'diff_format': diff_format,
+            'diff_overwrite': diff_overwrite,
+            'comparators': comparators,
+            'on': on,
+            'match_rows': match_rows,
+            'renamed_cols': renamed_cols,
+            'renamed_cols_min_similarity': renamed_cols_min_similarity,
+            'diff_stats': diff_stats,
+            'top_k': top_k,
+            'diff_patterns': diff_patterns,
+            'change_types': change_types,
+            'profile': profile,
+            'progress': progress,
+            'deadline': deadline,
+            'cancel_event': cancel_event,
+        },
+        'variables': {},
+    }
 
-    **Columns and indexes are sorted initially**: The function's initial step is to sort the columns and rows of both DataFrames to do all further comparisons, it then internally does `df1.equals(df2)` with the sorted columns and rows. The sorting is done like `df.sort_index(axis=0).sort_index(axis=1)` which sorts by labels.
+    if not isinstance(df1, pd.DataFrame) or not isinstance(df2, pd.DataFrame):
+        raise ValueError('df1 and df2 must be of type pd.DataFrame.')
 
-    **Important**: Duplicate indexes and columns are not allowed, UNLESS `df1_cp.equals(df2_cp)` is True, which means everything is equal.
+    if not isinstance(df1_name, str) or not isinstance(df2_name, str):
+        raise ValueError('df1_name and df2_name must be of type str.')
+    if df1_name == df2_name:
+        raise ValueError('df1_name and df2_name must be different.')
 
-    **Further reading**: This docstring contains documentation for this function but for an explanation of what is returned but see [this link](https://github.com/caballerofelipe/some_pd_tools/blob/main/Report\\%20and\\%20logic\\%20explanation\\%20for\\%20pd_compare.compare.md) to understand what the report shows, the logic behind it and what is returned.
+    if round_to is not None and (
+        isinstance(round_to, bool)
+        or (isinstance(round_to, int) and round_to < 0)
+        or (isinstance(round_to, str) and round_to not in ('floor', 'ceil', 'trunc'))
+        or (not isinstance(round_to, int) and not isinstance(round_to, str))
+    ):
+        raise ValueError(
+            "round_to must be None, a positive integer or a string (either 'floor' or 'ceil')."
+        )
 
-    **Some notes**:
-    - The whole goal of this function is to find differences in DataFrames, once they are found to be equal, the comparison stops. While looking for differences a report is created that will be printed (optionally), returned and saved to a file (optionally).
-    - The report is the main focus of this function. The goal is to provide insight into how the DataFrames differ (if they do) the usage of the returned tuple might not be needed. However, if more information is needed or could be useful, the variables provided in the metadata might help.
-    - This function is meant to be called interactively, possibly using Jupyter. It isn't meant to be run as a verification function, although it can be used like that, than might not be advised depending on the specific situation. The function will return a tuple of 3. In the returned tuple:
-        - The first element will return True if everything is equal in the two DataFrame, this uses df1.equals(df2) but using the sorted columns and indexes.
-        - The second element will return True if after some modification in the two DataFrames, everything is equal. This check happens after several points in the comparison process.
-        - The third element will return metadata. This metadata depends on where in the function it was returned. The metadata is returned if the two DataFrames are equal, after some transformation. Or it is returned at the end of the function. The metadata values should be obtained with `.get()` since metadata is a dict and the key might not exist at a given point when returned.
+    if not isinstance(report_print, bool):
+        raise ValueError('report_print must be of type bool.')
 
-    *A final note*: This functions is a little messy but I think: "doing something that works is better than not doing something perfect". There's room for improvement that might or might not be done in the future.
-
-    Parameters
-    ----------
-    df1 : pd.DataFrame
-        The first DataFrame to compare.
-    df2 : pd.DataFrame
-        The second DataFrame to compare.
-    df1_name : str, optional
-        The name to show in the report for the first DataFrame, by default 'df1'.
-    df2_name : str, optional
-        The name to show in the report for the second DataFrame, by default 'df2'.
-    round_to : None | int | str, optional
-        The way to approximate, by default None. Possible values and their meaning:
-        - **None**: nothing is done.
-        - **'int'**: rounds floating numbers to this decimal.
-        - **'floor'**: does a floor operation on floats columns. Uses np.floor. From np.floor's documentation: "The floor of the scalar x is the largest integer i, such that i <= x."
-        - **'ceil'**: does a ceil operation on floats columns. Uses np.ceil. From np.ceil's documentation: "The ceil of the scalar x is the smallest integer i, such that i >= x.".
-        - **'trunc'**: removes decimals from floats columns. Uses np.trunc. From np.trunc's documentation: "The truncated value of the scalar x is the nearest integer i which is closer to zero than x is.".
-    report_print : bool, optional
-        Whether to print a report when the function ends, by default True.
-    report_file_path : None | str, optional
-        If set to a string, saves the report to the specified file, by default None.
-    report_file_overwrite : bool, optional
-        Whether to overwrite the specified path (when using report_file_path), by default False.
-    show_common_cols : bool, optional
-        Whether to show the common columns between the two compared DataFrames, by default False.
-    show_common_idxs : bool, optional
-        Whether to show the common indexes between the two compared DataFrames, by default False.
-    show_all_dtypes : bool, optional
-        For common columns, whether to show the columns that have the same dtype in the report, by default False.
-    xls_path : None | str, optional
-        If set to a string, creates an Excel file to the specified file, by default None.
-    xls_overwrite : bool, optional
-        Whether to overwrite the specified path (when using xls_overwrite), by default False.
-    xls_compare_str_equal : str, optional
-        A string to be placed inside a cell in the Excel file when both DataFrames contain the same value. Useful to know what cells are equal in the two DataFrames, by default empty. Can be used with the *find* function in Excel. By default ''.
-    xls_compare_str_diff : str, optional
-        A string to be placed inside a cell in the Excel file when the cell's value in the tow DataFrames is different. Useful to know what cells are different in the two DataFrames, by default "`*_diff_*`". Can be used with the *find* function in Excel. By default '*_diff_*'.
-    xls_fixed_cols : None | list, optional
-        A list of str containing columns that will be fixed in the generated Excel file. The columns in the list must exist in both DataFrames. By default None.
-    xls_datetime_rpl : _type_, optional
-        A string containing the format to be used for a column with a datetime64 dtype, useful to have a specific format for dates in Excel, by default '%Y-%m-%d %H:%M:%S'.
-
-    Returns
-    -------
-    tuple[bool, bool, dict]
-        Next is an explanation of what is returned but see [this link](https://github.com/caballerofelipe/some_pd_tools/blob/main/Report\\%20and\\%20logic\\%20explanation\\%20for\\%20pd_compare.compare.md) to understand what the report shows, the logic behind it and what is returned in the key 'variables' of the third tuple; this information was left out of this docstring to avoid too much information.
-        - <b>tuple[0]</b>: bool. Checks for full equality for the two DataFrames **after** sorting columns and indexes.
-            <ul>
-                <li><b>True</b> if the two compared DataFrames are completely equal.</li>
-                <li><b>False</b> otherwise.</li>
-            </ul>
-        - <b>tuple[1]</b>: bool. Checks for full equality for the two DataFrames **after** some operation done to them, see below for explanation of which operations are done.
-            <ul>
-                <li><b>True</b> if the two compared DataFrames are equal after some operation.</li>
-                <li><b>False</b> otherwise.</li>
-            </ul>
-        - <b>tuple[2]</b>: dict. Metadata useful to keep track of what was done during the comparison:
-            <ul>
-                <li><b>['params']</b>: The list of parameters used in the function call.</li>
-                <li><b>['variables']</b>: Some inner variables useful to keep track of what happened in the comparison and have information on what is different.</li>
-                <li><b>['report']</b>: The same report, useful if the report wasn't printed (`report_print` == False) or to do something with it.</li>
-            </ul>
-
-    Raises
-    ------
-    ValueError
-        Parameters are reviewed and an ValueError is raised if they don't have the specified values. No further documentation added to avoid too much information.
-    """
-    equality_metadata = {
-        'params': {
-            'df1': df1,
-            'df2': df2,
-            'df1_name': df1_name,
-            'df2_name': df2_name,
-            'round_to': round_to,
-            'report_print': report_print,
-            'report_file_path': report_file_path,
-            'report_file_overwrite': report_file_overwrite,
-            'show_common_cols': show_common_cols,
-            'show_common_idxs': show_common_idxs,
-            'show_all_dtypes': show_all_dtypes,
-            'xls_path': xls_path,
-            'xls_overwrite': xls_overwrite,
-            'xls_compare_str_equal': xls_compare_str_equal,
-            'xls_compare_str_diff': xls_compare_str_diff,
-            'xls_fixed_cols': xls_fixed_cols,
-            'xls_datetime_rpl': xls_datetime_rpl,
-        },
-        'variables': {},
-    }
-
-    if not isinstance(df1, pd.DataFrame) or not isinstance(df2, pd.DataFrame):
-        raise ValueError('df1 and df2 must be of type pd.DataFrame.')
-
-    if not isinstance(df1_name, str) or not isinstance(df2_name, str):
-        raise ValueError('df1_name and df2_name must be of type str.')
-    if df1_name == df2_name:
-        raise ValueError('df1_name and df2_name must be different.')
-
-    if round_to is not None and (
-        isinstance(round_to, bool)
-        or (isinstance(round_to, int) and round_to < 0)
-        or (isinstance(round_to, str) and round_to not in ('floor', 'ceil', 'trunc'))
-        or (not isinstance(round_to, int) and not isinstance(round_to, str))
-    ):
-        raise ValueError(
-            "round_to must be None, a positive integer or a string (either 'floor' or 'ceil')."
-        )
-
-    if not isinstance(report_print, bool):
-        raise ValueError('report_print must be of type bool.')
-
-    if report_file_path is not None:
-        if not isinstance(report_file_path, str):
-            raise ValueError('report_file_path must be of type None or str')
-        the_Path = pathlib.Path(report_file_path)
-        if the_Path.is_dir():
-            raise ValueError(f'report_file_path [{report_file_path}] cannot be a directory.')
-        if report_file_overwrite is False and the_Path.is_file():
-            raise ValueError(
-                f'report_file_path [{report_file_path}] exists but report_file_overwrite is False.'
-            )
+    if report_file_path is not None:
+        if not isinstance(report_file_path, str):
+            raise ValueError('report_file_path must be of type None or str')
+        the_Path = pathlib.Path(report_file_path)
+        if the_Path.is_dir():
+            raise ValueError(f'report_file_path [{report_file_path}] cannot be a directory.')
+        if report_file_overwrite is False and the_Path.is_file():
+            raise ValueError(
+                f'report_file_path [{report_file_path}] exists but report_file_overwrite is False.'
+            )
 
     if xls_path is not None:
         if not isinstance(xls_path, str):
@@ -390,342 +1396,661 @@ def compare(
                 f'The following fixed_cols are not present in df2(df2_name={df2_name}): {fixed_cols_not_present_sorted_list}.'
             )
 
+        # Every sheet in the Excel file contains the index (a column per level, the on columns if
+        # used), the fixed columns (2 per column) and at least one compared column (3 columns)
+        if on is None:
+            index_cols = df1.index.nlevels
+        else:
+            index_cols = len(on) if isinstance(on, list) else 1
+        if index_cols + 2 * len(xls_fixed_cols) + 3 > _XLS_MAX_COLS:
+            raise ValueError(
+                f'Too many xls_fixed_cols ({len(xls_fixed_cols)}), they don\'t fit in an Excel sheet.'
+            )
+
         if not isinstance(xls_datetime_rpl, str):
             raise ValueError('xls_datetime_rpl must be of type str.')
+        # Raises a ValueError if the format can't be used in Excel
+        _strftime_to_excel_format(xls_datetime_rpl)
+
+        if xls_diff_mode not in ('column', 'format'):
+            raise ValueError("xls_diff_mode must be one of 'column' or 'format'.")
+
+        if xls_number_precision is not None and (
+            isinstance(xls_number_precision, bool)
+            or not isinstance(xls_number_precision, int)
+            or xls_number_precision < 0
+        ):
+            raise ValueError('xls_number_precision must be None or a positive integer.')
+        if not isinstance(xls_thousands_sep, bool):
+            raise ValueError('xls_thousands_sep must be of type bool.')
+
+    if diff_path is not None:
+        if not isinstance(diff_path, str):
+            raise ValueError('diff_path must be of type str.')
+        if pathlib.Path(diff_path).is_file():
+            raise ValueError(f'diff_path [{diff_path}] must be a directory.')
+        if diff_format not in _module_diff_files.DIFF_FORMATS_EXTENSIONS:
+            raise ValueError("diff_format must be one of 'parquet', 'arrow' or 'csv'.")
+        if diff_format in ('parquet', 'arrow') and importlib.util.find_spec('pyarrow') is None:
+            raise ValueError(f"diff_format='{diff_format}' requires pyarrow to be installed.")
+        if diff_overwrite is False:
+            diff_files_paths = _module_diff_files.diff_files_paths(diff_path, diff_format)
+            for diff_file_path in diff_files_paths.values():
+                if pathlib.Path(diff_file_path).exists():
+                    raise ValueError(
+                        f'diff_path [{diff_path}] contains [{os.path.basename(diff_file_path)}] but diff_overwrite is False.'
+                    )
+
+    if comparators is not None and (
+        not isinstance(comparators, dict)
+        or not all(callable(comparator) for comparator in comparators.values())
+    ):
+        raise ValueError('comparators must be None or a dict whose values are functions.')
 
-    # MARK: io.StringIO
-    str_io = io.StringIO()
-
-    # MARK: COPY
-    # Copy DataFrames to avoid making any changes to them
-    # *************************************************************************
-    df1_cp = pd.DataFrame(df1).sort_index(axis=0).sort_index(axis=1)
-    df2_cp = pd.DataFrame(df2).sort_index(axis=0).sort_index(axis=1)
-
-    # MARK: EQLTY FULL
-    # Check if the two DataFrames are fully equal using Pandas' function
-    # *************************************************************************
-    f.print_title(1, 'Equality check', 'full', file=str_io)
-    if df1_cp.equals(df2_cp):  # Are the dfs equal?
-        f.print_result('🥳 Equal', file=str_io)
-        return _returner_for_compare(
-            equality_full=True,
-            equality_partial=False,
-            equality_metadata=equality_metadata,
-            str_io=str_io,
-            report_print=report_print,
-            report_file_path=report_file_path,
+    if on is not None:
+        if isinstance(on, str):
+            on = [on]
+        if not isinstance(on, list) or len(on) == 0 or len(on) != len(set(on)):
+            raise ValueError(
+                'on must be None, a column name or a list of not duplicated column names.'
+            )
+        for df, df_name in ((df1, df1_name), (df2, df2_name)):
+            if not set(on) <= set(df.columns):
+                on_not_present_sorted_list = pd_format.obj_as_sorted_list(set(on) - set(df.columns))
+                raise ValueError(
+                    f'The following on columns are not present in {df_name}: {on_not_present_sorted_list}.'
+                )
+            if not df.columns.isin(on).sum() == len(on):
+                raise ValueError(f'The on columns cannot be duplicated in {df_name}.')
+        # The on columns are the index of the Excel file
+        if xls_path is not None and len(set(on) & set(xls_fixed_cols)) > 0:
+            raise ValueError('xls_fixed_cols cannot contain on columns, they are the index.')
+
+    if not isinstance(match_rows, bool):
+        raise ValueError('match_rows must be of type bool.')
+
+    if renamed_cols not in (None, 'detect', 'compare'):
+        raise ValueError("renamed_cols must be one of None, 'detect' or 'compare'.")
+    if (
+        isinstance(renamed_cols_min_similarity, bool)
+        or not isinstance(renamed_cols_min_similarity, (int, float))
+        or not 0 < renamed_cols_min_similarity <= 1
+    ):
+        raise ValueError(
+            'renamed_cols_min_similarity must be a number greater than 0 and at most 1.'
         )
-    else:
-        f.print_result('😡 Not equal', file=str_io)
-
-    # MARK: COMPARE COLUMNS
-    # Compare columns and get common columns, extra columns for each DF
-    # *************************************************************************
-    cols_compare_equality, cols_compare_metadata = compare_lists(
-        list_1=list(df1_cp.columns),
-        list_2=list(df2_cp.columns),
-        show_common_items=show_common_cols,
-        list_1_name=df1_name,
-        list_2_name=df2_name,
-        type_name='column',
-        type_name_plural='columns',
-        report_print=False,
-    )
-
-    print(cols_compare_metadata['report'], end='', file=str_io)
 
-    cols_common_set = cols_compare_metadata['list_common_set']
-    cols_df1_excl_set = cols_compare_metadata['list_1_excl_set']
-    cols_df2_excl_set = cols_compare_metadata['list_2_excl_set']
-    cols_df1_dups_dict = cols_compare_metadata['list_1_dups_dict']
-    cols_df2_dups_dict = cols_compare_metadata['list_2_dups_dict']
+    if not isinstance(diff_stats, bool):
+        raise ValueError('diff_stats must be of type bool.')
 
-    # Duplicate columns dictionaries containing only common elements
-    cols_df1_dups_common_dict = {
-        val: count for val, count in cols_df1_dups_dict.items() if val in cols_common_set
-    }
-    cols_df2_dups_common_dict = {
-        val: count for val, count in cols_df2_dups_dict.items() if val in cols_common_set
-    }
+    if top_k is not None and (isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1):
+        raise ValueError('top_k must be None or a positive integer.')
 
-    cols_common_list_sorted = pd_format.obj_as_sorted_list(cols_common_set)
+    if diff_patterns is not None and (
+        isinstance(diff_patterns, bool) or not isinstance(diff_patterns, int) or diff_patterns < 1
+    ):
+        raise ValueError('diff_patterns must be None or a positive integer.')
 
-    equality_metadata['variables'].update(
-        {
-            'cols_compare_equality': cols_compare_equality,
-            'cols_common_set': cols_common_set,
-            'cols_common_list_sorted': cols_common_list_sorted,
-            'cols_df1_excl_set': cols_df1_excl_set,
-            'cols_df2_excl_set': cols_df2_excl_set,
-            'cols_df1_dups_dict': cols_df1_dups_dict,
-            'cols_df2_dups_dict': cols_df2_dups_dict,
-            'cols_df1_dups_common_dict': cols_df1_dups_common_dict,
-            'cols_df2_dups_common_dict': cols_df2_dups_common_dict,
-        }
-    )
+    if not isinstance(change_types, bool):
+        raise ValueError('change_types must be of type bool.')
 
-    if len(cols_df1_dups_common_dict) > 0 or len(cols_df2_dups_common_dict) > 0:
-        error = '🛑 Duplicate common columns found. Only common non duplicates columns allowed, stopping compare and returning. Either change the columns\' names or compare only one of the duplicates columns at a time. Review the returned metadata (indexes \'cols_df1_dups_common_dict\' and \'cols_df1_dups_common_dict\'.)'
+    if not isinstance(profile, bool):
+        raise ValueError('profile must be of type bool.')
 
-        tmp_stream = io.StringIO()
-        f.print_event(1, error, file=tmp_stream)  # Used to print and to store result in metadata
-        print(tmp_stream.getvalue(), end='', file=str_io)
+    if progress is not None and not callable(progress):
+        raise ValueError('progress must be None or a function.')
 
-        equality_metadata['variables'].update({'error': error})
+    if deadline is not None and (
+        isinstance(deadline, bool) or not isinstance(deadline, (int, float))
+    ):
+        raise ValueError('deadline must be None or a number (seconds since the epoch).')
 
-        return _returner_for_compare(
-            equality_full=False,
-            equality_partial=False,
-            equality_metadata=equality_metadata,
-            str_io=str_io,
-            report_print=report_print,
-            report_file_path=report_file_path,
+    if cancel_event is not None and not callable(getattr(cancel_event, 'is_set', None)):
+        raise ValueError(
+            'cancel_event must be None or an event with an is_set() method, like threading.Event.'
         )
 
-    # MARK: COMPARE INDEXES
-    # Compare indexes and get common indexes, extra indexes for each DF
-    # *************************************************************************
-    idxs_compare_equality, idxs_compare_metadata = compare_lists(
-        list_1=list(df1_cp.index),
-        list_2=list(df2_cp.index),
-        show_common_items=show_common_idxs,
-        list_1_name=df1_name,
-        list_2_name=df2_name,
-        type_name='index',
-        type_name_plural='indexes',
-        report_print=False,
-    )
-
-    print(idxs_compare_metadata['report'], end='', file=str_io)
-
-    idxs_common_set = idxs_compare_metadata['list_common_set']
-    idxs_df1_excl_set = idxs_compare_metadata['list_1_excl_set']
-    idxs_df2_excl_set = idxs_compare_metadata['list_2_excl_set']
-    idxs_df1_dups_dict = idxs_compare_metadata['list_1_dups_dict']
-    idxs_df2_dups_dict = idxs_compare_metadata['list_2_dups_dict']
+    if not isinstance(export_in_background, bool):
+        raise ValueError('export_in_background must be of type bool.')
 
-    # Duplicate indexes dictionaries containing only common elements
-    idxs_df1_dups_common_dict = {
-        val: count for val, count in idxs_df1_dups_dict.items() if val in idxs_common_set
-    }
-    idxs_df2_dups_common_dict = {
-        val: count for val, count in idxs_df2_dups_dict.items() if val in idxs_common_set
-    }
+    if on is not None:
+        _baseline = None
 
-    idxs_common_list_sorted = pd_format.obj_as_sorted_list(idxs_common_set)
+    # MARK: io.StringIO
+    str_io = io.StringIO()
 
-    equality_metadata['variables'].update(
-        {
-            'idxs_compare_equality': idxs_compare_equality,
-            'idxs_common_set': idxs_common_set,
-            'idxs_common_list_sorted': idxs_common_list_sorted,
-            'idxs_df1_excl_set': idxs_df1_excl_set,
-            'idxs_df2_excl_set': idxs_df2_excl_set,
-            'idxs_df1_dups_dict': idxs_df1_dups_dict,
-            'idxs_df2_dups_dict': idxs_df2_dups_dict,
-            'idxs_df1_dups_common_dict': idxs_df1_dups_common_dict,
-            'idxs_df2_dups_common_dict': idxs_df2_dups_common_dict,
+    # Functions that save files, called when returning (see `_returner_for_compare()`)
+    exports = []
+
+    # Records every stage (if `profile` is True) and reports them to `progress`
+    profiler = StageProfiler(enabled=profile, progress=progress)
+
+    # The profiler is stopped even if a stage raises or the generator is closed before the end
+    try:
+        # Yielded before every stage, see `_stage()`
+        checkpoint = {
+            'stage': None,
+            'equality_metadata': equality_metadata,
+            'str_io': str_io,
+            'profiler': profiler,
+            # Set by the caller (e.g. when an asyncio task is cancelled) to stop inside a stage
+            'cancel_requested': False,
         }
-    )
+        if deadline is not None or cancel_event is not None:
+            equality_metadata['cancelled'] = False
 
-    if len(idxs_df1_dups_common_dict) > 0 or len(idxs_df2_dups_common_dict) > 0:
-        error = '🛑 Duplicate common indexes found. Only common non duplicates indexes allowed, stopping compare and returning. Either change the indexes\' names or compare only one of the duplicates indexes at a time. Review the returned metadata (indexes \'idxs_df1_dups_common_dict\' and \'idxs_df1_dups_common_dict\'.)'
-
-        tmp_stream = io.StringIO()
-        f.print_event(1, error, file=tmp_stream)  # Used to print and to store result in metadata
-        print(tmp_stream.getvalue(), end='', file=str_io)
+        # MARK: COPY
+        # Copy DataFrames to avoid making any changes to them
+        # *************************************************************************
+        yield from _stage(checkpoint, 'COPY', df1, df2)
+        if on is None:
+            if _baseline is None:
+                df1_cp = pd.DataFrame(df1).sort_index(axis=0).sort_index(axis=1)
+            else:
+                df1_cp = _baseline['df1_cp']
+            df2_cp = pd.DataFrame(df2).sort_index(axis=0).sort_index(axis=1)
+            idxs_type_name, idxs_type_name_plural = 'index', 'indexes'
+        else:
+            # The keys are the index, rows and columns are already sorted
+            df1_cp, df2_cp = _index_by_keys(df1, df2, on)
+            idxs_type_name, idxs_type_name_plural = 'key', 'keys'
 
-        equality_metadata['variables'].update({'error': error})
+        # MARK: EQLTY FULL
+        # Check if the two DataFrames are fully equal using Pandas' function
+        # *************************************************************************
+        yield from _stage(checkpoint, 'EQLTY FULL', df1_cp, df2_cp)
+        f.print_title(1, 'Equality check', 'full', file=str_io)
+        if df1_cp.equals(df2_cp):  # Are the dfs equal?
+            f.print_result('🥳 Equal', file=str_io)
+            return _returner_for_compare(
+                equality_full=True,
+                equality_partial=False,
+                equality_metadata=equality_metadata,
+                str_io=str_io,
+                report_print=report_print,
+                report_file_path=report_file_path,
+                export_in_background=export_in_background,
+                profiler=profiler,
+            )
+        else:
+            f.print_result('😡 Not equal', file=str_io)
 
-        return _returner_for_compare(
-            equality_full=False,
-            equality_partial=False,
-            equality_metadata=equality_metadata,
-            str_io=str_io,
-            report_print=report_print,
-            report_file_path=report_file_path,
+        # MARK: COMPARE COLUMNS
+        # Compare columns and get common columns, extra columns for each DF
+        # *************************************************************************
+        yield from _stage(checkpoint, 'COMPARE COLUMNS', df1_cp, df2_cp)
+        cols_compare_equality, cols_compare_metadata = _compare_lists(
+            list_1=list(df1_cp.columns) if _baseline is None else _baseline['cols_list'],
+            list_2=list(df2_cp.columns),
+            show_common_items=show_common_cols,
+            list_1_name=df1_name,
+            list_2_name=df2_name,
+            type_name='column',
+            type_name_plural='columns',
+            report_print=False,
+            list_1_set_and_dups=None if _baseline is None else _baseline['cols_set_and_dups'],
         )
 
-    # MARK: EQLTY 4 COMMON
-    # Only taking into consideration common columns and indexes
-    # Check if the two DataFrames are fully equal using Pandas' function
-    # *************************************************************************
-    f.print_title(1, 'Checking common columns and indexes', file=str_io)
-    are_all_cols_and_idxs_common = (
-        len(cols_df1_excl_set) == 0
-        and len(cols_df2_excl_set) == 0
-        and len(idxs_df1_excl_set) == 0
-        and len(idxs_df2_excl_set) == 0
-    )
+        print(cols_compare_metadata['report'], end='', file=str_io)
 
-    # If the two DataFrames have the same columns and indexes,
-    # df{1,2}_common is indeed equal to df{1,2}_cp
-    # but to avoid duplicating code, df{1,2}_common is used from this point on
-    df1_common = df1_cp.loc[idxs_common_list_sorted, cols_common_list_sorted]
-    df2_common = df2_cp.loc[idxs_common_list_sorted, cols_common_list_sorted]
+        cols_common_set = cols_compare_metadata['list_common_set']
+        cols_df1_excl_set = cols_compare_metadata['list_1_excl_set']
+        cols_df2_excl_set = cols_compare_metadata['list_2_excl_set']
+        cols_df1_dups_dict = cols_compare_metadata['list_1_dups_dict']
+        cols_df2_dups_dict = cols_compare_metadata['list_2_dups_dict']
 
-    equality_metadata['variables'].update(
-        {
-            'df1_common': df1_common,
-            'df2_common': df2_common,
+        # Duplicate columns dictionaries containing only common elements
+        cols_df1_dups_common_dict = {
+            val: count for val, count in cols_df1_dups_dict.items() if val in cols_common_set
+        }
+        cols_df2_dups_common_dict = {
+            val: count for val, count in cols_df2_dups_dict.items() if val in cols_common_set
         }
-    )
 
-    # Do the two DataFrames have no exclusive columns and indexes?
-    if are_all_cols_and_idxs_common:
-        f.print_event(1, '✅ Columns and indexes are equal in the two DataFrames', file=str_io)
-    else:
-        f.print_event(1, '😓 Columns and indexes are not equal in the two DataFrames', file=str_io)
-        f.print_event(
-            1, '😈 From this point on, comparing only common columns and indexes', file=str_io
+        if _baseline is not None:
+            # df1's columns were already sorted, the exclusive ones are removed without sorting again
+            cols_common_list_sorted = [
+                item for item in _baseline['cols_list_sorted'] if item not in cols_df1_excl_set
+            ]
+        else:
+            cols_common_list_sorted = pd_format.obj_as_sorted_list(cols_common_set)
+
+        equality_metadata['variables'].update(
+            {
+                'cols_compare_equality': cols_compare_equality,
+                'cols_common_set': cols_common_set,
+                'cols_common_list_sorted': cols_common_list_sorted,
+                'cols_df1_excl_set': cols_df1_excl_set,
+                'cols_df2_excl_set': cols_df2_excl_set,
+                'cols_df1_dups_dict': cols_df1_dups_dict,
+                'cols_df2_dups_dict': cols_df2_dups_dict,
+                'cols_df1_dups_common_dict': cols_df1_dups_common_dict,
+                'cols_df2_dups_common_dict': cols_df2_dups_common_dict,
+            }
         )
 
-        # Equality check for common columns and indexes
-        f.print_title(1, 'Equality check', 'for common columns and indexes', file=str_io)
-        if df1_common.equals(df2_common):  # Are the dfs equal?
-            f.print_result('🥳 Equal', file=str_io)
+        if len(cols_df1_dups_common_dict) > 0 or len(cols_df2_dups_common_dict) > 0:
+            error = '🛑 Duplicate common columns found. Only common non duplicates columns allowed, stopping compare and returning. Either change the columns\' names or compare only one of the duplicates columns at a time. Review the returned metadata (indexes \'cols_df1_dups_common_dict\' and \'cols_df1_dups_common_dict\'.)'
+
+            tmp_stream = io.StringIO()
+            # Used to print and to store result in metadata
+            f.print_event(1, error, file=tmp_stream)
+            print(tmp_stream.getvalue(), end='', file=str_io)
+
+            equality_metadata['variables'].update({'error': error})
+
             return _returner_for_compare(
                 equality_full=False,
-                equality_partial=True,
+                equality_partial=False,
                 equality_metadata=equality_metadata,
                 str_io=str_io,
                 report_print=report_print,
                 report_file_path=report_file_path,
+                export_in_background=export_in_background,
+                profiler=profiler,
             )
-        else:
-            f.print_result('😡 Not equal', file=str_io)
 
-    # MARK: DTYPES COMP
-    # dtypes comparison
-    # *************************************************************************
-    common_cols_dtypes_equality, common_cols_dtypes_metadata = compare_dtypes(
-        df1=df1_common,
-        df2=df2_common,
-        df1_name=df1_name,
-        df2_name=df2_name,
-        show_all_dtypes=show_all_dtypes,
-        report_print=False,
-    )
-    print(common_cols_dtypes_metadata['report'], end='', file=str_io)
+        # MARK: COMPARE INDEXES
+        # Compare indexes and get common indexes, extra indexes for each DF
+        # *************************************************************************
+        yield from _stage(checkpoint, 'COMPARE INDEXES', df1_cp, df2_cp)
+        idxs_compare_equality, idxs_compare_metadata = _compare_lists(
+            list_1=list(df1_cp.index) if _baseline is None else _baseline['idxs_list'],
+            list_2=list(df2_cp.index),
+            show_common_items=show_common_idxs,
+            list_1_name=df1_name,
+            list_2_name=df2_name,
+            type_name=idxs_type_name,
+            type_name_plural=idxs_type_name_plural,
+            report_print=False,
+            list_1_set_and_dups=None if _baseline is None else _baseline['idxs_set_and_dups'],
+        )
 
-    equality_metadata['variables'].update(
-        {
-            'common_cols_dtypes_equality': common_cols_dtypes_equality,
-            'common_cols_dtypes_df': common_cols_dtypes_metadata['dtypes_df'],
-        }
-    )
+        print(idxs_compare_metadata['report'], end='', file=str_io)
 
-    # MARK: DTYPES SIMP
-    # dtypes simplification, dtypes comparison and testing equality afterwards
-    # *************************************************************************
-    if common_cols_dtypes_equality is False:
-        f.print_title(1, 'Since dtypes are different, will try to simplify', file=str_io)
+        idxs_common_set = idxs_compare_metadata['list_common_set']
+        idxs_df1_excl_set = idxs_compare_metadata['list_1_excl_set']
+        idxs_df2_excl_set = idxs_compare_metadata['list_2_excl_set']
+        idxs_df1_dups_dict = idxs_compare_metadata['list_1_dups_dict']
+        idxs_df2_dups_dict = idxs_compare_metadata['list_2_dups_dict']
 
-        (
-            common_cols_dtypes_simplified,
-            after_simp_equality,
-            df1_common,
-            df2_common,
-            common_cols_dtypes_simplified_equality,
-            common_cols_dtypes_simplified_df,
-        ) = _dtypes_simp_and_eqlty_check(
-            df1=df1_common,
-            df2=df2_common,
-            df1_name=df1_name,
-            df2_name=df2_name,
-            show_all_dtypes=show_all_dtypes,
-            str_io=str_io,
-        )
+        # Duplicate indexes dictionaries containing only common elements
+        idxs_df1_dups_common_dict = {
+            val: count for val, count in idxs_df1_dups_dict.items() if val in idxs_common_set
+        }
+        idxs_df2_dups_common_dict = {
+            val: count for val, count in idxs_df2_dups_dict.items() if val in idxs_common_set
+        }
+
+        if _baseline is not None:
+            # df1's indexes were already sorted, the exclusive ones are removed without sorting again
+            idxs_common_list_sorted = [
+                item for item in _baseline['idxs_list_sorted'] if item not in idxs_df1_excl_set
+            ]
+        else:
+            idxs_common_list_sorted = pd_format.obj_as_sorted_list(idxs_common_set)
 
         equality_metadata['variables'].update(
-            {'common_cols_dtypes_simplified': common_cols_dtypes_simplified}
+            {
+                'idxs_compare_equality': idxs_compare_equality,
+                'idxs_common_set': idxs_common_set,
+                'idxs_common_list_sorted': idxs_common_list_sorted,
+                'idxs_df1_excl_set': idxs_df1_excl_set,
+                'idxs_df2_excl_set': idxs_df2_excl_set,
+                'idxs_df1_dups_dict': idxs_df1_dups_dict,
+                'idxs_df2_dups_dict': idxs_df2_dups_dict,
+                'idxs_df1_dups_common_dict': idxs_df1_dups_common_dict,
+                'idxs_df2_dups_common_dict': idxs_df2_dups_common_dict,
+            }
         )
 
-        if common_cols_dtypes_simplified is True:
-            equality_metadata['variables'].update(
-                {
-                    'common_cols_dtypes_simplified_equality': common_cols_dtypes_simplified_equality,
-                    'common_cols_dtypes_simplified_df': common_cols_dtypes_simplified_df,
-                }
-            )
+        if len(idxs_df1_dups_common_dict) > 0 or len(idxs_df2_dups_common_dict) > 0:
+            error = f'🛑 Duplicate common {idxs_type_name_plural} found. Only common non duplicates {idxs_type_name_plural} allowed, stopping compare and returning. Either change the {idxs_type_name_plural}\' names or compare only one of the duplicates {idxs_type_name_plural} at a time. Review the returned metadata (indexes \'idxs_df1_dups_common_dict\' and \'idxs_df1_dups_common_dict\'.)'
 
-            if after_simp_equality is True:
-                return _returner_for_compare(
-                    equality_full=False,
-                    equality_partial=True,
-                    equality_metadata=equality_metadata,
-                    str_io=str_io,
-                    report_print=report_print,
-                    report_file_path=report_file_path,
-                )
-    else:
-        f.print_title(
-            1,
-            'Skipping equality check',
-            'since dtypes are equal, previous equality check is sufficient',
-            file=str_io,
-        )
+            tmp_stream = io.StringIO()
+            # Used to print and to store result in metadata
+            f.print_event(1, error, file=tmp_stream)
+            print(tmp_stream.getvalue(), end='', file=str_io)
 
-    # MARK: ROUND_TO
-    # Rounding numeric columns.
-    # *************************************************************************
-    if round_to is not None:
-        f.print_title(1, f'Rounding [round_to={round_to}]', file=str_io)
-        df1_common = pd_format.approximate(df1_common, round_to=round_to)
-        df2_common = pd_format.approximate(df2_common, round_to=round_to)
+            equality_metadata['variables'].update({'error': error})
 
-        # Equality check for common columns and indexes, after rounding
-        f.print_title(1, 'Equality check', 'after rounding', file=str_io)
-        if df1_common.equals(df2_common):  # Are the dfs equal?
-            f.print_result('🥳 Equal', file=str_io)
             return _returner_for_compare(
                 equality_full=False,
-                equality_partial=True,
+                equality_partial=False,
                 equality_metadata=equality_metadata,
                 str_io=str_io,
                 report_print=report_print,
                 report_file_path=report_file_path,
+                export_in_background=export_in_background,
+                profiler=profiler,
             )
-        else:
-            f.print_result('😡 Not equal', file=str_io)
 
-        # MARK: ROUND/DTYPES SIMP
-        # if rounding was applied
-        # dtypes simplification, dtypes comparison and testing equality afterwards
+        # MARK: RENAMED COLS
+        # Detecting renamed columns using the content of exclusive columns
         # *************************************************************************
-        (
-            common_cols_post_round_dtypes_simplified,
-            after_round_and_simp_equality,
-            df1_common,
-            df2_common,
-            common_cols_post_round_dtypes_simplified_equality,
-            common_cols_post_round_dtypes_simplified_df,
-        ) = _dtypes_simp_and_eqlty_check(
+        cols_renamed_compared = False
+        if renamed_cols is not None and len(cols_df1_excl_set) > 0 and len(cols_df2_excl_set) > 0:
+            yield from _stage(checkpoint, 'RENAMED COLS', df1_cp, df2_cp)
+            f.print_title(
+                1,
+                'Detecting renamed columns',
+                'comparing the content of exclusive columns',
+                file=str_io,
+            )
+            cols_renamed_df = _detect_renamed_cols(
+                df1_cp.loc[
+                    idxs_common_list_sorted, pd_format.obj_as_sorted_list(cols_df1_excl_set)
+                ],
+                df2_cp.loc[
+                    idxs_common_list_sorted, pd_format.obj_as_sorted_list(cols_df2_excl_set)
+                ],
+                min_similarity=renamed_cols_min_similarity,
+                df1_name=df1_name,
+                df2_name=df2_name,
+                rows_hashes1=(
+                    None
+                    if _baseline is None or not df1_cp.index.is_unique
+                    else _baseline_cols_hashes(
+                        _baseline,
+                        pd_format.obj_as_sorted_list(cols_df1_excl_set),
+                        idxs=idxs_common_list_sorted,
+                    )
+                ),
+            )
+            equality_metadata['variables'].update({'cols_renamed_df': cols_renamed_df})
+
+            if len(idxs_common_list_sorted) == 0:
+                f.print_event(
+                    1, '😓 No common indexes, renamed columns can\'t be detected', file=str_io
+                )
+            elif len(cols_renamed_df.index) == 0:
+                f.print_event(1, '✅ No renamed columns found', file=str_io)
+            else:
+                f.print_event(
+                    1,
+                    f'😓 Probable renamed columns (count={len(cols_renamed_df.index)}), ({df1_name} column, {df2_name} column, similarity):',
+                    file=str_io,
+                )
+                f.pprint_wrap(
+                    1, list(cols_renamed_df.itertuples(index=False, name=None)), stream=str_io
+                )
+
+                if renamed_cols == 'compare':
+                    f.print_event(
+                        1,
+                        f'😈 From this point on, renamed columns are compared using {df1_name} column names',
+                        file=str_io,
+                    )
+                    df2_cp = df2_cp.rename(
+                        columns=dict(zip(cols_renamed_df[df2_name], cols_renamed_df[df1_name]))
+                    ).sort_index(axis=1)
+                    cols_common_set = cols_common_set | set(cols_renamed_df[df1_name])
+                    cols_df1_excl_set = cols_df1_excl_set - set(cols_renamed_df[df1_name])
+                    cols_df2_excl_set = cols_df2_excl_set - set(cols_renamed_df[df2_name])
+                    cols_common_list_sorted = pd_format.obj_as_sorted_list(cols_common_set)
+                    cols_renamed_compared = True
+                    equality_metadata['variables'].update(
+                        {
+                            'cols_common_set': cols_common_set,
+                            'cols_common_list_sorted': cols_common_list_sorted,
+                            'cols_df1_excl_set': cols_df1_excl_set,
+                            'cols_df2_excl_set': cols_df2_excl_set,
+                        }
+                    )
+
+        # MARK: MATCH ROWS
+        # Matching rows by their values, ignoring the index
+        # *************************************************************************
+        if match_rows is True:
+            yield from _stage(checkpoint, 'MATCH ROWS', df1_cp, df2_cp)
+            f.print_title(
+                1,
+                'Matching rows by their values',
+                'for common columns, ignoring the index',
+                file=str_io,
+            )
+            rows_multiset_equality, rows_moved_df = _match_rows(
+                df1_cp[cols_common_list_sorted],
+                df2_cp[cols_common_list_sorted],
+                df1_name=df1_name,
+                df2_name=df2_name,
+                rows_hashes1=(
+                    None
+                    if _baseline is None or len(cols_common_list_sorted) == 0
+                    else _combine_hashes(
+                        list(_baseline_cols_hashes(_baseline, cols_common_list_sorted).values()),
+                        len(df1_cp.index),
+                    )
+                ),
+            )
+            if len(rows_moved_df.index) == 0:
+                f.print_event(1, '✅ No rows under a different index', file=str_io)
+            else:
+                f.print_event(
+                    1,
+                    f'😓 Rows equal but under a different index (count={len(rows_moved_df.index)}), ({df1_name} index, {df2_name} index):',
+                    file=str_io,
+                )
+                f.pprint_wrap(
+                    1, list(rows_moved_df.itertuples(index=False, name=None)), stream=str_io
+                )
+
+            equality_metadata['variables'].update(
+                {
+                    'rows_multiset_equality': rows_multiset_equality,
+                    'rows_moved_df': rows_moved_df,
+                }
+            )
+
+            if rows_multiset_equality is True:
+                f.print_result('🥳 Equal ignoring the index and the order of the rows', file=str_io)
+                return _returner_for_compare(
+                    equality_full=False,
+                    equality_partial=True,
+                    equality_metadata=equality_metadata,
+                    str_io=str_io,
+                    report_print=report_print,
+                    report_file_path=report_file_path,
+                    export_in_background=export_in_background,
+                    profiler=profiler,
+                )
+            else:
+                f.print_result(
+                    '😡 Not equal ignoring the index and the order of the rows', file=str_io
+                )
+
+        # MARK: EQLTY 4 COMMON
+        # Only taking into consideration common columns and indexes
+        # Check if the two DataFrames are fully equal using Pandas' function
+        # *************************************************************************
+        yield from _stage(checkpoint, 'EQLTY 4 COMMON', df1_cp, df2_cp)
+        f.print_title(1, 'Checking common columns and indexes', file=str_io)
+        # Renamed columns make the previous equality check insufficient
+        are_all_cols_and_idxs_common = (
+            not cols_renamed_compared
+            and len(cols_df1_excl_set) == 0
+            and len(cols_df2_excl_set) == 0
+            and len(idxs_df1_excl_set) == 0
+            and len(idxs_df2_excl_set) == 0
+        )
+
+        # If the two DataFrames have the same columns and indexes,
+        # df{1,2}_common is indeed equal to df{1,2}_cp
+        # but to avoid duplicating code, df{1,2}_common is used from this point on
+        if _baseline is not None and _baseline['idxs_sorted_as_index']:
+            # df1's rows are already in the order of the sorted common indexes, selecting them by
+            # position avoids looking up every index (common columns are not duplicated in df1)
+            df1_common = df1_cp.iloc[
+                np.flatnonzero(~df1_cp.index.isin(list(idxs_df1_excl_set))),
+                df1_cp.columns.get_indexer_for(cols_common_list_sorted),
+            ]
+        else:
+            df1_common = df1_cp.loc[idxs_common_list_sorted, cols_common_list_sorted]
+        df2_common = df2_cp.loc[idxs_common_list_sorted, cols_common_list_sorted]
+
+        equality_metadata['variables'].update(
+            {
+                'df1_common': df1_common,
+                'df2_common': df2_common,
+            }
+        )
+
+        # Do the two DataFrames have no exclusive columns and indexes?
+        if are_all_cols_and_idxs_common:
+            f.print_event(1, '✅ Columns and indexes are equal in the two DataFrames', file=str_io)
+        else:
+            f.print_event(
+                1, '😓 Columns and indexes are not equal in the two DataFrames', file=str_io
+            )
+            f.print_event(
+                1, '😈 From this point on, comparing only common columns and indexes', file=str_io
+            )
+
+            # Equality check for common columns and indexes
+            f.print_title(1, 'Equality check', 'for common columns and indexes', file=str_io)
+            if df1_common.equals(df2_common):  # Are the dfs equal?
+                f.print_result('🥳 Equal', file=str_io)
+                return _returner_for_compare(
+                    equality_full=False,
+                    equality_partial=True,
+                    equality_metadata=equality_metadata,
+                    str_io=str_io,
+                    report_print=report_print,
+                    report_file_path=report_file_path,
+                    export_in_background=export_in_background,
+                    profiler=profiler,
+                )
+            else:
+                f.print_result('😡 Not equal', file=str_io)
+
+        # MARK: UNIFY CATEGORIES
+        # Categorical columns with different categories use the union of both categories,
+        # only the codes are changed, values are not decoded
+        # *************************************************************************
+        yield from _stage(checkpoint, 'UNIFY CATEGORIES', df1_common, df2_common)
+        cols_categories_unified, df1_common, df2_common = _unify_categories(df1_common, df2_common)
+        if len(cols_categories_unified) > 0:
+            f.print_title(1, 'Unifying categories', 'for categorical columns', file=str_io)
+            f.print_event(
+                1,
+                f'😓 Categories unified in columns (count={len(cols_categories_unified)}):',
+                file=str_io,
+            )
+            f.pprint_wrap(1, cols_categories_unified, stream=str_io)
+
+            equality_metadata['variables'].update(
+                {
+                    'cols_categories_unified': cols_categories_unified,
+                    'df1_common': df1_common,
+                    'df2_common': df2_common,
+                }
+            )
+
+            # Equality check for common columns and indexes, after unifying categories
+            f.print_title(1, 'Equality check', 'after unifying categories', file=str_io)
+            if df1_common.equals(df2_common):  # Are the dfs equal?
+                f.print_result('🥳 Equal', file=str_io)
+                return _returner_for_compare(
+                    equality_full=False,
+                    equality_partial=True,
+                    equality_metadata=equality_metadata,
+                    str_io=str_io,
+                    report_print=report_print,
+                    report_file_path=report_file_path,
+                    export_in_background=export_in_background,
+                    profiler=profiler,
+                )
+            else:
+                f.print_result('😡 Not equal', file=str_io)
+
+        # MARK: DTYPES COMP
+        # dtypes comparison
+        # *************************************************************************
+        yield from _stage(checkpoint, 'DTYPES COMP', df1_common, df2_common)
+        common_cols_dtypes_equality, common_cols_dtypes_metadata = compare_dtypes(
             df1=df1_common,
             df2=df2_common,
             df1_name=df1_name,
             df2_name=df2_name,
             show_all_dtypes=show_all_dtypes,
-            str_io=str_io,
+            report_print=False,
         )
+        print(common_cols_dtypes_metadata['report'], end='', file=str_io)
 
         equality_metadata['variables'].update(
             {
-                'common_cols_post_round_dtypes_simplified': common_cols_post_round_dtypes_simplified,
+                'common_cols_dtypes_equality': common_cols_dtypes_equality,
+                'common_cols_dtypes_df': common_cols_dtypes_metadata['dtypes_df'],
             }
         )
 
-        if common_cols_post_round_dtypes_simplified is True:
+        # MARK: DTYPES SIMP
+        # dtypes simplification, dtypes comparison and testing equality afterwards
+        # *************************************************************************
+        if common_cols_dtypes_equality is False:
+            yield from _stage(checkpoint, 'DTYPES SIMP', df1_common, df2_common)
+            f.print_title(1, 'Since dtypes are different, will try to simplify', file=str_io)
+
+            (
+                common_cols_dtypes_simplified,
+                after_simp_equality,
+                df1_common,
+                df2_common,
+                common_cols_dtypes_simplified_equality,
+                common_cols_dtypes_simplified_df,
+            ) = _dtypes_simp_and_eqlty_check(
+                df1=df1_common,
+                df2=df2_common,
+                df1_name=df1_name,
+                df2_name=df2_name,
+                show_all_dtypes=show_all_dtypes,
+                str_io=str_io,
+            )
 
             equality_metadata['variables'].update(
-                {
-                    'common_cols_post_round_dtypes_simplified_equality': common_cols_post_round_dtypes_simplified_equality,
-                    'common_cols_post_round_dtypes_simplified_df': common_cols_post_round_dtypes_simplified_df,
-                }
+                {'common_cols_dtypes_simplified': common_cols_dtypes_simplified}
+            )
+
+            if common_cols_dtypes_simplified is True:
+                equality_metadata['variables'].update(
+                    {
+                        'common_cols_dtypes_simplified_equality': common_cols_dtypes_simplified_equality,
+                        'common_cols_dtypes_simplified_df': common_cols_dtypes_simplified_df,
+                    }
+                )
+
+                if after_simp_equality is True:
+                    return _returner_for_compare(
+                        equality_full=False,
+                        equality_partial=True,
+                        equality_metadata=equality_metadata,
+                        str_io=str_io,
+                        report_print=report_print,
+                        report_file_path=report_file_path,
+                        export_in_background=export_in_background,
+                        profiler=profiler,
+                    )
+        else:
+            f.print_title(
+                1,
+                'Skipping equality check',
+                'since dtypes are equal, previous equality check is sufficient',
+                file=str_io,
             )
 
-            if after_round_and_simp_equality is True:
+        # MARK: ROUND_TO
+        # Rounding numeric columns.
+        # *************************************************************************
+        if round_to is not None:
+            yield from _stage(checkpoint, 'ROUND_TO', df1_common, df2_common)
+            f.print_title(1, f'Rounding [round_to={round_to}]', file=str_io)
+            df1_common = pd_format.approximate(df1_common, round_to=round_to)
+            df2_common = pd_format.approximate(df2_common, round_to=round_to)
+
+            # Equality check for common columns and indexes, after rounding
+            f.print_title(1, 'Equality check', 'after rounding', file=str_io)
+            if df1_common.equals(df2_common):  # Are the dfs equal?
+                f.print_result('🥳 Equal', file=str_io)
                 return _returner_for_compare(
                     equality_full=False,
                     equality_partial=True,
@@ -733,104 +2058,254 @@ def compare(
                     str_io=str_io,
                     report_print=report_print,
                     report_file_path=report_file_path,
+                    export_in_background=export_in_background,
+                    profiler=profiler,
                 )
+            else:
+                f.print_result('😡 Not equal', file=str_io)
 
-    # MARK: COMPARE VALUES
-    # Comparing values
-    #
-    # No equality check needed as one was done above when trying to simplify dtypes
-    # and if no simplification was done, that means that dtypes are equal
-    # and the previous equality check was sufficient
-    # *************************************************************************
-    f.print_title(
-        1,
-        'Comparing values',
-        'from this point on, the DataFrames must have at least one different cell',
-        file=str_io,
-    )
+            # MARK: ROUND/DTYPES SIMP
+            # if rounding was applied
+            # dtypes simplification, dtypes comparison and testing equality afterwards
+            # *************************************************************************
+            (
+                common_cols_post_round_dtypes_simplified,
+                after_round_and_simp_equality,
+                df1_common,
+                df2_common,
+                common_cols_post_round_dtypes_simplified_equality,
+                common_cols_post_round_dtypes_simplified_df,
+            ) = _dtypes_simp_and_eqlty_check(
+                df1=df1_common,
+                df2=df2_common,
+                df1_name=df1_name,
+                df2_name=df2_name,
+                show_all_dtypes=show_all_dtypes,
+                str_io=str_io,
+            )
 
-    equality_df = compute_equality_df(df1_common, df2_common)
+            equality_metadata['variables'].update(
+                {
+                    'common_cols_post_round_dtypes_simplified': common_cols_post_round_dtypes_simplified,
+                }
+            )
 
-    cols_equal_list = list(equality_df.columns[(equality_df.all(axis=0))])
-    cols_equal_list_sorted = pd_format.obj_as_sorted_list(cols_equal_list)
-    rows_equal_list = list(equality_df.index[equality_df.all(axis=1)])
-    rows_equal_list_sorted = pd_format.obj_as_sorted_list(rows_equal_list)
+            if common_cols_post_round_dtypes_simplified is True:
 
-    cols_diff_list = list(equality_df.columns[~(equality_df.all(axis=0))])
-    cols_diff_list_sorted = pd_format.obj_as_sorted_list(cols_diff_list)
-    f.print_event(1, f'😓 Not equal columns (count={len(cols_diff_list_sorted)}):', file=str_io)
-    f.pprint_wrap(1, pd_format.obj_as_sorted_list(cols_diff_list_sorted), stream=str_io)
+                equality_metadata['variables'].update(
+                    {
+                        'common_cols_post_round_dtypes_simplified_equality': common_cols_post_round_dtypes_simplified_equality,
+                        'common_cols_post_round_dtypes_simplified_df': common_cols_post_round_dtypes_simplified_df,
+                    }
+                )
 
-    rows_diff_list = list(equality_df.index[~equality_df.all(axis=1)])
-    rows_diff_list_sorted = pd_format.obj_as_sorted_list(rows_diff_list)
-    f.print_event(1, f'😓 Not equal rows (count={len(rows_diff_list_sorted)}):', file=str_io)
-    f.pprint_wrap(1, pd_format.obj_as_sorted_list(rows_diff_list_sorted), stream=str_io)
+                if after_round_and_simp_equality is True:
+                    return _returner_for_compare(
+                        equality_full=False,
+                        equality_partial=True,
+                        equality_metadata=equality_metadata,
+                        str_io=str_io,
+                        report_print=report_print,
+                        report_file_path=report_file_path,
+                        export_in_background=export_in_background,
+                        profiler=profiler,
+                    )
+
+        # MARK: COMPARE VALUES
+        # Comparing values
+        #
+        # No equality check needed as one was done above when trying to simplify dtypes
+        # and if no simplification was done, that means that dtypes are equal
+        # and the previous equality check was sufficient
+        # *************************************************************************
+        yield from _stage(checkpoint, 'COMPARE VALUES', df1_common, df2_common)
+        f.print_title(
+            1,
+            'Comparing values',
+            'from this point on, the DataFrames must have at least one different cell',
+            file=str_io,
+        )
 
-    equality_metadata['variables'].update(
-        {
-            'equality_df': equality_df,
-            'cols_equal_list_sorted': cols_equal_list_sorted,
-            'rows_equal_list_sorted': rows_equal_list_sorted,
-            'cols_diff_list_sorted': cols_diff_list_sorted,
-            'rows_diff_list_sorted': rows_diff_list_sorted,
-        }
-    )
+        equality_df = compute_equality_df(
+            df1_common,
+            df2_common,
+            comparators=comparators,
+            progress=functools.partial(_advance, checkpoint),
+        )
 
-    # MARK: JOINED DF
-    # Creating joined_df
-    # *************************************************************************
-    with pd.option_context('future.no_silent_downcasting', True):
-        only_diff_df = pd.DataFrame().reindex_like(equality_df).fillna(False).astype('bool')
-    only_diff_df[~equality_df] = True
+        # Reductions done on the underlying array, avoiding pandas' per column machinery
+        equality_arr = equality_df.to_numpy(dtype=bool, copy=False)
+        cols_all_equal = equality_arr.all(axis=0)
+        rows_all_equal = equality_arr.all(axis=1)
 
-    # See https://stackoverflow.com/a/61105984/1071459
-    joined_df = (
-        pd.concat(
-            (df1_common, df2_common, only_diff_df), axis=1, keys=(df1_name, df2_name, 'different')
-        )
-        .swaplevel(axis=1)
-        .sort_index(axis=1, level=0, sort_remaining=False)
-    )
+        # Values might be equal according to the comparators
+        if comparators is not None and cols_all_equal.all():
+            f.print_event(1, '✅ All values are equal using comparators', file=str_io)
+            equality_metadata['variables'].update({'equality_df': equality_df})
+            return _returner_for_compare(
+                equality_full=False,
+                equality_partial=True,
+                equality_metadata=equality_metadata,
+                str_io=str_io,
+                report_print=report_print,
+                report_file_path=report_file_path,
+                export_in_background=export_in_background,
+                profiler=profiler,
+            )
 
-    equality_metadata['variables'].update({'joined_df': joined_df})
+        cols_equal_list = list(equality_df.columns[cols_all_equal])
+        cols_equal_list_sorted = pd_format.obj_as_sorted_list(cols_equal_list)
+        rows_equal_list = list(equality_df.index[rows_all_equal])
+        rows_equal_list_sorted = pd_format.obj_as_sorted_list(rows_equal_list)
 
-    # MARK: EXCEL
-    # Saving to Excel
-    # *************************************************************************
-    if xls_path is not None:
-        # Add level to DataFrame, see https://datascientyst.com/add-level-index-pandas-dataframe/
-        df1_fixed_cols_added_level = pd.concat(
-            [df1_common.loc[idxs_common_list_sorted, xls_fixed_cols]],
-            keys=[df1_name],
-            axis=1,
-        )
-        df2_fixed_cols_added_level = pd.concat(
-            [df2_common.loc[idxs_common_list_sorted, xls_fixed_cols]],
-            keys=[df2_name],
-            axis=1,
+        cols_diff_list = list(equality_df.columns[~cols_all_equal])
+        cols_diff_list_sorted = pd_format.obj_as_sorted_list(cols_diff_list)
+        f.print_event(1, f'😓 Not equal columns (count={len(cols_diff_list_sorted)}):', file=str_io)
+        f.pprint_wrap(1, pd_format.obj_as_sorted_list(cols_diff_list_sorted), stream=str_io)
+
+        rows_diff_list = list(equality_df.index[~rows_all_equal])
+        rows_diff_list_sorted = pd_format.obj_as_sorted_list(rows_diff_list)
+        f.print_event(1, f'😓 Not equal rows (count={len(rows_diff_list_sorted)}):', file=str_io)
+        f.pprint_wrap(1, pd_format.obj_as_sorted_list(rows_diff_list_sorted), stream=str_io)
+
+        equality_metadata['variables'].update(
+            {
+                'equality_df': equality_df,
+                'cols_equal_list_sorted': cols_equal_list_sorted,
+                'rows_equal_list_sorted': rows_equal_list_sorted,
+                'cols_diff_list_sorted': cols_diff_list_sorted,
+                'rows_diff_list_sorted': rows_diff_list_sorted,
+            }
         )
 
-        fixed_cols_df = (
-            pd.merge(
-                df1_fixed_cols_added_level,
-                df2_fixed_cols_added_level,
-                left_index=True,
-                right_index=True,
+        # MARK: DIFF STATS
+        # Statistics of the differences of numeric columns
+        # *************************************************************************
+        if diff_stats:
+            yield from _stage(checkpoint, 'DIFF STATS', df1_common, df2_common)
+            f.print_title(1, 'Computing differences statistics', 'for numeric columns', file=str_io)
+            diff_stats_df = _numeric_diff_stats(
+                df1_common, df2_common, equality_arr, cols_all_equal
             )
-            .swaplevel(axis=1)[xls_fixed_cols]
-            .rename(mapper=lambda x: f'{x} (fixed_cols)', axis='columns', level=0)
-        )
+            equality_metadata['variables'].update({'diff_stats_df': diff_stats_df})
+            if len(diff_stats_df.index) == 0:
+                f.print_event(1, '✅ No numeric columns with different values', file=str_io)
+            else:
+                f.print_event(
+                    1,
+                    f'😓 Differences of numeric columns (count={len(diff_stats_df.index)}):',
+                    file=str_io,
+                )
+                _print_diff_stats_table(diff_stats_df, str_io)
 
-        # Create a DataFrame with the equal (`xls_compare_str_equal`) or different (`xls_compare_str_diff`) string
-        only_diff_for_excel_df = (
-            pd.DataFrame().reindex_like(equality_df).fillna(xls_compare_str_equal)
-        )
-        only_diff_for_excel_df[~equality_df] = xls_compare_str_diff
+        # MARK: TOP K
+        # Largest differences of numeric columns
+        # *************************************************************************
+        if top_k is not None:
+            yield from _stage(checkpoint, 'TOP K', df1_common, df2_common)
+            f.print_title(
+                1,
+                f'Finding the largest differences [top_k={top_k}]',
+                'for numeric columns',
+                file=str_io,
+            )
+            top_k_diffs_df = _top_k_diffs(
+                df1_common,
+                df2_common,
+                equality_arr,
+                cols_all_equal,
+                k=top_k,
+                df1_name=df1_name,
+                df2_name=df2_name,
+            )
+            equality_metadata['variables'].update({'top_k_diffs_df': top_k_diffs_df})
+            if len(top_k_diffs_df.index) == 0:
+                f.print_event(1, '✅ No numeric columns with different values', file=str_io)
+            for col, col_top_k_df in top_k_diffs_df.groupby('column', sort=False):
+                f.print_event(
+                    1,
+                    f'😓 {col} (count={len(col_top_k_df.index)}), (index, {df1_name}, {df2_name}, delta):',
+                    file=str_io,
+                )
+                f.pprint_wrap(
+                    1,
+                    list(col_top_k_df.drop(columns='column').itertuples(index=False, name=None)),
+                    stream=str_io,
+                )
+
+        # MARK: DIFF PATTERNS
+        # Grouping different rows by their pattern of different columns
+        # *************************************************************************
+        if diff_patterns is not None:
+            yield from _stage(checkpoint, 'DIFF PATTERNS', df1_common, df2_common)
+            f.print_title(
+                1,
+                f'Grouping rows by different columns [diff_patterns={diff_patterns}]',
+                'most frequent patterns first',
+                file=str_io,
+            )
+            diff_patterns_count, diff_patterns_df = _diff_patterns(
+                equality_df, equality_arr, rows_all_equal, top=diff_patterns
+            )
+            equality_metadata['variables'].update(
+                {
+                    'diff_patterns_count': diff_patterns_count,
+                    'diff_patterns_df': diff_patterns_df,
+                }
+            )
+            f.print_event(
+                1,
+                f'😓 Patterns of different columns (count={diff_patterns_count}), showing {len(diff_patterns_df.index)}, (columns, rows count, rows sample):',
+                file=str_io,
+            )
+            f.pprint_wrap(
+                1, list(diff_patterns_df.itertuples(index=False, name=None)), stream=str_io
+            )
+
+        # MARK: CHANGE TYPES
+        # Counting the different cells by type of change
+        # *************************************************************************
+        if change_types:
+            yield from _stage(checkpoint, 'CHANGE TYPES', df1_common, df2_common)
+            f.print_title(
+                1, 'Counting changes by type', 'for columns with different values', file=str_io
+            )
+            change_types_df = _change_types(df1_common, df2_common, equality_arr, cols_all_equal)
+            equality_metadata['variables'].update({'change_types_df': change_types_df})
+            f.print_event(
+                1, f'😓 Changes by type (count={len(change_types_df.index)} columns):', file=str_io
+            )
+            _print_table(
+                [
+                    [
+                        'column',
+                        'null_to_value',
+                        'value_to_null',
+                        'type',
+                        'increase',
+                        'decrease',
+                        'value',
+                    ]
+                ]
+                + [
+                    [str(col)] + [str(count) for count in col_counts]
+                    for col, col_counts in zip(
+                        change_types_df.index, change_types_df.itertuples(index=False, name=None)
+                    )
+                ],
+                str_io,
+            )
+
+        # MARK: JOINED DF
+        # Creating joined_df
+        # *************************************************************************
+        yield from _stage(checkpoint, 'JOINED DF', df1_common, df2_common)
+        only_diff_df = ~equality_df
 
         # See https://stackoverflow.com/a/61105984/1071459
-        joined_for_excel_df = (
+        joined_df = (
             pd.concat(
-                (df1_common, df2_common, only_diff_for_excel_df),
+                (df1_common, df2_common, only_diff_df),
                 axis=1,
                 keys=(df1_name, df2_name, 'different'),
             )
@@ -838,28 +2313,344 @@ def compare(
             .sort_index(axis=1, level=0, sort_remaining=False)
         )
 
-        xls_df = pd.merge(fixed_cols_df, joined_for_excel_df, left_index=True, right_index=True)
-        freeze_on_colindex = len(fixed_cols_df.columns)
-        f.print_title(1, 'Creating Excel', os.path.realpath(xls_path), file=str_io)
-        _save_excel(
-            xls_df,
-            path=os.path.realpath(xls_path),
-            freeze_on_colindex=freeze_on_colindex,
-            datetime_rpl_str=xls_datetime_rpl,
-        )
+        equality_metadata['variables'].update({'joined_df': joined_df})
 
-        equality_metadata['variables'].update(
-            {
-                'xls_path': os.path.realpath(xls_path),
-            }
+        # MARK: EXCEL
+        # Saving to Excel
+        # *************************************************************************
+        if xls_path is not None:
+            yield from _stage(checkpoint, 'EXCEL', df1_common, df2_common)
+            # Add level to DataFrame, see https://datascientyst.com/add-level-index-pandas-dataframe/
+            df1_fixed_cols_added_level = pd.concat(
+                [df1_common.loc[idxs_common_list_sorted, xls_fixed_cols]],
+                keys=[df1_name],
+                axis=1,
+            )
+            df2_fixed_cols_added_level = pd.concat(
+                [df2_common.loc[idxs_common_list_sorted, xls_fixed_cols]],
+                keys=[df2_name],
+                axis=1,
+            )
+
+            fixed_cols_df = (
+                pd.merge(
+                    df1_fixed_cols_added_level,
+                    df2_fixed_cols_added_level,
+                    left_index=True,
+                    right_index=True,
+                )
+                .swaplevel(axis=1)[xls_fixed_cols]
+                .rename(mapper=lambda x: f'{x} (fixed_cols)', axis='columns', level=0)
+            )
+
+            if xls_diff_mode == 'column':
+                # Create a DataFrame with the equal (`xls_compare_str_equal`) or different (`xls_compare_str_diff`) string
+                only_diff_for_excel_df = (
+                    pd.DataFrame().reindex_like(equality_df).fillna(xls_compare_str_equal)
+                )
+                only_diff_for_excel_df[~equality_df] = xls_compare_str_diff
+                for_excel_dfs = (df1_common, df2_common, only_diff_for_excel_df)
+                for_excel_keys = (df1_name, df2_name, 'different')
+            else:
+                # Different cells are highlighted using conditional formatting in `_save_excel()`
+                for_excel_dfs = (df1_common, df2_common)
+                for_excel_keys = (df1_name, df2_name)
+
+            # See https://stackoverflow.com/a/61105984/1071459
+            joined_for_excel_df = (
+                pd.concat(
+                    for_excel_dfs,
+                    axis=1,
+                    keys=for_excel_keys,
+                )
+                .swaplevel(axis=1)
+                .sort_index(axis=1, level=0, sort_remaining=False)
+            )
+
+            xls_df = pd.merge(fixed_cols_df, joined_for_excel_df, left_index=True, right_index=True)
+            freeze_on_colindex = len(fixed_cols_df.columns)
+            diff_ranges = None
+            if xls_diff_mode == 'format':
+                diff_ranges = _diff_ranges_for_excel(equality_df, xls_df, df1_name)
+            f.print_title(1, 'Creating Excel', os.path.realpath(xls_path), file=str_io)
+            xls_sheets = _excel_sheet_names(_plan_excel_sheets(xls_df, freeze_on_colindex))
+            # The Excel file is saved when returning, optionally in the background
+            exports.append(
+                functools.partial(
+                    _save_excel,
+                    xls_df,
+                    path=os.path.realpath(xls_path),
+                    freeze_on_colindex=freeze_on_colindex,
+                    datetime_rpl_str=xls_datetime_rpl,
+                    diff_ranges=diff_ranges,
+                    number_precision=xls_number_precision,
+                    thousands_sep=xls_thousands_sep,
+                )
+            )
+
+            if len(xls_sheets) > 1:
+                f.print_event(
+                    1,
+                    f'😓 Data doesn\'t fit in one Excel sheet, split in {len(xls_sheets)} sheets (see sheet \'Summary\')',
+                    file=str_io,
+                )
+
+            equality_metadata['variables'].update(
+                {
+                    'xls_path': os.path.realpath(xls_path),
+                    'xls_sheets': xls_sheets,
+                }
+            )
+
+        # MARK: DIFF FILES
+        # Saving to columnar files
+        # *************************************************************************
+        if diff_path is not None:
+            yield from _stage(checkpoint, 'DIFF FILES', df1_common, df2_common)
+            f.print_title(1, 'Creating diff files', os.path.realpath(diff_path), file=str_io)
+            # The files are saved when returning, optionally in the background
+            exports.append(
+                functools.partial(
+                    _module_diff_files.save_diff_files,
+                    equality_df=equality_df,
+                    joined_df=joined_df,
+                    diff_path=diff_path,
+                    diff_format=diff_format,
+                )
+            )
+
+            equality_metadata['variables'].update(
+                {
+                    'diff_files': _module_diff_files.diff_files_paths(diff_path, diff_format),
+                }
+            )
+
+        # MARK: RETURN
+        yield from _stage(checkpoint, 'RETURN')
+        return _returner_for_compare(
+            equality_full=False,
+            equality_partial=False,
+            equality_metadata=equality_metadata,
+            str_io=str_io,
+            report_print=report_print,
+            report_file_path=report_file_path,
+            export_in_background=export_in_background,
+            exports=exports,
+            profiler=profiler,
         )
+    finally:
+        profiler.stop()
 
-    # MARK: RETURN
-    return _returner_for_compare(
-        equality_full=False,
-        equality_partial=False,
-        equality_metadata=equality_metadata,
-        str_io=str_io,
-        report_print=report_print,
-        report_file_path=report_file_path,
+
+def compare(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    df1_name: str = 'df1',
+    df2_name: str = 'df2',
+    round_to: None | int | str = None,
+    report_print: bool = True,
+    report_file_path: None | str = None,
+    report_file_overwrite: bool = False,
+    show_common_cols: bool = False,
+    show_common_idxs: bool = False,
+    show_all_dtypes: bool = False,
+    xls_path: None | str = None,
+    xls_overwrite: bool = False,
+    xls_compare_str_equal: str = '',
+    xls_compare_str_diff: str = '*_diff_*',
+    xls_fixed_cols: None | list = None,
+    xls_datetime_rpl: str = '%Y-%m-%d %H:%M:%S',
+    xls_diff_mode: str = 'column',
+    xls_number_precision: None | int = None,
+    xls_thousands_sep: bool = False,
+    export_in_background: bool = False,
+    diff_path: None | str = None,
+    diff_format: str = 'parquet',
+    diff_overwrite: bool = False,
+    comparators: None | dict = None,
+    on: None | str | list = None,
+    match_rows: bool = False,
+    renamed_cols: None | str = None,
+    renamed_cols_min_similarity: float = 1.0,
+    diff_stats: bool = False,
+    top_k: None | int = None,
+    diff_patterns: None | int = None,
+    change_types: bool = False,
+    profile: bool = False,
+    progress: None | Callable = None,
+    deadline: None | float = None,
+    cancel_event: None | threading.Event = None,
+) -> tuple[bool, bool, dict]:
+    """Compares two DataFrames, creates a report and returns useful information (see the "Returns" section).
+
+    **When is this function useful**: This function should be run when `df1.equals(df2)` is False, but if that returns True, there is no use for this function.
+
+    **Columns and indexes are sorted initially**: The function's initial step is to sort the columns and rows of both DataFrames to do all further comparisons, it then internally does `df1.equals(df2)` with the sorted columns and rows. The sorting is done like `df.sort_index(axis=0).sort_index(axis=1)` which sorts by labels.
+
+    **Important**: Duplicate indexes and columns are not allowed, UNLESS `df1_cp.equals(df2_cp)` is True, which means everything is equal.
+
+    **Further reading**: This docstring contains documentation for this function but for an explanation of what is returned but see [this link](https://github.com/caballerofelipe/some_pd_tools/blob/main/Report\\%20and\\%20logic\\%20explanation\\%20for\\%20pd_compare.compare.md) to understand what the report shows, the logic behind it and what is returned.
+
+    **Some notes**:
+    - The whole goal of this function is to find differences in DataFrames, once they are found to be equal, the comparison stops. While looking for differences a report is created that will be printed (optionally), returned and saved to a file (optionally).
+    - The report is the main focus of this function. The goal is to provide insight into how the DataFrames differ (if they do) the usage of the returned tuple might not be needed. However, if more information is needed or could be useful, the variables provided in the metadata might help.
+    - This function is meant to be called interactively, possibly using Jupyter. It isn't meant to be run as a verification function, although it can be used like that, than might not be advised depending on the specific situation. The function will return a tuple of 3. In the returned tuple:
+        - The first element will return True if everything is equal in the two DataFrame, this uses df1.equals(df2) but using the sorted columns and indexes.
+        - The second element will return True if after some modification in the two DataFrames, everything is equal. This check happens after several points in the comparison process.
+        - The third element will return metadata. This metadata depends on where in the function it was returned. The metadata is returned if the two DataFrames are equal, after some transformation. Or it is returned at the end of the function. The metadata values should be obtained with `.get()` since metadata is a dict and the key might not exist at a given point when returned.
+
+    *A final note*: This functions is a little messy but I think: "doing something that works is better than not doing something perfect". There's room for improvement that might or might not be done in the future.
+
+    Parameters
+    ----------
+    df1 : pd.DataFrame
+        The first DataFrame to compare.
+    df2 : pd.DataFrame
+        The second DataFrame to compare.
+    df1_name : str, optional
+        The name to show in the report for the first DataFrame, by default 'df1'.
+    df2_name : str, optional
+        The name to show in the report for the second DataFrame, by default 'df2'.
+    round_to : None | int | str, optional
+        The way to approximate, by default None. Possible values and their meaning:
+        - **None**: nothing is done.
+        - **'int'**: rounds floating numbers to this decimal.
+        - **'floor'**: does a floor operation on floats columns. Uses np.floor. From np.floor's documentation: "The floor of the scalar x is the largest integer i, such that i <= x."
+        - **'ceil'**: does a ceil operation on floats columns. Uses np.ceil. From np.ceil's documentation: "The ceil of the scalar x is the smallest integer i, such that i >= x.".
+        - **'trunc'**: removes decimals from floats columns. Uses np.trunc. From np.trunc's documentation: "The truncated value of the scalar x is the nearest integer i which is closer to zero than x is.".
+    report_print : bool, optional
+        Whether to print a report when the function ends, by default True.
+    report_file_path : None | str, optional
+        If set to a string, saves the report to the specified file, by default None.
+    report_file_overwrite : bool, optional
+        Whether to overwrite the specified path (when using report_file_path), by default False.
+    show_common_cols : bool, optional
+        Whether to show the common columns between the two compared DataFrames, by default False.
+    show_common_idxs : bool, optional
+        Whether to show the common indexes between the two compared DataFrames, by default False.
+    show_all_dtypes : bool, optional
+        For common columns, whether to show the columns that have the same dtype in the report, by default False.
+    xls_path : None | str, optional
+        If set to a string, creates an Excel file to the specified file, by default None. If the data doesn't fit Excel's limits (1,048,576 rows and 16,384 columns per sheet) it is split in several sheets and a 'Summary' sheet is added.
+    xls_overwrite : bool, optional
+        Whether to overwrite the specified path (when using xls_overwrite), by default False.
+    xls_compare_str_equal : str, optional
+        A string to be placed inside a cell in the Excel file when both DataFrames contain the same value. Useful to know what cells are equal in the two DataFrames, by default empty. Can be used with the *find* function in Excel. By default ''.
+    xls_compare_str_diff : str, optional
+        A string to be placed inside a cell in the Excel file when the cell's value in the tow DataFrames is different. Useful to know what cells are different in the two DataFrames, by default "`*_diff_*`". Can be used with the *find* function in Excel. By default '*_diff_*'.
+    xls_fixed_cols : None | list, optional
+        A list of str containing columns that will be fixed in the generated Excel file. The columns in the list must exist in both DataFrames. By default None.
+    xls_datetime_rpl : _type_, optional
+        A string containing the format to be used for a column with a datetime64 dtype, useful to have a specific format for dates in Excel, by default '%Y-%m-%d %H:%M:%S'. Datetimes are written as Excel dates (not strings), this strftime format is translated to an Excel number format, only these directives are supported: %Y, %y, %m, %B, %b, %d, %A, %a, %H, %I, %M, %S, %f (milliseconds), %p and %%. %M must follow %H or %I (e.g. '%H:%M', Excel reads it as the month otherwise) and %I requires %p. If set to '' the default format from Pandas is used.
+    xls_diff_mode : str, optional
+        How different cells are shown in the Excel file, by default 'column'. Possible values and their meaning:
+        - **'column'**: for every compared column a third column called 'different' is added next to the values of the two DataFrames, containing `xls_compare_str_equal` or `xls_compare_str_diff`.
+        - **'format'**: only the values of the two DataFrames are written and different cells are highlighted using conditional formatting. This creates a smaller file that is written faster. `xls_compare_str_equal` and `xls_compare_str_diff` are not used.
+    xls_number_precision : None | int, optional
+        The number of decimals shown for float columns in the Excel file, by default None (Excel's default). Numbers are kept as Excel numbers, only the number format changes.
+    xls_thousands_sep : bool, optional
+        Whether to show a thousands separator for numeric columns in the Excel file, by default False. The separator shown depends on Excel's regional settings.
+    diff_path : None | str, optional
+        If set to a string, creates a directory (if it doesn't exist) with the comparison saved to columnar files, a faster alternative to the Excel file, by default None. The files are 'equality_df' (the equality mask), 'diff_cells' (a list of the different cells' index and column) and 'joined_df' (with columns named like "{column} ({df_name})").
+    diff_format : str, optional
+        The format of the files created in `diff_path`, by default 'parquet'. One of 'parquet', 'arrow' (Arrow IPC file) or 'csv'. 'parquet' and 'arrow' require pyarrow to be installed.
+    diff_overwrite : bool, optional
+        Whether to overwrite the files in `diff_path` if they exist, by default False.
+    comparators : None | dict, optional
+        Functions used to compare specific columns' values instead of the usual equality, by default None. The keys are either a column name or a dtype and the values are functions, see `pd_compare.compute_equality_df()` for more details and the built-in comparators. If all values are equal using the comparators, `equality_partial` is True.
+    on : None | str | list, optional
+        A column name or a list of column names (keys) used to match the rows of the two DataFrames instead of their indexes, by default None. The key columns must exist in both DataFrames, they are used as the index (the original indexes are dropped) and are not compared as values. Keys are encoded as integer codes jointly for both DataFrames and sorted once; exclusive and duplicated keys are reported like indexes.
+    match_rows : bool, optional
+        Whether to match the rows of the two DataFrames by their values (common columns only), ignoring the index, by default False. Each row is hashed and rows are matched with a hash join, this reports rows that are identical but under a different index (moved or re-indexed) and checks if the two DataFrames have the same rows ignoring the index and the order (multiset equality), in which case `equality_partial` is True.
+    renamed_cols : None | str, optional
+        Whether to look for renamed columns, by default None (not done). One of 'detect' or 'compare'. The content of the columns exclusive to each DataFrame is hashed (common indexes only) and pairs of columns with the same content are reported as probable renames. If 'compare', the pairs are compared as if they had the same name (df2's columns are renamed).
+    renamed_cols_min_similarity : float, optional
+        The minimum similarity (between 0 and 1) for a pair of columns to be considered renamed when using `renamed_cols`, by default 1.0 (identical content). If lower than 1, the similarity of columns without identical content is the share of equal values in a sample of rows.
+    diff_stats : bool, optional
+        Whether to compute statistics of the differences of numeric columns, by default False. For every numeric column with different values, the count of different cells, the count of cells where only one value is missing, and the max and mean absolute and relative differences are shown in the report and returned in a DataFrame.
+    top_k : None | int, optional
+        The number of largest differences to find for every numeric column with different values, by default None (not done). The rows with the `top_k` largest absolute differences are shown in the report and returned in a DataFrame (index, values and difference).
+    diff_patterns : None | int, optional
+        The number of most frequent patterns of different columns to show, by default None (not done). Rows with different values are grouped by the set of columns that are different in them, and the patterns are shown with their count of rows and a sample of row labels.
+    change_types : bool, optional
+        Whether to count the different cells of every column by type of change, by default False. The change types are 'null_to_value', 'value_to_null', 'type_change' (object columns), 'increase' and 'decrease' (numeric columns) and 'value_change' (any other change).
+    profile : bool, optional
+        Whether to record the wall time, CPU time, memory allocation (using `tracemalloc`, which makes the comparison slower) and the shapes of the DataFrames of every stage of the comparison, by default False. The result is shown as a table in the report and returned in equality_metadata['profile'].
+    progress : None | Callable, optional
+        A function to follow the progress of the comparison, by default None. It's called as `progress(event, stage, fraction)`, where `stage` is the name of a stage of the comparison (see `profile`), `event` is 'start' (`fraction` is 0.0) or 'end' (`fraction` is 1.0) for every stage, and 'progress' with the fraction of the stage already done while comparing values (stage 'COMPARE VALUES'). Useful to drive a progress bar or log heartbeats.
+    deadline : None | float, optional
+        A time (in seconds since the epoch, like `time.time()`) after which the comparison is cancelled, by default None. It's checked between stages and while comparing values. When cancelled, the report and metadata gathered so far are returned, equality_full and equality_partial are False and equality_metadata['cancelled'] is True. No files are saved except for the report file, the files that were not saved are listed in the report.
+    cancel_event : None | threading.Event, optional
+        An event (any object with an `is_set()` method, like `threading.Event`) that cancels the comparison when set, by default None. It's checked like `deadline`.
+    export_in_background : bool, optional
+        Whether to save the files (the Excel file, the diff files and the report file) in a background thread, by default False. If True, the function returns without waiting for the files to be saved and `equality_metadata['variables']['export_future']` contains a `concurrent.futures.Future`, calling its `result()` method waits for the files to be saved and raises any exception that happened while saving them.
+
+    Returns
+    -------
+    tuple[bool, bool, dict]
+        Next is an explanation of what is returned but see [this link](https://github.com/caballerofelipe/some_pd_tools/blob/main/Report\\%20and\\%20logic\\%20explanation\\%20for\\%20pd_compare.compare.md) to understand what the report shows, the logic behind it and what is returned in the key 'variables' of the third tuple; this information was left out of this docstring to avoid too much information.
+        - <b>tuple[0]</b>: bool. Checks for full equality for the two DataFrames **after** sorting columns and indexes.
+            <ul>
+                <li><b>True</b> if the two compared DataFrames are completely equal.</li>
+                <li><b>False</b> otherwise.</li>
+            </ul>
+        - <b>tuple[1]</b>: bool. Checks for full equality for the two DataFrames **after** some operation done to them, see below for explanation of which operations are done.
+            <ul>
+                <li><b>True</b> if the two compared DataFrames are equal after some operation.</li>
+                <li><b>False</b> otherwise.</li>
+            </ul>
+        - <b>tuple[2]</b>: dict. Metadata useful to keep track of what was done during the comparison:
+            <ul>
+                <li><b>['params']</b>: The list of parameters used in the function call.</li>
+                <li><b>['variables']</b>: Some inner variables useful to keep track of what happened in the comparison and have information on what is different.</li>
+                <li><b>['report']</b>: The same report, useful if the report wasn't printed (`report_print` == False) or to do something with it.</li>
+                <li><b>['profile']</b>: Only if `profile` is True, a DataFrame with the wall time, CPU time, memory allocation and DataFrames' shapes of every stage.</li>
+                <li><b>['cancelled']</b>: Only if `deadline` or `cancel_event` is not None, True if the comparison was cancelled.</li>
+            </ul>
+
+    Raises
+    ------
+    ValueError
+        Parameters are reviewed and an ValueError is raised if they don't have the specified values. No further documentation added to avoid too much information.
+    """
+    return _run_compare_gen(
+        _compare_gen(
+            df1=df1,
+            df2=df2,
+            df1_name=df1_name,
+            df2_name=df2_name,
+            round_to=round_to,
+            report_print=report_print,
+            report_file_path=report_file_path,
+            report_file_overwrite=report_file_overwrite,
+            show_common_cols=show_common_cols,
+            show_common_idxs=show_common_idxs,
+            show_all_dtypes=show_all_dtypes,
+            xls_path=xls_path,
+            xls_overwrite=xls_overwrite,
+            xls_compare_str_equal=xls_compare_str_equal,
+            xls_compare_str_diff=xls_compare_str_diff,
+            xls_fixed_cols=xls_fixed_cols,
+            xls_datetime_rpl=xls_datetime_rpl,
+            xls_diff_mode=xls_diff_mode,
+            xls_number_precision=xls_number_precision,
+            xls_thousands_sep=xls_thousands_sep,
+            export_in_background=export_in_background,
+            diff_path=diff_path,
+            diff_format=diff_format,
+            diff_overwrite=diff_overwrite,
+            comparators=comparators,
+            on=on,
+            match_rows=match_rows,
+            renamed_cols=renamed_cols,
+            renamed_cols_min_similarity=renamed_cols_min_similarity,
+            diff_stats=diff_stats,
+            top_k=top_k,
+            diff_patterns=diff_patterns,
+            change_types=change_types,
+            profile=profile,
+            progress=progress,
+            deadline=deadline,
+            cancel_event=cancel_event,
+        )
     )
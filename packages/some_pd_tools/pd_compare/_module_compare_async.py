@@ -0,0 +1,107 @@
+import asyncio
+import concurrent.futures
+import functools
+from typing import Generator
+
+import pandas as pd
+
+from . import _module_compare
+
+
+def _resume(compare_gen: Generator) -> tuple[bool, object]:
+    '''Run the next stage of `compare_gen`, return (True, result) if it ended, else (False, checkpoint).
+
+    StopIteration can't be raised through an asyncio future, so it's turned into a return value.
+    '''
+    try:
+        return False, next(compare_gen)
+    except StopIteration as stop:
+        return True, stop.value
+
+
+async def compare_async(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    executor: str | concurrent.futures.Executor = 'thread',
+    **kwargs,
+) -> tuple[bool, bool, dict]:
+    """Asyncio version of `pd_compare.compare()`, the comparison runs in an executor without blocking the event loop.
+
+    With a thread executor, every stage of the comparison runs in the executor and control returns to the event loop between stages. Cancelling the task stops the comparison at the next check (between stages or, while comparing values, after every group of columns) and raises `asyncio.CancelledError` as usual. The `progress` function (if any) is called from the executor's thread.
+
+    With a process executor, `pd_compare.compare()` runs as a whole in a worker process, so all parameters must be picklable (`progress`, `cancel_event` and `export_in_background` can't be used). Cancelling the task doesn't stop the worker, its result is discarded.
+
+    Parameters
+    ----------
+    df1 : pd.DataFrame
+        First DataFrame to compare.
+    df2 : pd.DataFrame
+        Second DataFrame to compare.
+    executor : str | concurrent.futures.Executor, optional
+        Where the comparison runs, by default 'thread'. Either 'thread' (the event loop's default executor), 'process' (a new single process pool for this call) or a `concurrent.futures.Executor` (a `concurrent.futures.ProcessPoolExecutor` runs it in a process).
+    **kwargs
+        The other parameters of `pd_compare.compare()`.
+
+    Returns
+    -------
+    tuple[bool, bool, dict]
+        The same as `pd_compare.compare()`.
+
+    Raises
+    ------
+    ValueError
+        "executor must be 'thread', 'process' or a concurrent.futures.Executor."
+    ValueError
+        "progress, cancel_event and export_in_background can't be used with a process executor."
+    ValueError
+        The same as `pd_compare.compare()`.
+    """
+    if not (executor in ('thread', 'process') or isinstance(executor, concurrent.futures.Executor)):
+        raise ValueError("executor must be 'thread', 'process' or a concurrent.futures.Executor.")
+
+    loop = asyncio.get_running_loop()
+
+    # MARK: PROCESS
+    if executor == 'process' or isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+        if (
+            kwargs.get('progress') is not None
+            or kwargs.get('cancel_event') is not None
+            or kwargs.get('export_in_background', False) is not False
+        ):
+            raise ValueError(
+                "progress, cancel_event and export_in_background can't be used with a process executor."
+            )
+        compare_call = functools.partial(_module_compare.compare, df1, df2, **kwargs)
+        if executor != 'process':
+            return await loop.run_in_executor(executor, compare_call)
+        process_executor = concurrent.futures.ProcessPoolExecutor(max_workers=1)
+        try:
+            return await loop.run_in_executor(process_executor, compare_call)
+        finally:
+            # Not waiting for the worker, so a cancelled task doesn't block the event loop
+            process_executor.shutdown(wait=False, cancel_futures=True)
+
+    # MARK: THREAD
+    # The default executor is used when `executor` is None
+    if executor == 'thread':
+        executor = None
+    compare_gen = _module_compare._compare_gen(df1, df2, **kwargs)
+    checkpoint = None
+    try:
+        while True:
+            ended, value = await loop.run_in_executor(executor, _resume, compare_gen)
+            if ended:
+                return value
+            checkpoint = value
+            _module_compare._raise_if_cancelled(checkpoint)
+    except _module_compare._CompareCancelled as cancelled:
+        try:
+            return _module_compare._returner_for_cancelled(checkpoint, reason=str(cancelled))
+        finally:
+            # Closed after `_returner_for_cancelled()`, which still uses the profiler
+            compare_gen.close()
+    except asyncio.CancelledError:
+        # The stage running in the executor can't be interrupted, it stops at its next check
+        if checkpoint is not None:
+            checkpoint['cancel_requested'] = True
+        raise
@@ -0,0 +1,73 @@
+from typing import Generator
+
+import pandas as pd
+
+from . import _module_compare
+
+
+def _metadata_snapshot(equality_metadata: dict) -> dict:
+    '''Return a copy of `equality_metadata` and its ['variables'] dict, values are not copied.'''
+    return {**equality_metadata, 'variables': dict(equality_metadata['variables'])}
+
+
+def compare_iter(df1: pd.DataFrame, df2: pd.DataFrame, **kwargs) -> Generator[dict, None, None]:
+    """Generator version of `pd_compare.compare()`, yields a result after every stage of the comparison.
+
+    This allows getting the first answers (e.g. are the columns equal? the indexes? the dtypes?) and stopping before the expensive stages (comparing values, creating `joined_df` and the Excel file), which are never run if the generator is not resumed. The time spent by the caller between results is not included in any stage when using `profile`.
+
+    Every result is a dict with the keys:
+    - **'stage'**: the name of the stage just done (e.g. 'COMPARE COLUMNS', see `profile` in `pd_compare.compare()`).
+    - **'done'**: True for the last result, when the comparison ended (or was cancelled).
+    - **'equality_metadata'**: the metadata gathered so far, see `pd_compare.compare()`. Its dicts are copied (not the values inside them), so they don't change with the next stages.
+    - **'report'**: the report so far.
+    - **'result'**: the returned tuple of `pd_compare.compare()` if 'done' is True, None otherwise.
+
+    Parameters
+    ----------
+    df1 : pd.DataFrame
+        First DataFrame to compare.
+    df2 : pd.DataFrame
+        Second DataFrame to compare.
+    **kwargs
+        The other parameters of `pd_compare.compare()`.
+
+    Yields
+    ------
+    dict
+        The result after every stage, see above.
+
+    Raises
+    ------
+    ValueError
+        The same as `pd_compare.compare()`, when requesting the first result.
+    """
+    compare_gen = _module_compare._compare_gen(df1, df2, **kwargs)
+    checkpoint = None
+    try:
+        while True:
+            stage_done = None if checkpoint is None else checkpoint['stage']
+            checkpoint = next(compare_gen)
+            if stage_done is not None:
+                yield {
+                    'stage': stage_done,
+                    'done': False,
+                    'equality_metadata': _metadata_snapshot(checkpoint['equality_metadata']),
+                    'report': checkpoint['str_io'].getvalue(),
+                    'result': None,
+                }
+            _module_compare._raise_if_cancelled(checkpoint)
+    except StopIteration as stop:
+        result = stop.value
+    except _module_compare._CompareCancelled as cancelled:
+        result = _module_compare._returner_for_cancelled(checkpoint, reason=str(cancelled))
+    finally:
+        # Stops the comparison if the caller stops iterating
+        compare_gen.close()
+
+    yield {
+        'stage': checkpoint['stage'],
+        'done': True,
+        'equality_metadata': result[2],
+        'report': result[2]['report'],
+        'result': result,
+    }
@@ -81,16 +81,51 @@ def compare_lists(
             'list_1_name, list_2_name, type_name and type_name_plural must be of type str.'
         )
 
+    return _compare_lists(
+        list_1=list_1,
+        list_2=list_2,
+        show_common_items=show_common_items,
+        list_1_name=list_1_name,
+        list_2_name=list_2_name,
+        type_name=type_name,
+        type_name_plural=type_name_plural,
+        report_print=report_print,
+    )
+
+
+def _list_set_and_dups(list_: list) -> tuple[set, dict]:
+    '''Return the set of the items of `list_` and a dict with the duplicated items and their count.'''
+    return set(list_), {i: q for i, q in Counter(list_).items() if q > 1}
+
+
+def _compare_lists(
+    list_1: list,
+    list_2: list,
+    show_common_items: bool,
+    list_1_name: str,
+    list_2_name: str,
+    type_name: str,
+    type_name_plural: str,
+    report_print: bool,
+    list_1_set_and_dups: None | tuple[set, dict] = None,
+) -> tuple[bool, dict]:
+    """Do the work of `compare_lists()` without validating the parameters.
+
+    `list_1_set_and_dups` is the result of `_list_set_and_dups(list_1)`, computed here if None. It
+    can be computed once when `list_1` is compared many times.
+    """
     # Computations
     # ************************************
-    list_1_set = set(list_1)
-    list_2_set = set(list_2)
+    if list_1_set_and_dups is None:
+        list_1_set, list_1_dups_dict = _list_set_and_dups(list_1)
+    else:
+        # The dict is returned, a copy keeps the given one unchanged
+        list_1_set, list_1_dups_dict = list_1_set_and_dups[0], dict(list_1_set_and_dups[1])
+    list_2_set, list_2_dups_dict = _list_set_and_dups(list_2)
     # Items that exist only in either list
     list_1_excl_set = list_1_set - list_2_set
     list_2_excl_set = list_2_set - list_1_set
     list_common_set = set(list_1_set - list_1_excl_set)
-    list_1_dups_dict = {i: q for i, q in Counter(list_1).items() if q > 1}
-    list_2_dups_dict = {i: q for i, q in Counter(list_2).items() if q > 1}
     list_1_dups_set = set(list_1_dups_dict)
     list_2_dups_set = set(list_2_dups_dict)
     list_1_dups_exclusive_set = list_1_dups_set - list_common_set
@@ -0,0 +1,186 @@
+import concurrent.futures
+import os
+import time
+import traceback
+from typing import Callable
+
+import pandas as pd
+
+from ._module_compare import compare
+
+# Functions used to load a DataFrame from a path, by file extension
+_READERS = {
+    '.parquet': pd.read_parquet,
+    '.feather': pd.read_feather,
+    '.csv': pd.read_csv,
+    '.pkl': pd.read_pickle,
+    '.pickle': pd.read_pickle,
+    '.xlsx': pd.read_excel,
+}
+
+# Columns of the summary DataFrame returned by `compare_many()`
+SUMMARY_COLUMNS = (
+    'equality_full',
+    'equality_partial',
+    'cols_diff_count',
+    'rows_diff_count',
+    'seconds',
+    'error',
+    'report',
+)
+
+
+def _is_path(source) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+def _load_df(source) -> pd.DataFrame:
+    '''Return the DataFrame of `source`: a DataFrame, a path or a function returning a DataFrame.'''
+    if isinstance(source, pd.DataFrame):
+        return source
+    if _is_path(source):
+        extension = os.path.splitext(source)[1].lower()
+        if extension not in _READERS:
+            raise ValueError(
+                f'Unknown file extension {extension!r}, use one of {", ".join(_READERS)}.'
+            )
+        return _READERS[extension](source)
+    return source()
+
+
+def _source_size(source) -> int:
+    '''Return the size of `source` in bytes (0 if it's a function) to schedule larger pairs first.'''
+    if isinstance(source, pd.DataFrame):
+        return int(source.memory_usage(index=True).sum())
+    if _is_path(source) and os.path.exists(source):
+        return os.path.getsize(source)
+    return 0
+
+
+def _compare_pair(source1, source2, return_results: bool, kwargs: dict) -> tuple[dict, object]:
+    '''Load and compare a pair, return the summary row and the result (if `return_results`).
+
+    Any exception is caught and reported in the 'error' column so other pairs are not affected.
+    '''
+    start = time.perf_counter()
+    summary_row = dict.fromkeys(SUMMARY_COLUMNS)
+    returned = None
+    try:
+        returned = compare(_load_df(source1), _load_df(source2), **kwargs)
+        variables = returned[2]['variables']
+        summary_row.update(
+            {
+                'equality_full': returned[0],
+                'equality_partial': returned[1],
+                'cols_diff_count': len(variables.get('cols_diff_list_sorted', [])),
+                'rows_diff_count': len(variables.get('rows_diff_list_sorted', [])),
+                'report': returned[2]['report'],
+            }
+        )
+    except Exception:
+        summary_row['error'] = traceback.format_exc()
+    summary_row['seconds'] = time.perf_counter() - start
+    return summary_row, returned if return_results else None
+
+
+def compare_many(
+    pairs: dict,
+    n_jobs: int = 1,
+    return_results: bool = False,
+    progress: None | Callable = None,
+    **kwargs,
+) -> tuple[pd.DataFrame, dict]:
+    """Compares many pairs of DataFrames using `pd_compare.compare()`, optionally in parallel using a process pool.
+
+    Pairs are scheduled largest first (using the file size or the DataFrames' memory usage) so the pool stays busy. To avoid sending DataFrames to the worker processes, pairs can be given as paths or functions, which are loaded inside the workers. An error in a pair (loading or comparing) doesn't stop the other pairs, it's shown in the 'error' column of the summary.
+
+    Parameters
+    ----------
+    pairs : dict
+        The pairs to compare, the keys are the names of the pairs and the values are (df1, df2) tuples. Each of df1 and df2 is either a DataFrame, a path (a file with the extension '.parquet', '.feather', '.csv', '.pkl', '.pickle' or '.xlsx') or a function without parameters returning a DataFrame (it must be picklable, e.g. a module level function or a `functools.partial` of one, if `n_jobs` is not 1).
+    n_jobs : int, optional
+        The number of processes to use, by default 1 (no processes, pairs are compared one after another). -1 uses the number of CPUs.
+    return_results : bool, optional
+        Whether to return the result of `pd_compare.compare()` for every pair, by default False. With processes, all the metadata (including the DataFrames) is sent back from the workers.
+    progress : None | Callable, optional
+        A function called as `progress('end', name, fraction)` every time a pair is done, where `fraction` is the fraction of pairs already done, by default None.
+    **kwargs
+        Parameters of `pd_compare.compare()` used for every pair. `report_print` is False unless specified.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, dict]
+        - <b>tuple[0]</b>: The summary, a row for every pair (the index, in the order of `pairs`) with the columns 'equality_full', 'equality_partial' (missing if the pair failed), 'cols_diff_count' and 'rows_diff_count' (the number of columns and rows with different values, 0 if the comparison ended before comparing values), 'seconds', 'error' (the traceback if the pair failed, None otherwise) and 'report'.
+        - <b>tuple[1]</b>: A dict with the result of `pd_compare.compare()` for every pair (None if it failed) if `return_results` is True, an empty dict otherwise.
+
+    Raises
+    ------
+    ValueError
+        'pairs must be a dict whose values are (df1, df2) tuples.'
+    ValueError
+        'n_jobs must be a positive integer or -1.'
+    ValueError
+        'return_results must be of type bool.'
+    ValueError
+        'progress must be None or a function.'
+    """
+    if not isinstance(pairs, dict) or not all(
+        isinstance(pair, tuple) and len(pair) == 2 for pair in pairs.values()
+    ):
+        raise ValueError('pairs must be a dict whose values are (df1, df2) tuples.')
+    if isinstance(n_jobs, bool) or not isinstance(n_jobs, int) or (n_jobs < 1 and n_jobs != -1):
+        raise ValueError('n_jobs must be a positive integer or -1.')
+    if not isinstance(return_results, bool):
+        raise ValueError('return_results must be of type bool.')
+    if progress is not None and not callable(progress):
+        raise ValueError('progress must be None or a function.')
+
+    kwargs.setdefault('report_print', False)
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+
+    # Largest first
+    names_by_size = sorted(
+        pairs, key=lambda name: sum(_source_size(source) for source in pairs[name]), reverse=True
+    )
+
+    summary_rows = {}
+    results = {}
+
+    def pair_done(name: str, summary_row: dict, returned) -> None:
+        summary_rows[name] = summary_row
+        if return_results:
+            results[name] = returned
+        if progress is not None:
+            progress('end', name, len(summary_rows) / len(pairs))
+
+    if n_jobs == 1:
+        for name in names_by_size:
+            pair_done(name, *_compare_pair(*pairs[name], return_results, kwargs))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = {
+                executor.submit(_compare_pair, *pairs[name], return_results, kwargs): name
+                for name in names_by_size
+            }
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    summary_row, returned = future.result()
+                except Exception:
+                    # e.g. the pair or its result can't be sent to or from the worker
+                    summary_row, returned = dict.fromkeys(SUMMARY_COLUMNS), None
+                    summary_row['error'] = traceback.format_exc()
+                pair_done(futures[future], summary_row, returned)
+
+    # Nullable dtypes since failed pairs have missing values
+    summary_df = pd.DataFrame.from_dict(
+        {name: summary_rows[name] for name in pairs}, orient='index', columns=list(SUMMARY_COLUMNS)
+    ).astype(
+        {
+            'equality_full': 'boolean',
+            'equality_partial': 'boolean',
+            'cols_diff_count': 'Int64',
+            'rows_diff_count': 'Int64',
+        }
+    )
+    return summary_df, {name: results[name] for name in pairs} if return_results else {}
@@ -0,0 +1,250 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from .. import pd_format
+from . import _module_report_formatting as f
+from ._module_compare import _print_table, _unify_categories
+from ._module_compute_equality_df import compute_equality_df
+
+# Maximum number of DataFrames in `dfs`, one bit of the mask for each
+_MAX_DFS = 64
+
+# Columns of the summary DataFrame returned by `compare_n()`
+SUMMARY_COLUMNS = (
+    'cols_missing',
+    'cols_extra',
+    'idxs_missing',
+    'idxs_extra',
+    'cols_diff',
+    'rows_diff',
+    'cells_diff',
+)
+
+# Columns of the summary comparing the columns and indexes to df1
+_COLS_IDXS_COLUMNS = SUMMARY_COLUMNS[:4]
+
+
+def _mask_dtype(num_dfs: int) -> np.dtype:
+    '''Return the smallest unsigned integer dtype with at least `num_dfs` bits.'''
+    for dtype in ('uint8', 'uint16', 'uint32'):
+        if np.iinfo(dtype).bits >= num_dfs:
+            return np.dtype(dtype)
+    return np.dtype('uint64')
+
+
+def _mask_dfs_names(mask_value: int, dfs_names: list) -> tuple:
+    '''Return the names of the DataFrames whose bit is set in `mask_value`.'''
+    return tuple(name for bit, name in enumerate(dfs_names) if (mask_value >> bit) & 1)
+
+
+def compare_n(
+    df1: pd.DataFrame,
+    dfs: dict,
+    df1_name: str = 'df1',
+    comparators: None | dict = None,
+    report_print: bool = True,
+) -> tuple[bool, dict]:
+    """Compares many DataFrames to a baseline DataFrame in one pass, with a single report.
+
+    All the DataFrames are aligned once on the columns and indexes common to all of them (sorted), then the values of every DataFrame in `dfs` are compared to df1 using `pd_compare.compute_equality_df()` (categorical columns with different categories use the union of both categories, like in `pd_compare.compare()`). The result is a mask with an unsigned integer for every cell (the smallest dtype with a bit for every DataFrame in `dfs`), where the bit `i` is set if the `i`-th DataFrame of `dfs` (in the order of the dict) differs from df1. Cells with the same mask value differ in the same DataFrames.
+
+    The report shows:
+    - The number of columns and indexes missing from or extra in every DataFrame, compared to df1.
+    - The number of different cells for every column with differences and every DataFrame.
+    - The number of different cells for every combination of DataFrames that differ, most frequent first.
+
+    Parameters
+    ----------
+    df1 : pd.DataFrame
+        The baseline DataFrame.
+    dfs : dict
+        The DataFrames to compare to df1, the keys are their names (str, different from df1_name). At most 64 DataFrames.
+    df1_name : str, optional
+        The baseline's name, by default 'df1'.
+    comparators : None | dict, optional
+        Functions used to compare specific columns instead of the usual equality, by default None. See `pd_compare.compute_equality_df()`.
+    report_print : bool, optional
+        Whether to print the report, by default True.
+
+    Returns
+    -------
+    tuple[bool, dict]
+        Explanation:
+        - <b>tuple[0]</b>: True if every DataFrame has the same columns, indexes and values as df1 (dtypes are not compared), False otherwise.
+        - <b>tuple[1]</b>: Metadata dict. This contains:
+            <ul>
+                <li><b>'cols_common_list_sorted'</b>: list. Columns common to all the DataFrames, sorted.</li>
+                <li><b>'idxs_common_list_sorted'</b>: list. Indexes common to all the DataFrames, sorted.</li>
+                <li><b>'summary_df'</b>: pd.DataFrame. A row for every DataFrame in `dfs` with the number of columns and indexes missing from it and extra in it ('cols_missing', 'cols_extra', 'idxs_missing', 'idxs_extra') and the number of columns, rows and cells with different values ('cols_diff', 'rows_diff', 'cells_diff').</li>
+                <li><b>'diff_mask_df'</b>: pd.DataFrame. The mask, with the common columns and indexes.</li>
+                <li><b>'diff_counts_df'</b>: pd.DataFrame. The number of different cells, a row for every common column and a column for every DataFrame in `dfs`.</li>
+                <li><b>'mask_values_df'</b>: pd.DataFrame. A row for every mask value of the different cells, with the columns 'mask', 'dfs' (a tuple with the names of the DataFrames that differ) and 'cells' (the number of cells), most frequent first.</li>
+                <li><b>'report'</b>: str. The generated report, this stores the report even if it wasn't shown when executing this function.</li>
+            </ul>
+
+    Raises
+    ------
+    ValueError
+        'df1 must be of type pd.DataFrame.'
+    ValueError
+        'dfs must be a non empty dict whose values are DataFrames.'
+    ValueError
+        'dfs must contain at most 64 DataFrames.'
+    ValueError
+        'df1_name and the keys of dfs must be of type str and all different.'
+    ValueError
+        'df1 and the DataFrames in dfs cannot have duplicated columns or indexes.'
+    ValueError
+        'report_print must be of type bool.'
+    """
+    # Type validation
+    # ************************************
+    if not isinstance(df1, pd.DataFrame):
+        raise ValueError('df1 must be of type pd.DataFrame.')
+    if (
+        not isinstance(dfs, dict)
+        or len(dfs) == 0
+        or not all(isinstance(df, pd.DataFrame) for df in dfs.values())
+    ):
+        raise ValueError('dfs must be a non empty dict whose values are DataFrames.')
+    if len(dfs) > _MAX_DFS:
+        raise ValueError(f'dfs must contain at most {_MAX_DFS} DataFrames.')
+    if not all(isinstance(name, str) for name in (df1_name, *dfs)) or df1_name in dfs:
+        raise ValueError('df1_name and the keys of dfs must be of type str and all different.')
+    if not all(df.columns.is_unique and df.index.is_unique for df in (df1, *dfs.values())):
+        raise ValueError('df1 and the DataFrames in dfs cannot have duplicated columns or indexes.')
+    if not isinstance(report_print, bool):
+        raise ValueError('report_print must be of type bool.')
+
+    # Computations
+    # ************************************
+    dfs_names = list(dfs)
+
+    # Alignment, done once for all the DataFrames
+    cols_common = df1.columns
+    idxs_common = df1.index
+    for df in dfs.values():
+        cols_common = cols_common.intersection(df.columns, sort=False)
+        idxs_common = idxs_common.intersection(df.index, sort=False)
+    cols_common_list_sorted = pd_format.obj_as_sorted_list(list(cols_common))
+    idxs_common_list_sorted = pd_format.obj_as_sorted_list(list(idxs_common))
+    df1_common = df1.loc[idxs_common_list_sorted, cols_common_list_sorted]
+
+    summary = {}
+    diff_mask = np.zeros(df1_common.shape, dtype=_mask_dtype(len(dfs)))
+    diff_counts = np.zeros((len(cols_common_list_sorted), len(dfs)), dtype='int64')
+    for bit, (name, df) in enumerate(dfs.items()):
+        df_common = df.loc[idxs_common_list_sorted, cols_common_list_sorted]
+        _, df1_unified, df_common = _unify_categories(df1_common, df_common)
+        diff_arr = ~compute_equality_df(df1_unified, df_common, comparators=comparators).to_numpy(
+            dtype=bool
+        )
+        np.bitwise_or(diff_mask, diff_mask.dtype.type(1 << bit), out=diff_mask, where=diff_arr)
+        diff_counts[:, bit] = np.count_nonzero(diff_arr, axis=0)
+        summary[name] = {
+            'cols_missing': len(df1.columns.difference(df.columns, sort=False)),
+            'cols_extra': len(df.columns.difference(df1.columns, sort=False)),
+            'idxs_missing': len(df1.index.difference(df.index, sort=False)),
+            'idxs_extra': len(df.index.difference(df1.index, sort=False)),
+            'cols_diff': int(np.count_nonzero(diff_counts[:, bit])),
+            'rows_diff': int(np.count_nonzero(diff_arr.any(axis=1))),
+            'cells_diff': int(diff_counts[:, bit].sum()),
+        }
+
+    summary_df = pd.DataFrame.from_dict(summary, orient='index', columns=list(SUMMARY_COLUMNS))
+    diff_mask_df = pd.DataFrame(diff_mask, index=df1_common.index, columns=df1_common.columns)
+    diff_counts_df = pd.DataFrame(diff_counts, index=df1_common.columns, columns=dfs_names)
+
+    # Cells with the same mask value differ in the same DataFrames
+    mask_values, mask_cells = np.unique(diff_mask[diff_mask != 0], return_counts=True)
+    order = np.argsort(-mask_cells, kind='stable')
+    mask_values_df = pd.DataFrame(
+        {
+            'mask': mask_values[order],
+            'dfs': [_mask_dfs_names(int(value), dfs_names) for value in mask_values[order]],
+            'cells': mask_cells[order],
+        }
+    )
+
+    cols_and_idxs_equal = (summary_df[list(_COLS_IDXS_COLUMNS)] == 0).all(axis=None)
+    values_equal = len(mask_values_df.index) == 0
+
+    # Report
+    # ************************************
+    stream = io.StringIO()
+    f.print_title(
+        1,
+        'Comparing columns and indexes',
+        f'of {len(dfs)} DataFrames to [{df1_name}]',
+        file=stream,
+    )
+    if cols_and_idxs_equal:
+        f.print_event(1, f'✅ Columns and indexes are equal to those of [{df1_name}]', file=stream)
+    else:
+        f.print_event(
+            1, f'😓 Columns and indexes not equal to those of [{df1_name}] (count):', file=stream
+        )
+        _print_table(
+            [['DataFrame', *_COLS_IDXS_COLUMNS]]
+            + [
+                [name, *(str(count) for count in counts)]
+                for name, counts in zip(
+                    dfs_names, summary_df[list(_COLS_IDXS_COLUMNS)].itertuples(index=False)
+                )
+            ],
+            stream,
+        )
+        f.print_event(
+            1,
+            f'😈 From this point on, comparing only the columns (count={len(cols_common_list_sorted)}) and indexes (count={len(idxs_common_list_sorted)}) common to all DataFrames',
+            file=stream,
+        )
+
+    f.print_title(1, 'Comparing values', f'to [{df1_name}]', file=stream)
+    if values_equal:
+        f.print_event(1, '✅ All values are equal', file=stream)
+    else:
+        cols_diff = np.flatnonzero(diff_counts.any(axis=1))
+        f.print_event(1, f'😓 Different cells by column (count={len(cols_diff)}):', file=stream)
+        _print_table(
+            [['column', *dfs_names]]
+            + [
+                [str(cols_common_list_sorted[pos]), *(str(count) for count in diff_counts[pos])]
+                for pos in cols_diff
+            ]
+            + [['(total)', *(str(count) for count in summary_df['cells_diff'])]],
+            stream,
+        )
+        f.print_event(
+            1,
+            f'😓 Different cells by DataFrames that differ (count={len(mask_values_df.index)}):',
+            file=stream,
+        )
+        _print_table(
+            [['DataFrames', 'cells']]
+            + [
+                [', '.join(names), str(cells)]
+                for names, cells in zip(mask_values_df['dfs'], mask_values_df['cells'])
+            ],
+            stream,
+        )
+
+    equality = bool(cols_and_idxs_equal and values_equal)
+    f.print_result('🥳 Equal' if equality else '😡 Not equal', file=stream)
+
+    if report_print is True:
+        print(stream.getvalue(), end='')
+
+    # Return
+    # ************************************
+    return equality, {
+        'cols_common_list_sorted': cols_common_list_sorted,
+        'idxs_common_list_sorted': idxs_common_list_sorted,
+        'summary_df': summary_df,
+        'diff_mask_df': diff_mask_df,
+        'diff_counts_df': diff_counts_df,
+        'mask_values_df': mask_values_df,
+        'report': stream.getvalue(),
+    }
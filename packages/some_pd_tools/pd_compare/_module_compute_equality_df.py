@@ -1,11 +1,21 @@
+from typing import Callable
+
+import numpy as np
 import pandas as pd
 
 
-def compute_equality_df(df1: pd.DataFrame, df2: pd.DataFrame) -> pd.DataFrame:
+def compute_equality_df(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    comparators: None | dict = None,
+    progress: None | Callable = None,
+) -> pd.DataFrame:
     """Compares the cell values of two DataFrames.
 
     Returns a DataFrame with the same columns and indexes, cells are boolean, either True or False. See Returns.
 
+    Missing values (NaN, NaT, None or pd.NA) are considered equal to each other, this also works for nullable and Arrow dtypes.
+
     This doesn't compute the DataFrames as a whole, only on a cell basis, which means that different dtypes don't matter. To compare DataFrames as a whole do `df1.equals(df2)` or use `pd_compare.compare()` for a thorough report.
 
     Parameters
@@ -14,6 +24,10 @@ def compute_equality_df(df1: pd.DataFrame, df2: pd.DataFrame) -> pd.DataFrame:
         First DataFrame to compare.
     df2 : pd.DataFrame
         Second DataFrame to compare.
+    comparators : None | dict, optional
+        Functions used to compare specific columns instead of the usual equality, by default None. The keys are either a column name or a dtype (e.g. 'float64', 'datetime64[ns, UTC]' or `pd.StringDtype()`) and the values are functions receiving the column from df1 and df2 as `pd.Series` and returning a boolean `np.ndarray`, True where the values are equal. A key that is a column name is only used for that column and has precedence over a dtype key, a dtype key is matched against the column's dtype in df1 and then in df2. Two missing values are always considered equal, the function must return False when only one of the values is missing. See the built-in comparators: `datetime_comparator()`, `float_tolerance_comparator()`, `decimal_comparator()` and `normalized_str_comparator()`.
+    progress : None | Callable, optional
+        A function called with the fraction (between 0 and 1) of columns already compared, by default None. It's called after every group of columns with the same dtype and after every other column.
 
     Returns
     -------
@@ -28,6 +42,10 @@ def compute_equality_df(df1: pd.DataFrame, df2: pd.DataFrame) -> pd.DataFrame:
         'df1 and df2 must have equal columns and equal indexes. Select only the same columns and same indexes and run the function again.'
     ValueError
         'df1 and df2 cannot have duplicated columns or indexes. Select not duplicated columns and not duplicated indexes and run the function again.'
+    ValueError
+        'comparators must be None or a dict whose values are functions.'
+    ValueError
+        'progress must be None or a function.'
     """
     if not isinstance(df1, pd.DataFrame) or not isinstance(df2, pd.DataFrame):
         raise ValueError('df1 and df2 must be of type pd.DataFrame.')
@@ -36,29 +54,237 @@ def compute_equality_df(df1: pd.DataFrame, df2: pd.DataFrame) -> pd.DataFrame:
             'df1 and df2 must have equal columns and equal indexes. Select only the same columns and same indexes and run the function again.'
         )
     if (
-        len(df1.columns) != len(set(df1.columns))
-        or len(df2.columns) != len(set(df2.columns))
-        or len(df1.index) != len(set(df1.index))
-        or len(df2.index) != len(set(df2.index))
+        not df1.columns.is_unique
+        or not df2.columns.is_unique
+        or not df1.index.is_unique
+        or not df2.index.is_unique
     ):
         raise ValueError(
             'df1 and df2 cannot have duplicated columns or indexes. Select not duplicated columns and not duplicated indexes and run the function again.'
         )
+    if comparators is not None and (
+        not isinstance(comparators, dict)
+        or not all(callable(comparator) for comparator in comparators.values())
+    ):
+        raise ValueError('comparators must be None or a dict whose values are functions.')
+    if progress is not None and not callable(progress):
+        raise ValueError('progress must be None or a function.')
+    if progress is None:
+        progress = _no_progress
+
+    # Columns using a comparator are compared column by column
+    cols_comparators = {}
+    if comparators:
+        # Keys that are column names are not used as dtypes (e.g. a column named 'd', which is
+        # also the numpy code for 'float64')
+        dtypes_comparators = {
+            key: comparator for key, comparator in comparators.items() if key not in df1.columns
+        }
+        for col_pos, (col, dtype1, dtype2) in enumerate(zip(df1.columns, df1.dtypes, df2.dtypes)):
+            comparator = comparators.get(col)
+            if comparator is None:
+                comparator = _find_dtype_comparator(dtypes_comparators, dtype1, dtype2)
+            if comparator is not None:
+                cols_comparators[col_pos] = comparator
+
+    # Columns with the same numpy dtype on both sides are compared in groups as 2D arrays,
+    # the rest column by column
+    blocks_cols_pos, other_cols_pos = _group_columns_by_dtype(df1, df2, cols_comparators)
+
+    if len(blocks_cols_pos) == 1 and len(blocks_cols_pos[0]) == len(df1.columns):
+        # A single dtype, usually a single block inside each DataFrame: no copy needed and the
+        # output follows the values' memory layout so the ufuncs run over contiguous memory
+        values1 = df1.to_numpy(copy=False)
+        values2 = df2.to_numpy(copy=False)
+        equality_arr = np.empty(
+            values1.shape, dtype=bool, order='F' if values1.flags.f_contiguous else 'C'
+        )
+        _block_equality(values1, values2, out=equality_arr)
+        progress(1.0)
+        return pd.DataFrame(equality_arr, index=df1.index, columns=df1.columns, copy=False)
+
+    # A single boolean output is allocated, in Fortran order so every column is contiguous and
+    # each kernel writes directly into it
+    equality_arr = np.empty((len(df1.index), len(df1.columns)), dtype=bool, order='F')
+    cols_done = 0
+    for cols_pos in blocks_cols_pos:
+        values1 = df1.iloc[:, cols_pos].to_numpy(copy=False)
+        values2 = df2.iloc[:, cols_pos].to_numpy(copy=False)
+        if cols_pos == list(range(cols_pos[0], cols_pos[-1] + 1)):
+            _block_equality(values1, values2, out=equality_arr[:, cols_pos[0] : cols_pos[-1] + 1])
+        else:
+            equality_arr[:, cols_pos] = _block_equality(
+                values1, values2, out=np.empty(values1.shape, dtype=bool)
+            )
+        cols_done += len(cols_pos)
+        progress(cols_done / len(df1.columns))
+    for col_pos in other_cols_pos:
+        _column_equality(
+            df1.iloc[:, col_pos].array,
+            df2.iloc[:, col_pos].array,
+            out=equality_arr[:, col_pos],
+        )
+        cols_done += 1
+        progress(cols_done / len(df1.columns))
+    for col_pos, comparator in cols_comparators.items():
+        _comparator_equality(
+            comparator,
+            df1.iloc[:, col_pos],
+            df2.iloc[:, col_pos],
+            out=equality_arr[:, col_pos],
+        )
+        cols_done += 1
+        progress(cols_done / len(df1.columns))
+
+    return pd.DataFrame(equality_arr, index=df1.index, columns=df1.columns, copy=False)
+
+
+def _no_progress(fraction: float) -> None:
+    """Used when no `progress` function is given."""
+
+
+def _find_dtype_comparator(dtypes_comparators: dict, dtype1, dtype2) -> None | Callable:
+    """Return the comparator for a column's dtype in df1 or df2, None if not found."""
+    for dtype in (dtype1, dtype2):
+        for key, comparator in dtypes_comparators.items():
+            try:
+                if dtype == key:
+                    return comparator
+            except TypeError:
+                # Keys that can't be compared to a dtype
+                continue
+    return None
+
+
+def _comparator_equality(
+    comparator: Callable, values1: pd.Series, values2: pd.Series, out: np.ndarray
+) -> np.ndarray:
+    """Write to `out` whether the values of two columns are equal according to `comparator`."""
+    out[:] = np.asarray(comparator(values1, values2), dtype=bool)
+    # If the values in both columns are missing, the values are equal
+    out |= np.asarray(values1.isna(), dtype=bool) & np.asarray(values2.isna(), dtype=bool)
+    return out
+
+
+def _group_columns_by_dtype(
+    df1: pd.DataFrame, df2: pd.DataFrame, cols_comparators: dict
+) -> tuple[list, list]:
+    """Group the columns' positions that can be compared as 2D arrays.
+
+    Returns a tuple with a list of groups (lists of positions) of columns having the same numpy
+    numeric, boolean or datetime dtype in both DataFrames, and a list of the other positions.
+    Columns in `cols_comparators` are not included.
+    """
+    blocks_cols_pos = {}
+    other_cols_pos = []
+    for col_pos, (dtype1, dtype2) in enumerate(zip(df1.dtypes, df2.dtypes)):
+        if col_pos in cols_comparators:
+            continue
+        if isinstance(dtype1, np.dtype) and dtype1 == dtype2 and dtype1.kind in 'biufcmM':
+            blocks_cols_pos.setdefault(dtype1, []).append(col_pos)
+        else:
+            other_cols_pos.append(col_pos)
+    return list(blocks_cols_pos.values()), other_cols_pos
+
+
+def _block_equality(values1: np.ndarray, values2: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Write to `out` whether the values of two 2D arrays with the same numpy dtype are equal.
+
+    Two NaN or two NaT values are considered equal, other dtypes can't contain missing values.
+    """
+    np.equal(values1, values2, out=out)
+    if values1.dtype.kind in 'fcmM':
+        # Missing values are only looked for in the (usually few) not equal cells, using 1D views
+        # when the three arrays share the same memory layout since 1D positions are faster to find
+        for order in ('C', 'F'):
+            arrs = (out, values1, values2)
+            if all(arr.flags[f'{order}_CONTIGUOUS'] for arr in arrs):
+                out_view, values1, values2 = (arr.reshape(-1, order=order) for arr in arrs)
+                not_equal_pos = np.flatnonzero(~out_view)
+                break
+        else:
+            out_view = out
+            not_equal_pos = np.nonzero(~out_view)
+        isna = np.isnat if values1.dtype.kind in 'mM' else np.isnan
+        out_view[not_equal_pos] = isna(values1[not_equal_pos]) & isna(values2[not_equal_pos])
+    return out
+
+
+def _column_equality(arr1, arr2, out: np.ndarray) -> np.ndarray:
+    """Write to `out` whether the values of two arrays (a column of df1 and df2) are equal.
+
+    Two missing values (NaN, NaT, None or pd.NA) are considered equal. Missing values are found
+    using `pd.isna()` instead of the `x != x` trick which doesn't work for pd.NA (used by nullable
+    and Arrow dtypes) since `pd.NA != pd.NA` is pd.NA.
+    """
+    if isinstance(arr1, pd.Categorical) and isinstance(arr2, pd.Categorical):
+        # Compared on the codes, without decoding the values
+        out[:] = arr1.codes == _recode_categorical(arr2, arr1.categories)
+        return out
+
+    isna1 = np.asarray(pd.isna(arr1), dtype=bool)
+    isna2 = np.asarray(pd.isna(arr2), dtype=bool)
+
+    # The usual predictable equality BUT this outputs False (or pd.NA for nullable dtypes) when
+    # two missing values are compared, (nan == nan) is False
+    try:
+        equality = arr1 == arr2
+    except (TypeError, ValueError, NotImplementedError):
+        # Some dtypes can't be compared directly (e.g. a nullable or Arrow array with an object array
+        # containing pd.NA, categoricals with different categories or objects whose equality isn't
+        # a boolean like numpy arrays), compare non missing values as objects
+        out[:] = False
+        not_na = ~(isna1 | isna2)
+        out[not_na] = _objects_equality(
+            np.asarray(arr1, dtype=object)[not_na], np.asarray(arr2, dtype=object)[not_na]
+        )
+    else:
+        if isinstance(equality, np.ndarray):
+            out[:] = equality
+        else:
+            # Nullable boolean result, pd.NA means at least one value is missing
+            out[:] = equality.to_numpy(dtype=bool, na_value=False)
+
+    # If the values in both arrays are missing, the values are equal
+    out |= isna1 & isna2
+    return out
+
+
+def _recode_categorical(categorical: pd.Categorical, categories: pd.Index) -> np.ndarray:
+    """Return the codes of `categorical` as positions in `categories`.
+
+    Missing values keep the code -1, values not in `categories` get the code -2 so they are
+    different from every code of a categorical using `categories`.
+    """
+    if categorical.categories.equals(categories):
+        return categorical.codes
+    codes_map = categories.get_indexer(categorical.categories)
+    codes_map[codes_map == -1] = -2
+    # The code -1 (missing value) takes the last element
+    return np.append(codes_map, -1)[categorical.codes]
+
+
+def _objects_equality(values1: np.ndarray, values2: np.ndarray) -> np.ndarray:
+    """Return whether the values of two object arrays without missing values are equal.
+
+    Both arrays are factorized together so equal values get the same integer code and the codes
+    are compared. If there are unhashable values, each pair of values is compared.
+    """
+    try:
+        codes, _ = pd.factorize(np.concatenate((values1, values2)))
+    except TypeError:
+        # Unhashable values (e.g. lists, dicts or numpy arrays)
+        return np.fromiter(
+            (_values_equal(value1, value2) for value1, value2 in zip(values1, values2)),
+            dtype=bool,
+            count=len(values1),
+        )
+    return codes[: len(values1)] == codes[len(values1) :]
+
 
-    # The usual predictable equality BUT this outputs False when two 'nan' values are compared
-    # (nan == nan) is False
-    # So by itself, this equality is not enough,
-    # we want a cell with a `True` value if a cell in both DataFrames is nan, check next part
-    equality_df_normal = df1 == df2
-
-    # There's a workaround to check if values in both DataFrames are 'nan':
-    # (1) Compare each DataFrame to itself, if the result in a cell is different
-    #   that means the cell's value is 'nan'
-    # (2) If this happens in both DataFrame,
-    #   that means both cells are 'nan' and their values are equal
-    #
-    #  see: # https://stackoverflow.com/a/19322739/1071459
-    equality_df_true_where_nan = (df1 != df1) & (df2 != df2)
-
-    # If either equality is True, we consider a cell's value to be True
-    return equality_df_normal | equality_df_true_where_nan
+def _values_equal(value1, value2) -> bool:
+    """Return whether two values are equal, also for values whose equality is an array."""
+    try:
+        return bool(value1 == value2)
+    except (TypeError, ValueError):
+        return bool(np.array_equal(value1, value2))
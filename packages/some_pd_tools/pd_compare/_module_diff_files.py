@@ -0,0 +1,124 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Number of rows written at a time to the diff files
+_DIFF_BATCH_ROWS = 100_000
+
+# File extension for each `diff_format`
+DIFF_FORMATS_EXTENSIONS = {
+    'parquet': 'parquet',
+    'arrow': 'arrow',
+    'csv': 'csv',
+}
+
+# Files created, the name (without extension) is also the key used in the returned dict
+DIFF_FILES_NAMES = ('equality_df', 'diff_cells', 'joined_df')
+
+
+def diff_files_paths(diff_path: str, diff_format: str) -> dict:
+    '''Return the path of every file created by `save_diff_files()`.'''
+    extension = DIFF_FORMATS_EXTENSIONS[diff_format]
+    return {
+        name: os.path.realpath(os.path.join(diff_path, f'{name}.{extension}'))
+        for name in DIFF_FILES_NAMES
+    }
+
+
+def _diff_cells_df(equality_df: pd.DataFrame) -> pd.DataFrame:
+    '''Return a DataFrame with a row for every different cell (its index and its column).'''
+    rows_pos, cols_pos = np.nonzero(~equality_df.to_numpy(dtype=bool))
+    return pd.DataFrame(
+        {
+            'index': equality_df.index[rows_pos],
+            'column': equality_df.columns[cols_pos],
+        }
+    )
+
+
+def _flatten_joined_df(joined_df: pd.DataFrame) -> pd.DataFrame:
+    '''Return `joined_df` with one level of columns, named like "{column} ({df_name})".'''
+    joined_flat_df = joined_df.copy(deep=False)
+    joined_flat_df.columns = [f'{col} ({sub_col})' for col, sub_col in joined_df.columns]
+    return joined_flat_df
+
+
+def _batch_for_arrow(batch_df: pd.DataFrame) -> pd.DataFrame:
+    '''Prepare a batch to be written with pyarrow.
+
+    Columns' names are transformed to str and 'object' columns are transformed to 'string' since
+    Arrow columns can't contain mixed types.
+    '''
+    batch_df = batch_df.copy(deep=False)
+    batch_df.columns = [str(col) for col in batch_df.columns]
+    for col in batch_df.columns:
+        if pd.api.types.is_object_dtype(batch_df[col]):
+            batch_df[col] = batch_df[col].astype('string')
+    return batch_df
+
+
+def _write_batched(df: pd.DataFrame, path: str, diff_format: str, index: bool = True) -> None:
+    '''Write `df` to `path` in batches of `_DIFF_BATCH_ROWS` rows, the index is written if `index`.'''
+    batches = (
+        df.iloc[first_row : first_row + _DIFF_BATCH_ROWS]
+        for first_row in range(0, max(len(df.index), 1), _DIFF_BATCH_ROWS)
+    )
+
+    if diff_format == 'csv':
+        for batch_num, batch_df in enumerate(batches):
+            batch_df.to_csv(
+                path,
+                mode='w' if batch_num == 0 else 'a',
+                header=batch_num == 0,
+                index=index,
+            )
+        return
+
+    # Imported here since pyarrow is an optional dependency
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    writer = None
+    # The schema of the first batch is used for every batch (the Arrow IPC writer doesn't expose it)
+    schema = None
+    try:
+        for batch_df in batches:
+            table = pa.Table.from_pandas(
+                _batch_for_arrow(batch_df), preserve_index=index, schema=schema
+            )
+            if writer is None:
+                schema = table.schema
+                if diff_format == 'parquet':
+                    writer = pyarrow.parquet.ParquetWriter(path, table.schema)
+                else:
+                    writer = pyarrow.ipc.new_file(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def save_diff_files(
+    equality_df: pd.DataFrame,
+    joined_df: pd.DataFrame,
+    diff_path: str,
+    diff_format: str,
+) -> dict:
+    '''Save the comparison result to columnar files, a fast alternative to the Excel file.
+
+    The following files are created inside the `diff_path` directory:
+    - **equality_df**: the equality mask, a boolean column for every compared column (Parquet and
+      Arrow store booleans bit-packed).
+    - **diff_cells**: a sparse list of the different cells, their 'index' and 'column'.
+    - **joined_df**: `joined_df` with one level of columns, named like "{column} ({df_name})".
+
+    Returns a dict with the created files' paths.
+    '''
+    paths = diff_files_paths(diff_path, diff_format)
+    os.makedirs(diff_path, exist_ok=True)
+    _write_batched(equality_df, paths['equality_df'], diff_format)
+    _write_batched(_diff_cells_df(equality_df), paths['diff_cells'], diff_format, index=False)
+    _write_batched(_flatten_joined_df(joined_df), paths['joined_df'], diff_format)
+    return paths
@@ -0,0 +1,97 @@
+import time
+import tracemalloc
+from typing import Callable
+
+import pandas as pd
+
+# Columns of the DataFrame returned by `StageProfiler.profile_df()`
+PROFILE_COLUMNS = ('wall_time', 'cpu_time', 'mem_peak', 'mem_net', 'df1_shape', 'df2_shape')
+
+
+class StageProfiler:
+    """Record wall and CPU time, memory allocation and frame shapes of consecutive stages, and
+    report the stages to a progress callback.
+
+    Memory is measured with `tracemalloc`, which is started if it is not already tracing (and
+    stopped by `stop()` in that case). For every stage:
+    - **wall_time** and **cpu_time**: seconds spent in the stage.
+    - **mem_peak**: the peak of memory allocated during the stage (bytes, relative to the memory
+      allocated when the stage started).
+    - **mem_net**: the memory allocated during the stage and not released (bytes, can be
+      negative).
+    - **df1_shape** and **df2_shape**: the shapes of the DataFrames given when the stage started.
+
+    If `enabled` is False, nothing is recorded, so it can be used unconditionally.
+
+    If `progress` is not None, it's called as `progress(event, stage, fraction)` where `event` is
+    'start' (fraction 0.0), 'progress' (see `advance()`) or 'end' (fraction 1.0).
+    """
+
+    def __init__(self, enabled: bool, progress: None | Callable = None):
+        self.enabled = enabled
+        self.progress = progress
+        self.stages = {}
+        self._current = None
+        self._started_tracemalloc = False
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stage(self, name: str, df1: pd.DataFrame = None, df2: pd.DataFrame = None) -> None:
+        '''End the current stage (if any) and start the stage `name`.'''
+        self.end()
+        if self.progress is not None:
+            self.progress('start', name, 0.0)
+        if not self.enabled:
+            self._current = {'name': name}
+            return
+        tracemalloc.reset_peak()
+        self._current = {
+            'name': name,
+            'wall_start': time.perf_counter(),
+            'cpu_start': time.process_time(),
+            'mem_start': tracemalloc.get_traced_memory()[0],
+            'df1_shape': None if df1 is None else df1.shape,
+            'df2_shape': None if df2 is None else df2.shape,
+        }
+
+    def end(self) -> None:
+        '''End the current stage (if any).'''
+        if self._current is None:
+            return
+        current = self._current
+        self._current = None
+        if self.enabled:
+            self._record(current)
+        if self.progress is not None:
+            self.progress('end', current['name'], 1.0)
+
+    def advance(self, fraction: float) -> None:
+        '''Report the `fraction` (between 0 and 1) of the current stage that is done.'''
+        if self.progress is not None and self._current is not None:
+            self.progress('progress', self._current['name'], fraction)
+
+    def _record(self, current: dict) -> None:
+        '''Record the measures of the stage `current`, which just ended.'''
+        wall_end = time.perf_counter()
+        cpu_end = time.process_time()
+        mem_current, mem_peak = tracemalloc.get_traced_memory()
+        self.stages[current['name']] = {
+            'wall_time': wall_end - current['wall_start'],
+            'cpu_time': cpu_end - current['cpu_start'],
+            'mem_peak': max(mem_peak - current['mem_start'], 0),
+            'mem_net': mem_current - current['mem_start'],
+            'df1_shape': current['df1_shape'],
+            'df2_shape': current['df2_shape'],
+        }
+
+    def stop(self) -> None:
+        '''End the current stage (if any) and stop `tracemalloc` if it was started here.'''
+        self.end()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def profile_df(self) -> pd.DataFrame:
+        '''Return the recorded stages, a row for every stage (the index) in the order they ran.'''
+        return pd.DataFrame.from_dict(self.stages, orient='index', columns=list(PROFILE_COLUMNS))
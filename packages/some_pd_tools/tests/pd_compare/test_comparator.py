@@ -0,0 +1,125 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from some_pd_tools import pd_compare
+
+from ..basedf import BaseDF
+
+
+def _assert_same_result(returned: tuple, expected: tuple) -> None:
+    assert returned[0] is expected[0]
+    assert returned[1] is expected[1]
+    assert returned[2]['report'] == expected[2]['report']
+    variables = returned[2]['variables']
+    expected_variables = expected[2]['variables']
+    assert variables.keys() == expected_variables.keys()
+    for key, value in expected_variables.items():
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            pd.testing.assert_frame_equal(pd.DataFrame(variables[key]), pd.DataFrame(value))
+        else:
+            assert variables[key] == value, key
+
+
+def test_wrong_params():
+    bdf = BaseDF()
+
+    with pytest.raises(ValueError, match=re.escape('baseline must be of type pd.DataFrame.')):
+        pd_compare.Comparator([1, 2])
+    with pytest.raises(ValueError, match=re.escape('df1_name must be of type str.')):
+        pd_compare.Comparator(bdf.df1, df1_name=1)
+    # Other parameters are validated when comparing, like in compare()
+    comparator = pd_compare.Comparator(bdf.df1, diff_stats=1)
+    with pytest.raises(ValueError, match=re.escape('diff_stats must be of type bool.')):
+        comparator.compare(bdf.df2)
+
+
+def test_same_result_as_compare():
+    bdf = BaseDF()
+    df_dup_idxs = bdf.df2_diff_values
+    df_dup_idxs.index = [0, 0, 1, 2]
+    df_dup_cols = pd.concat([bdf.df2_diff_values, bdf.df2_diff_values[['col_int']]], axis=1)
+    df_str_idxs = bdf.df2_diff_values
+    df_str_idxs.index = ['a', 'b', 'c', 'd']
+    candidates = {
+        'equal': bdf.df2,
+        'diff_values': bdf.df2_diff_values,
+        'extra_col': bdf.df2_extra_col,
+        'index_plus1': bdf.df2_index_plus1,
+        'as_object': bdf.df2_as_object_diff_values,
+        'dup_idxs': df_dup_idxs,
+        'dup_cols': df_dup_cols,
+        'str_idxs': df_str_idxs,
+        'reversed_rows': bdf.df2.iloc[::-1],
+    }
+    comparator = pd_compare.Comparator(
+        bdf.df1, df1_name=bdf.df1_name, report_print=False, diff_stats=True
+    )
+    # Twice, the second time uses what was cached the first time
+    for _ in range(2):
+        for name, df2 in candidates.items():
+            expected = pd_compare.compare(
+                bdf.df1,
+                df2,
+                df1_name=bdf.df1_name,
+                df2_name=name,
+                report_print=False,
+                diff_stats=True,
+            )
+            _assert_same_result(comparator.compare(df2, df2_name=name), expected)
+
+    # The baseline is not modified
+    pd.testing.assert_frame_equal(comparator.baseline, bdf.df1)
+
+
+@pytest.mark.parametrize(
+    'kwargs',
+    [
+        {'renamed_cols': 'compare', 'renamed_cols_min_similarity': 0.5},
+        {'match_rows': True},
+        {'on': 'col_str'},
+        {'round_to': 2, 'top_k': 2},
+    ],
+)
+def test_same_result_as_compare_with_params(kwargs):
+    bdf = BaseDF()
+    df2_renamed = bdf.df2_diff_values.rename(columns={'col_float': 'col_float_renamed'})
+    df2_renamed.loc[3, 'col_int'] = 1
+    df2_moved = bdf.df2.iloc[::-1].reset_index(drop=True)
+    df2_moved.loc[0, 'col_int'] = 1
+    candidates = [bdf.df2_diff_values, df2_renamed, df2_moved, bdf.df2_index_plus1]
+
+    comparator = pd_compare.Comparator(bdf.df1, report_print=False)
+    for _ in range(2):
+        for df2 in candidates:
+            expected = pd_compare.compare(bdf.df1, df2, report_print=False, **kwargs)
+            _assert_same_result(comparator.compare(df2, **kwargs), expected)
+
+
+def test_kwargs_overridden():
+    bdf = BaseDF()
+    comparator = pd_compare.Comparator(bdf.df1, report_print=False, diff_stats=True)
+
+    _, _, metadata = comparator.compare(bdf.df2_diff_values)
+    assert 'diff_stats_df' in metadata['variables']
+    _, _, metadata = comparator.compare(bdf.df2_diff_values, diff_stats=False)
+    assert 'diff_stats_df' not in metadata['variables']
+    assert metadata['params']['df1'] is comparator.baseline
+
+
+def test_baseline_cols_hashes_reused():
+    df1 = pd.DataFrame({'col_1': np.arange(10), 'col_2': np.arange(10) * 2.5})
+    df2 = df1.rename(columns={'col_2': 'col_3'})
+    df2.loc[3, 'col_1'] = -1
+    comparator = pd_compare.Comparator(df1, report_print=False, renamed_cols='compare')
+
+    for _ in range(2):
+        _, _, metadata = comparator.compare(df2)
+        assert list(metadata['variables']['cols_renamed_df'].itertuples(index=False)) == [
+            ('col_2', 'col_3', 1.0)
+        ]
+        assert metadata['variables']['rows_diff_list_sorted'] == [3]
+    # Only the exclusive column was hashed
+    assert list(comparator._baseline['cols_hashes']) == ['col_2']
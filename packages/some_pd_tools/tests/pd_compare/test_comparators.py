@@ -0,0 +1,86 @@
+import decimal
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from some_pd_tools import pd_compare
+
+
+def test_wrong_values():
+    with pytest.raises(ValueError, match=re.escape('rtol and atol must be non negative numbers.')):
+        pd_compare.float_tolerance_comparator(rtol=-1)
+    with pytest.raises(ValueError, match=re.escape('rtol and atol must be non negative numbers.')):
+        pd_compare.float_tolerance_comparator(atol='a')
+    with pytest.raises(ValueError, match=re.escape('places must be a positive integer.')):
+        pd_compare.decimal_comparator(places=1.5)
+    with pytest.raises(
+        ValueError, match=re.escape('strip, casefold and collapse_spaces must be of type bool.')
+    ):
+        pd_compare.normalized_str_comparator(strip=1)
+    with pytest.raises(
+        ValueError,
+        match=re.escape("unicode_form must be None or one of 'NFC', 'NFKC', 'NFD' or 'NFKD'."),
+    ):
+        pd_compare.normalized_str_comparator(unicode_form='NF')
+
+
+def test_datetime_comparator():
+    comparator = pd_compare.datetime_comparator()
+
+    # Timezones, the same instant in different timezones is equal
+    # ************************************
+    values1 = pd.Series(pd.to_datetime(['2020-01-01 00:00', '2020-01-01 01:00', None]))
+    values1 = values1.dt.tz_localize('UTC')
+    values2 = pd.Series(pd.to_datetime(['2020-01-01 01:00', '2020-01-01 01:00', None]))
+    values2 = values2.dt.tz_localize('Europe/Paris')
+    assert comparator(values1, values2).tolist() == [True, False, True]
+
+    # Units
+    # ************************************
+    values1 = pd.Series(pd.to_datetime(['2020-01-01', '2020-01-02']).as_unit('us'))
+    values2 = pd.Series(pd.to_datetime(['2020-01-01', '2020-01-03']))
+    assert comparator(values1, values2).tolist() == [True, False]
+
+    # Timedelta
+    # ************************************
+    values1 = pd.Series(pd.to_timedelta(['1D', '2h', None]))
+    values2 = pd.Series(pd.to_timedelta(['24h', '3h', None]))
+    assert comparator(values1, values2).tolist() == [True, False, True]
+
+
+def test_float_tolerance_comparator():
+    values1 = pd.Series([1.0, 2.0, np.nan, 100.0])
+    values2 = pd.Series([1.000001, 2.1, np.nan, np.nan])
+    comparator = pd_compare.float_tolerance_comparator()
+    assert comparator(values1, values2).tolist() == [True, False, False, False]
+    comparator = pd_compare.float_tolerance_comparator(rtol=0, atol=0.2)
+    assert comparator(values1, values2).tolist() == [True, True, False, False]
+
+    # Nullable dtypes
+    # ************************************
+    values1 = pd.Series(pd.array([1, 2, None], dtype='Int64'))
+    values2 = pd.Series(pd.array([1.0000001, None, None], dtype='Float64'))
+    comparator = pd_compare.float_tolerance_comparator()
+    assert comparator(values1, values2).tolist() == [True, False, False]
+
+
+def test_decimal_comparator():
+    values1 = pd.Series([decimal.Decimal('1.005'), decimal.Decimal('2.5'), None, 3])
+    values2 = pd.Series([decimal.Decimal('1.00'), 2.5, None, decimal.Decimal('3.011')])
+    comparator = pd_compare.decimal_comparator(places=2)
+    assert comparator(values1, values2).tolist() == [True, True, True, False]
+    comparator = pd_compare.decimal_comparator(places=1)
+    assert comparator(values1, values2).tolist() == [True, True, True, True]
+
+
+def test_normalized_str_comparator():
+    values1 = pd.Series(['Hello  World', ' x', 'café', 'a', None])
+    values2 = pd.Series(['hello world', 'X ', 'café', None, None])
+    comparator = pd_compare.normalized_str_comparator()
+    assert comparator(values1, values2).tolist() == [True, True, True, False, False]
+    comparator = pd_compare.normalized_str_comparator(
+        strip=False, casefold=False, collapse_spaces=False, unicode_form=None
+    )
+    assert comparator(values1, values2).tolist() == [False, False, False, False, False]
@@ -1,13 +1,21 @@
+import importlib.util
 import math
 import os
 import random
 import re
+import threading
+import time
+import tracemalloc
+import warnings
+import zipfile
 from datetime import datetime as dt
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from some_pd_tools import pd_compare
+from some_pd_tools.pd_compare import _module_compare, _module_diff_files
 
 from ..basedf import BaseDF
 from ..formatting import (
@@ -460,6 +468,84 @@ def test_xls_exceptions():
             xls_datetime_rpl=1,
         )
 
+    # xls_diff_mode is not a valid value
+    # ************************************
+    with pytest.raises(
+        ValueError,
+        match=re.escape("xls_diff_mode must be one of 'column' or 'format'."),
+    ):
+        pd_compare.compare(
+            df1=bdf.df1,
+            df2=bdf.df2,
+            df1_name=bdf.df1_name,
+            df2_name=bdf.df2_name,
+            xls_path='__deleteme__.xlsx',
+            xls_diff_mode='colors',
+        )
+
+    # xls_datetime_rpl contains a directive not supported in Excel
+    # ************************************
+    with pytest.raises(
+        ValueError,
+        match=re.escape('xls_datetime_rpl contains a directive not supported in Excel: %j.'),
+    ):
+        pd_compare.compare(
+            df1=bdf.df1,
+            df2=bdf.df2,
+            df1_name=bdf.df1_name,
+            df2_name=bdf.df2_name,
+            xls_path='__deleteme__.xlsx',
+            xls_datetime_rpl='%Y-%j',
+        )
+
+    # xls_datetime_rpl contains a format Excel would read differently
+    # ************************************
+    for xls_datetime_rpl, error_msg in (
+        ('%M:%S', 'xls_datetime_rpl must contain %M right after %H or %I (e.g. %H:%M).'),
+        ('%H h %M', 'xls_datetime_rpl must contain %M right after %H or %I (e.g. %H:%M).'),
+        ('%I:%M', 'xls_datetime_rpl must contain %p when using %I.'),
+    ):
+        with pytest.raises(ValueError, match=re.escape(error_msg)):
+            pd_compare.compare(
+                df1=bdf.df1,
+                df2=bdf.df2,
+                xls_path='__deleteme__.xlsx',
+                xls_datetime_rpl=xls_datetime_rpl,
+            )
+    assert _module_compare._strftime_to_excel_format('%I:%M %p') == 'hh:mm AM/PM'
+    assert _module_compare._strftime_to_excel_format('%H:%M:%S') == 'hh:mm:ss'
+
+    # xls_number_precision is not None or a positive integer
+    # ************************************
+    for xls_number_precision in (-1, 1.5, True, '2'):
+        with pytest.raises(
+            ValueError,
+            match=re.escape('xls_number_precision must be None or a positive integer.'),
+        ):
+            pd_compare.compare(
+                df1=bdf.df1,
+                df2=bdf.df2,
+                df1_name=bdf.df1_name,
+                df2_name=bdf.df2_name,
+                xls_path='__deleteme__.xlsx',
+                xls_number_precision=xls_number_precision,
+            )
+
+    # xls_thousands_sep is not bool
+    # ************************************
+    with pytest.raises(
+        ValueError,
+        match=re.escape('xls_thousands_sep must be of type bool.'),
+    ):
+        pd_compare.compare(
+            df1=bdf.df1,
+            df2=bdf.df2,
+            df1_name=bdf.df1_name,
+            df2_name=bdf.df2_name,
+            xls_path='__deleteme__.xlsx',
+            xls_thousands_sep=1,
+        )
+
 
 def test_equality_full() -> None:
     bdf = BaseDF()
@@ -502,6 +588,26 @@ def test_equality_full() -> None:
             'xls_compare_str_diff': '*_diff_*',
             'xls_fixed_cols': None,
             'xls_datetime_rpl': '%Y-%m-%d %H:%M:%S',
+            'xls_diff_mode': 'column',
+            'xls_number_precision': None,
+            'xls_thousands_sep': False,
+            'export_in_background': False,
+            'diff_path': None,
+            'diff_format': 'parquet',
+            'diff_overwrite': False,
+            'comparators': None,
+            'on': None,
+            'match_rows': False,
+            'renamed_cols': None,
+            'renamed_cols_min_similarity': 1.0,
+            'diff_stats': False,
+            'top_k': None,
+            'diff_patterns': None,
+            'change_types': False,
+            'profile': False,
+            'progress': None,
+            'deadline': None,
+            'cancel_event': None,
         },
         'variables': {},
         'report': report_predicted,
@@ -545,6 +651,26 @@ def test_equality_full() -> None:
             'xls_compare_str_diff': '*_diff_*',
             'xls_fixed_cols': None,
             'xls_datetime_rpl': '%Y-%m-%d %H:%M:%S',
+            'xls_diff_mode': 'column',
+            'xls_number_precision': None,
+            'xls_thousands_sep': False,
+            'export_in_background': False,
+            'diff_path': None,
+            'diff_format': 'parquet',
+            'diff_overwrite': False,
+            'comparators': None,
+            'on': None,
+            'match_rows': False,
+            'renamed_cols': None,
+            'renamed_cols_min_similarity': 1.0,
+            'diff_stats': False,
+            'top_k': None,
+            'diff_patterns': None,
+            'change_types': False,
+            'profile': False,
+            'progress': None,
+            'deadline': None,
+            'cancel_event': None,
         },
         'variables':{},
         'report': report_predicted,
@@ -586,6 +712,26 @@ def test_equality_full() -> None:
             'xls_compare_str_diff': '*_diff_*',
             'xls_fixed_cols': None,
             'xls_datetime_rpl': '%Y-%m-%d %H:%M:%S',
+            'xls_diff_mode': 'column',
+            'xls_number_precision': None,
+            'xls_thousands_sep': False,
+            'export_in_background': False,
+            'diff_path': None,
+            'diff_format': 'parquet',
+            'diff_overwrite': False,
+            'comparators': None,
+            'on': None,
+            'match_rows': False,
+            'renamed_cols': None,
+            'renamed_cols_min_similarity': 1.0,
+            'diff_stats': False,
+            'top_k': None,
+            'diff_patterns': None,
+            'change_types': False,
+            'profile': False,
+            'progress': None,
+            'deadline': None,
+            'cancel_event': None,
         },
         'variables':{},
         'report': report_predicted,
@@ -1710,3 +1856,1135 @@ def test_after_compare_values_metadata():
 
     assert str(expected_joined_df) == str(metadata['variables']['joined_df'])
     assert expected_joined_df.equals(metadata['variables']['joined_df'])
+
+
+def test_xls_diff_mode(tmp_path):
+    bdf = BaseDF()
+
+    # 'column' mode, a 'different' column is added for every compared column
+    # ************************************
+    xls_path = str(tmp_path / 'diff_mode_column.xlsx')
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=bdf.df2_diff_values,
+        df1_name=bdf.df1_name,
+        df2_name=bdf.df2_name,
+        report_print=False,
+        xls_path=xls_path,
+        xls_diff_mode='column',
+    )
+    assert returned[2]['variables']['xls_path'] == os.path.realpath(xls_path)
+    with zipfile.ZipFile(xls_path) as xls_zip:
+        shared_strings = xls_zip.read('xl/sharedStrings.xml').decode('utf-8')
+        sheet = xls_zip.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    assert 'different' in shared_strings
+    assert '*_diff_*' in shared_strings
+    assert '<conditionalFormatting' not in sheet
+
+    # 'format' mode, different cells are highlighted, no 'different' column
+    # ************************************
+    xls_path = str(tmp_path / 'diff_mode_format.xlsx')
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=bdf.df2_diff_values,
+        df1_name=bdf.df1_name,
+        df2_name=bdf.df2_name,
+        report_print=False,
+        xls_path=xls_path,
+        xls_diff_mode='format',
+    )
+    assert returned[2]['variables']['xls_path'] == os.path.realpath(xls_path)
+    with zipfile.ZipFile(xls_path) as xls_zip:
+        shared_strings = xls_zip.read('xl/sharedStrings.xml').decode('utf-8')
+        sheet = xls_zip.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    assert 'different' not in shared_strings
+    assert '*_diff_*' not in shared_strings
+    # Columns: index, col_float(B,C), col_int(D,E), col_nan(F,G), col_str(H,I), col_strnan(J,K)
+    # Rows 0 to 2 are different (Excel rows 4 to 6) except for col_nan
+    assert (
+        re.search('<conditionalFormatting sqref="([^"]*)"', sheet).group(1)
+        == 'B4:C6 D4:E6 H4:I6 J4:K6'
+    )
+
+    # 'format' mode with a MultiIndex, the index uses two columns
+    # ************************************
+    df1 = pd.DataFrame(
+        {'k1': [1, 1, 2], 'k2': ['a', 'b', 'a'], 'x': [1.0, 2.0, 3.0], 'y': [10, 20, 30]}
+    )
+    df2 = df1.assign(x=[1.0, 2.0, 3.5], y=[10, 25, 30])
+    for kwargs in (
+        {'df1': df1.set_index(['k1', 'k2']), 'df2': df2.set_index(['k1', 'k2'])},
+        {'df1': df1, 'df2': df2, 'on': ['k1', 'k2']},
+    ):
+        xls_path = str(tmp_path / 'diff_mode_format_multiindex.xlsx')
+        pd_compare.compare(
+            **kwargs,
+            report_print=False,
+            xls_path=xls_path,
+            xls_overwrite=True,
+            xls_diff_mode='format',
+        )
+        with zipfile.ZipFile(xls_path) as xls_zip:
+            sheet = xls_zip.read('xl/worksheets/sheet1.xml').decode('utf-8')
+        # Columns: index (A,B), x(C,D), y(E,F)
+        # Row 2 is different for x (Excel row 6) and row 1 for y (Excel row 5)
+        assert re.search('<conditionalFormatting sqref="([^"]*)"', sheet).group(1) == 'C6:D6 E5:F5'
+        assert re.search('<pane [^>]*topLeftCell="([^"]*)"', sheet).group(1) == 'C3'
+        assert re.search('<autoFilter ref="([^"]*)"', sheet).group(1) == 'C2:F6'
+
+
+def test_xls_native_types(tmp_path):
+    bdf = BaseDF()
+    df1 = bdf.df1
+    df2 = bdf.df2_diff_values
+    df1['col_datetime'] = pd.to_datetime(['2024-01-02', '2024-02-03', '2024-03-04', '2024-04-05'])
+    df2['col_datetime'] = pd.to_datetime(['2024-01-02', '2024-02-03', '2024-03-05', '2024-04-05'])
+    df1_orig = df1.copy()
+
+    xls_path = str(tmp_path / 'native_types.xlsx')
+    pd_compare.compare(
+        df1=df1,
+        df2=df2,
+        df1_name=bdf.df1_name,
+        df2_name=bdf.df2_name,
+        report_print=False,
+        xls_path=xls_path,
+        xls_datetime_rpl='%d/%m/%Y',
+        xls_number_precision=2,
+        xls_thousands_sep=True,
+    )
+    # The DataFrame passed is not modified
+    assert df1.equals(df1_orig)
+    with zipfile.ZipFile(xls_path) as xls_zip:
+        shared_strings = xls_zip.read('xl/sharedStrings.xml').decode('utf-8')
+        styles = xls_zip.read('xl/styles.xml').decode('utf-8')
+    # Datetimes and numbers are not written as strings
+    assert '2024' not in shared_strings
+    assert '1,000' not in shared_strings
+    # Number formats
+    assert 'formatCode="dd/mm/yyyy"' in styles
+    assert 'formatCode="#,##0.00"' in styles
+    assert 'formatCode="#,##0"' in styles
+
+    # With a MultiIndex, the formats are applied to the columns after the index columns
+    df1 = pd.DataFrame({'x': [1.0, 2.0], 'y': [10, 20]}, index=[[1, 2], ['a', 'b']])
+    xls_path = str(tmp_path / 'native_types_multiindex.xlsx')
+    pd_compare.compare(
+        df1=df1,
+        df2=df1.assign(y=[10, 25]),
+        report_print=False,
+        xls_path=xls_path,
+        xls_diff_mode='format',
+        xls_number_precision=2,
+        xls_thousands_sep=True,
+    )
+    with zipfile.ZipFile(xls_path) as xls_zip:
+        sheet = xls_zip.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    # Columns: index (A,B), x(C,D), y(E,F)
+    cols_with_format = {
+        col_num
+        for col_min, col_max in re.findall(r'<col min="(\d+)" max="(\d+)"[^>]* style=', sheet)
+        for col_num in range(int(col_min), int(col_max) + 1)
+    }
+    assert cols_with_format == {3, 4, 5, 6}
+
+
+def test_xls_split_in_sheets(tmp_path, monkeypatch):
+    bdf = BaseDF()
+    # Reduce Excel limits so the 4 rows and 5 compared columns don't fit in one sheet
+    # Rows: 3 header rows + 2 data rows, Columns: index + 2 fixed columns + 2 compared columns
+    monkeypatch.setattr(_module_compare, '_XLS_MAX_ROWS', 5)
+    monkeypatch.setattr(_module_compare, '_XLS_MAX_COLS', 9)
+
+    xls_path = str(tmp_path / 'split.xlsx')
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=bdf.df2_diff_values,
+        df1_name=bdf.df1_name,
+        df2_name=bdf.df2_name,
+        report_print=False,
+        xls_path=xls_path,
+        xls_fixed_cols=['col_int'],
+    )
+    # 2 row chunks * 3 column groups
+    sheets = [f'Sheet{i}' for i in range(1, 7)]
+    assert returned[2]['variables']['xls_sheets'] == sheets
+    assert 'split in 6 sheets' in returned[2]['report']
+    with zipfile.ZipFile(xls_path) as xls_zip:
+        workbook = xls_zip.read('xl/workbook.xml').decode('utf-8')
+        sheet_1 = xls_zip.read('xl/worksheets/sheet2.xml').decode('utf-8')
+    assert re.findall('<sheet name="([^"]*)"', workbook) == ['Summary', *sheets]
+    # Every sheet has a frozen header and an autofilter
+    assert '<pane xSplit="3" ySplit="2"' in sheet_1
+    assert '<autoFilter ref="B2:I5"/>' in sheet_1
+
+    # Too many fixed columns
+    # ************************************
+    with pytest.raises(
+        ValueError,
+        match=re.escape("Too many xls_fixed_cols (3), they don't fit in an Excel sheet."),
+    ):
+        pd_compare.compare(
+            df1=bdf.df1,
+            df2=bdf.df2_diff_values,
+            df1_name=bdf.df1_name,
+            df2_name=bdf.df2_name,
+            report_print=False,
+            xls_path=xls_path,
+            xls_overwrite=True,
+            xls_fixed_cols=['col_int', 'col_float', 'col_str'],
+        )
+
+    # MultiIndex, the index uses two columns
+    # ************************************
+    # Columns: 2 index columns + 2 fixed columns + 1 compared column
+    df1_multiindex = bdf.df1.set_axis(
+        pd.MultiIndex.from_tuples([(0, 'a'), (1, 'b'), (2, 'c'), (3, 'd')])
+    )
+    df2_multiindex = bdf.df2_diff_values.set_axis(df1_multiindex.index)
+    returned = pd_compare.compare(
+        df1=df1_multiindex,
+        df2=df2_multiindex,
+        report_print=False,
+        xls_path=xls_path,
+        xls_overwrite=True,
+        xls_fixed_cols=['col_int'],
+    )
+    # 2 row chunks * 5 column groups
+    sheets = [f'Sheet{i}' for i in range(1, 11)]
+    assert returned[2]['variables']['xls_sheets'] == sheets
+    with zipfile.ZipFile(xls_path) as xls_zip:
+        sheets_xml = [
+            xls_zip.read(f'xl/worksheets/sheet{i}.xml').decode('utf-8') for i in range(2, 12)
+        ]
+    # No sheet goes over the column limit (column I)
+    for sheet in sheets_xml:
+        assert re.search('<dimension ref="A1:([A-Z]+)', sheet).group(1) <= 'G'
+    assert '<pane xSplit="4" ySplit="2"' in sheets_xml[0]
+    assert '<autoFilter ref="C2:G5"/>' in sheets_xml[0]
+
+    # The on columns are the index
+    with pytest.raises(
+        ValueError,
+        match=re.escape("Too many xls_fixed_cols (2), they don't fit in an Excel sheet."),
+    ):
+        pd_compare.compare(
+            df1=bdf.df1,
+            df2=bdf.df2_diff_values,
+            report_print=False,
+            xls_path=xls_path,
+            xls_overwrite=True,
+            xls_fixed_cols=['col_int', 'col_float'],
+            on=['col_str', 'col_strnan', 'col_nan'],
+        )
+
+
+def test_export_in_background(tmp_path, monkeypatch):
+    bdf = BaseDF()
+
+    # export_in_background is not bool
+    # ************************************
+    with pytest.raises(
+        ValueError,
+        match=re.escape('export_in_background must be of type bool.'),
+    ):
+        pd_compare.compare(
+            df1=bdf.df1,
+            df2=bdf.df2_diff_values,
+            export_in_background=1,
+        )
+
+    # Files are saved in the background
+    # ************************************
+    xls_path = str(tmp_path / 'background.xlsx')
+    report_file_path = str(tmp_path / 'background.txt')
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=bdf.df2_diff_values,
+        df1_name=bdf.df1_name,
+        df2_name=bdf.df2_name,
+        report_print=False,
+        report_file_path=report_file_path,
+        xls_path=xls_path,
+        export_in_background=True,
+    )
+    assert 'Files are saved in the background' in returned[2]['report']
+    assert returned[2]['variables']['export_future'].result() is None
+    assert os.path.isfile(xls_path)
+    with open(report_file_path, encoding='utf-8') as report_file:
+        assert report_file.read() == returned[2]['report']
+
+    # No files to save, no future
+    # ************************************
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=bdf.df2_diff_values,
+        report_print=False,
+        export_in_background=True,
+    )
+    assert 'export_future' not in returned[2]['variables']
+    assert 'Files are saved in the background' not in returned[2]['report']
+
+    # Errors are raised when getting the future's result
+    # ************************************
+    def _failing_save_excel(*args, **kwargs):
+        raise OSError('Disk full')
+
+    monkeypatch.setattr(_module_compare, '_save_excel', _failing_save_excel)
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=bdf.df2_diff_values,
+        report_print=False,
+        xls_path=str(tmp_path / 'failing.xlsx'),
+        export_in_background=True,
+    )
+    with pytest.raises(OSError, match=re.escape('Disk full')):
+        returned[2]['variables']['export_future'].result()
+
+
+def test_diff_files(tmp_path):
+    bdf = BaseDF()
+
+    # Wrong values
+    # ************************************
+    with pytest.raises(ValueError, match=re.escape('diff_path must be of type str.')):
+        pd_compare.compare(df1=bdf.df1, df2=bdf.df2_diff_values, diff_path=1)
+    with pytest.raises(
+        ValueError, match=re.escape("diff_format must be one of 'parquet', 'arrow' or 'csv'.")
+    ):
+        pd_compare.compare(
+            df1=bdf.df1, df2=bdf.df2_diff_values, diff_path=str(tmp_path), diff_format='xlsx'
+        )
+    open(tmp_path / 'a_file', 'a', encoding='utf-8').close()
+    with pytest.raises(
+        ValueError, match=re.escape(f'diff_path [{tmp_path / "a_file"}] must be a directory.')
+    ):
+        pd_compare.compare(df1=bdf.df1, df2=bdf.df2_diff_values, diff_path=str(tmp_path / 'a_file'))
+
+    # CSV files
+    # ************************************
+    diff_path = str(tmp_path / 'diff')
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=bdf.df2_diff_values,
+        df1_name=bdf.df1_name,
+        df2_name=bdf.df2_name,
+        report_print=False,
+        diff_path=diff_path,
+        diff_format='csv',
+    )
+    diff_files = returned[2]['variables']['diff_files']
+    assert list(diff_files) == ['equality_df', 'diff_cells', 'joined_df']
+    equality_df = pd.read_csv(diff_files['equality_df'], index_col=0)
+    assert equality_df.equals(returned[2]['variables']['equality_df'])
+    diff_cells = pd.read_csv(diff_files['diff_cells'])
+    assert len(diff_cells) == (~returned[2]['variables']['equality_df']).sum().sum()
+    assert list(diff_cells.iloc[0]) == [0, 'col_float']
+    joined_df = pd.read_csv(diff_files['joined_df'], index_col=0)
+    assert list(joined_df.columns[:3]) == [
+        'col_float (first_df)',
+        'col_float (second_df)',
+        'col_float (different)',
+    ]
+
+    # Files exist but diff_overwrite is False
+    # ************************************
+    with pytest.raises(
+        ValueError,
+        match=re.escape(
+            f'diff_path [{diff_path}] contains [equality_df.csv] but diff_overwrite is False.'
+        ),
+    ):
+        pd_compare.compare(
+            df1=bdf.df1,
+            df2=bdf.df2_diff_values,
+            diff_path=diff_path,
+            diff_format='csv',
+        )
+
+    # Parquet and Arrow files
+    # ************************************
+    pytest.importorskip('pyarrow')
+    for diff_format, read_fn in (('parquet', pd.read_parquet), ('arrow', pd.read_feather)):
+        returned = pd_compare.compare(
+            df1=bdf.df1,
+            df2=bdf.df2_diff_values,
+            report_print=False,
+            diff_path=diff_path,
+            diff_format=diff_format,
+        )
+        diff_files = returned[2]['variables']['diff_files']
+        equality_df = read_fn(diff_files['equality_df'])
+        assert equality_df.equals(returned[2]['variables']['equality_df'])
+        assert len(read_fn(diff_files['diff_cells'])) == len(diff_cells)
+        assert len(read_fn(diff_files['joined_df'])) == len(returned[2]['variables']['joined_df'])
+
+
+def test_diff_files_batches(tmp_path, monkeypatch):
+    bdf = BaseDF()
+    # Every file is written in several batches
+    monkeypatch.setattr(_module_diff_files, '_DIFF_BATCH_ROWS', 2)
+
+    diff_formats = [('csv', None)]
+    if importlib.util.find_spec('pyarrow') is not None:
+        diff_formats += [('parquet', pd.read_parquet), ('arrow', pd.read_feather)]
+    for diff_format, read_fn in diff_formats:
+        returned = pd_compare.compare(
+            df1=bdf.df1,
+            df2=bdf.df2_diff_values,
+            report_print=False,
+            diff_path=str(tmp_path / diff_format),
+            diff_format=diff_format,
+        )
+        variables = returned[2]['variables']
+        diff_files = variables['diff_files']
+        if diff_format == 'csv':
+            equality_df = pd.read_csv(diff_files['equality_df'], index_col=0)
+            diff_cells = pd.read_csv(diff_files['diff_cells'])
+            joined_df = pd.read_csv(diff_files['joined_df'], index_col=0)
+        else:
+            equality_df = read_fn(diff_files['equality_df'])
+            diff_cells = read_fn(diff_files['diff_cells'])
+            joined_df = read_fn(diff_files['joined_df'])
+        assert equality_df.equals(variables['equality_df'])
+        assert len(diff_cells.index) == (~variables['equality_df']).sum().sum()
+        assert len(diff_cells.index) > 2
+        assert list(joined_df.index) == list(variables['joined_df'].index)
+
+
+def test_unify_categories():
+    df1 = pd.DataFrame(
+        {
+            'col_cat': pd.Categorical(['a', 'b', 'a']),
+            'col_int': [1, 2, 3],
+        }
+    )
+    df2 = pd.DataFrame(
+        {
+            'col_cat': pd.Categorical(['a', 'b', 'a'], categories=['b', 'a', 'z']),
+            'col_int': [1, 2, 4],
+        }
+    )
+
+    # Different values, categories are unified without simplifying dtypes
+    # ************************************
+    returned = pd_compare.compare(df1=df1, df2=df2, report_print=False)
+    assert returned[0] is False
+    assert returned[1] is False
+    assert returned[2]['variables']['cols_categories_unified'] == ['col_cat']
+    assert returned[2]['variables']['common_cols_dtypes_equality'] is True
+    assert 'common_cols_dtypes_simplified' not in returned[2]['variables']
+    assert list(returned[2]['variables']['df1_common']['col_cat'].cat.categories) == ['a', 'b', 'z']
+    assert list(returned[2]['variables']['df2_common']['col_cat'].cat.categories) == ['a', 'b', 'z']
+    assert returned[2]['variables']['cols_diff_list_sorted'] == ['col_int']
+    # Original DataFrames are not modified
+    assert list(df2['col_cat'].cat.categories) == ['b', 'a', 'z']
+    assert (
+        '# Unifying categories\n'
+        + '  (for categorical columns)\n'
+        + '> 😓 Categories unified in columns (count=1):\n'
+        + "  ['col_cat']\n"
+    ) in returned[2]['report']
+
+    # Equal values after unifying categories
+    # ************************************
+    returned = pd_compare.compare(df1=df1, df2=df2.assign(col_int=[1, 2, 3]), report_print=False)
+    assert returned[0] is False
+    assert returned[1] is True
+    assert (
+        '# Equality check\n' + '  (after unifying categories)\n' + '<<< 🥳 Equal >>>\n'
+    ) in returned[2]['report']
+
+
+def test_comparators():
+    bdf = BaseDF()
+    df2 = bdf.df1.copy()
+    df2['col_float'] = df2['col_float'] + 1e-12
+
+    with pytest.raises(
+        ValueError,
+        match=re.escape('comparators must be None or a dict whose values are functions.'),
+    ):
+        pd_compare.compare(df1=bdf.df1, df2=df2, comparators={'col_float': 'a'})
+
+    # Equal using the comparators
+    # ************************************
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=df2,
+        report_print=False,
+        comparators={'float64': pd_compare.float_tolerance_comparator()},
+    )
+    assert returned[0] is False
+    assert returned[1] is True
+    assert returned[2]['variables']['equality_df'].all(axis=None)
+    assert '> ✅ All values are equal using comparators\n' in returned[2]['report']
+
+    # Not equal using the comparators
+    # ************************************
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=df2,
+        report_print=False,
+        comparators={'col_int': pd_compare.float_tolerance_comparator()},
+    )
+    assert returned[0] is False
+    assert returned[1] is False
+    assert returned[2]['variables']['cols_diff_list_sorted'] == ['col_float']
+
+
+def test_on(tmp_path):
+    df1 = pd.DataFrame(
+        {
+            'key1': [3, 1, 2, 2],
+            'key2': ['x', 'y', 'z', 'w'],
+            'col_float': [1.0, 2.0, 3.0, 4.0],
+        }
+    )
+    df2 = pd.DataFrame(
+        {
+            'key1': [1, 2, 3, 5],
+            'key2': ['y', 'z', 'x', 'q'],
+            'col_float': [2.0, 3.0, 5.0, 6.0],
+        }
+    )
+
+    # Wrong values
+    # ************************************
+    for on in ([], ['key1', 'key1'], 1.5):
+        with pytest.raises(
+            ValueError,
+            match=re.escape(
+                'on must be None, a column name or a list of not duplicated column names.'
+            ),
+        ):
+            pd_compare.compare(df1=df1, df2=df2, on=on)
+    with pytest.raises(
+        ValueError,
+        match=re.escape("The following on columns are not present in second_df: ['key3']."),
+    ):
+        pd_compare.compare(
+            df1=df1.assign(key3=1),
+            df2=df2,
+            df1_name='first_df',
+            df2_name='second_df',
+            on=['key1', 'key3'],
+        )
+    with pytest.raises(
+        ValueError,
+        match=re.escape('xls_fixed_cols cannot contain on columns, they are the index.'),
+    ):
+        pd_compare.compare(
+            df1=df1,
+            df2=df2,
+            on=['key1', 'key2'],
+            xls_path=str(tmp_path / 'compare.xlsx'),
+            xls_fixed_cols=['key2'],
+        )
+
+    # Composite key
+    # ************************************
+    returned = pd_compare.compare(df1=df1, df2=df2, report_print=False, on=['key1', 'key2'])
+    assert returned[0] is False
+    assert returned[1] is False
+    assert returned[2]['params']['on'] == ['key1', 'key2']
+    assert returned[2]['variables']['idxs_df1_excl_set'] == {(2, 'w')}
+    assert returned[2]['variables']['idxs_df2_excl_set'] == {(5, 'q')}
+    assert returned[2]['variables']['cols_common_list_sorted'] == ['col_float']
+    assert returned[2]['variables']['rows_diff_list_sorted'] == [(3, 'x')]
+    joined_df = returned[2]['variables']['joined_df']
+    assert list(joined_df.index.names) == ['key1', 'key2']
+    assert list(joined_df.index) == [(1, 'y'), (2, 'z'), (3, 'x')]
+    assert '# Comparing keys from [df1] and [df2]\n' in returned[2]['report']
+    # Same result as using the keys as the index
+    returned_set_index = pd_compare.compare(
+        df1=df1.set_index(['key1', 'key2']),
+        df2=df2.set_index(['key1', 'key2']),
+        report_print=False,
+    )
+    assert returned_set_index[2]['variables']['joined_df'].equals(joined_df)
+
+    # Single key with duplicates
+    # ************************************
+    returned = pd_compare.compare(df1=df1, df2=df2, report_print=False, on='key1')
+    assert returned[0] is False
+    assert returned[1] is False
+    assert returned[2]['variables']['idxs_df1_dups_common_dict'] == {2: 2}
+    assert returned[2]['variables']['error'].startswith('🛑 Duplicate common keys found.')
+
+    # Equal after matching the rows by key
+    # ************************************
+    returned = pd_compare.compare(
+        df1=df1.iloc[[0, 1, 2]],
+        df2=df2.iloc[[2, 0, 1]].assign(col_float=[1.0, 2.0, 3.0]),
+        report_print=False,
+        on=['key1', 'key2'],
+    )
+    assert returned[0] is True
+
+    # Empty DataFrames with a composite key
+    # ************************************
+    returned = pd_compare.compare(
+        df1=df1.iloc[:0], df2=df2.iloc[:0], report_print=False, on=['key1', 'key2']
+    )
+    assert returned[0] is True
+
+
+def test_match_rows():
+    bdf = BaseDF()
+
+    with pytest.raises(ValueError, match=re.escape('match_rows must be of type bool.')):
+        pd_compare.compare(df1=bdf.df1, df2=bdf.df2_diff_values, match_rows=1)
+
+    # Rows under a different index
+    # ************************************
+    df2 = bdf.df1.iloc[[2, 0, 1]].set_axis([0, 10, 11])
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=df2,
+        df1_name=bdf.df1_name,
+        df2_name=bdf.df2_name,
+        report_print=False,
+        match_rows=True,
+    )
+    assert returned[0] is False
+    assert returned[1] is False
+    assert returned[2]['variables']['rows_multiset_equality'] is False
+    rows_moved_df = returned[2]['variables']['rows_moved_df']
+    assert list(rows_moved_df.columns) == ['first_df', 'second_df']
+    assert list(rows_moved_df.itertuples(index=False, name=None)) == [(0, 10), (1, 11), (2, 0)]
+    assert (
+        '> 😓 Rows equal but under a different index (count=3), (first_df index, second_df index):\n'
+        + '  [(0, 10), (1, 11), (2, 0)]\n'
+        + '<<< 😡 Not equal ignoring the index and the order of the rows >>>\n'
+    ) in returned[2]['report']
+
+    # Same rows, re-indexed and in a different order (multiset equality)
+    # ************************************
+    df2 = bdf.df1.iloc[[3, 1, 2, 0]].reset_index(drop=True)
+    returned = pd_compare.compare(df1=bdf.df1, df2=df2, report_print=False, match_rows=True)
+    assert returned[0] is False
+    assert returned[1] is True
+    assert returned[2]['variables']['rows_multiset_equality'] is True
+    assert list(returned[2]['variables']['rows_moved_df'].itertuples(index=False, name=None)) == [
+        (0, 3),
+        (3, 0),
+    ]
+
+    # Duplicated rows, the k-th occurrence in df1 is paired with the k-th occurrence in df2
+    # ************************************
+    df1 = pd.DataFrame({'col_int': [1, 1, 2]})
+    df2 = pd.DataFrame({'col_int': [2, 1, 1, 1]}, index=[5, 6, 0, 7])
+    returned = pd_compare.compare(df1=df1, df2=df2, report_print=False, match_rows=True)
+    assert returned[2]['variables']['rows_multiset_equality'] is False
+    assert list(returned[2]['variables']['rows_moved_df'].itertuples(index=False, name=None)) == [
+        (1, 6),
+        (2, 5),
+    ]
+
+    # More copies of a row in df2 than rows in df1
+    # ************************************
+    df1 = pd.DataFrame({'col_int': [1, 2]}, index=[10, 11])
+    df2 = pd.DataFrame({'col_int': [1, 1, 1, 1, 2]})
+    returned = pd_compare.compare(df1=df1, df2=df2, report_print=False, match_rows=True)
+    assert returned[2]['variables']['rows_multiset_equality'] is False
+    assert list(returned[2]['variables']['rows_moved_df'].itertuples(index=False, name=None)) == [
+        (10, 0),
+        (11, 4),
+    ]
+
+    # An empty DataFrame
+    # ************************************
+    df1 = pd.DataFrame({'col_int': pd.Series([], dtype='int64')}, index=pd.Index([], dtype=object))
+    df2 = pd.DataFrame({'col_int': [1, 2]})
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', FutureWarning)
+        returned = pd_compare.compare(df1=df1, df2=df2, report_print=False, match_rows=True)
+    assert returned[2]['variables']['rows_multiset_equality'] is False
+    assert len(returned[2]['variables']['rows_moved_df'].index) == 0
+
+
+def test_renamed_cols():
+    bdf = BaseDF()
+
+    with pytest.raises(
+        ValueError, match=re.escape("renamed_cols must be one of None, 'detect' or 'compare'.")
+    ):
+        pd_compare.compare(df1=bdf.df1, df2=bdf.df2_diff_values, renamed_cols=True)
+    with pytest.raises(
+        ValueError,
+        match=re.escape(
+            'renamed_cols_min_similarity must be a number greater than 0 and at most 1.'
+        ),
+    ):
+        pd_compare.compare(df1=bdf.df1, df2=bdf.df2_diff_values, renamed_cols_min_similarity=0)
+
+    # Identical content, detected only
+    # ************************************
+    df2 = bdf.df1.rename(columns={'col_str': 'col_text'})
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=df2,
+        df1_name=bdf.df1_name,
+        df2_name=bdf.df2_name,
+        report_print=False,
+        renamed_cols='detect',
+    )
+    assert returned[0] is False
+    assert returned[1] is True
+    cols_renamed_df = returned[2]['variables']['cols_renamed_df']
+    assert list(cols_renamed_df.columns) == ['first_df', 'second_df', 'similarity']
+    assert list(cols_renamed_df.itertuples(index=False, name=None)) == [
+        ('col_str', 'col_text', 1.0)
+    ]
+    assert returned[2]['variables']['cols_df1_excl_set'] == {'col_str'}
+    assert (
+        '> 😓 Probable renamed columns (count=1), (first_df column, second_df column, similarity):\n'
+        + "  [('col_str', 'col_text', 1.0)]\n"
+    ) in returned[2]['report']
+
+    # Identical content, compared as if the columns had the same name
+    # ************************************
+    returned = pd_compare.compare(df1=bdf.df1, df2=df2, report_print=False, renamed_cols='compare')
+    assert returned[0] is False
+    assert returned[1] is True
+    assert returned[2]['variables']['cols_df1_excl_set'] == set()
+    assert returned[2]['variables']['cols_common_set'] == set(bdf.df1.columns)
+
+    # Similar content, only found with a lower min similarity
+    # ************************************
+    df2 = bdf.df2_diff_values.rename(columns={'col_int': 'col_integer'})
+    returned = pd_compare.compare(df1=bdf.df1, df2=df2, report_print=False, renamed_cols='compare')
+    assert len(returned[2]['variables']['cols_renamed_df'].index) == 0
+    assert '> ✅ No renamed columns found\n' in returned[2]['report']
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=df2,
+        report_print=False,
+        renamed_cols='compare',
+        renamed_cols_min_similarity=0.25,
+    )
+    cols_renamed_df = returned[2]['variables']['cols_renamed_df']
+    assert list(cols_renamed_df.iloc[:, :2].itertuples(index=False, name=None)) == [
+        ('col_int', 'col_integer')
+    ]
+    assert cols_renamed_df['similarity'].iloc[0] == 0.25
+    assert 'col_int' in returned[2]['variables']['cols_diff_list_sorted']
+
+    # No common indexes, no renamed columns
+    # ************************************
+    df2 = bdf.df1.rename(columns={'col_str': 'col_text', 'col_int': 'col_integer'})
+    df2.index = df2.index + 10
+    returned = pd_compare.compare(df1=bdf.df1, df2=df2, report_print=False, renamed_cols='compare')
+    assert len(returned[2]['variables']['cols_renamed_df'].index) == 0
+    assert returned[2]['variables']['cols_df1_excl_set'] == {'col_int', 'col_str'}
+    assert "> 😓 No common indexes, renamed columns can't be detected\n" in returned[2]['report']
+
+
+def test_diff_stats():
+    bdf = BaseDF()
+
+    with pytest.raises(ValueError, match=re.escape('diff_stats must be of type bool.')):
+        pd_compare.compare(df1=bdf.df1, df2=bdf.df2_diff_values, diff_stats=1)
+
+    df1 = pd.DataFrame(
+        {
+            'col_int': [10, 20, 30, 40],
+            'col_float': [1.0, np.nan, 3.0, 4.0],
+            'col_str': ['a', 'b', 'c', 'd'],
+        }
+    )
+    df2 = pd.DataFrame(
+        {
+            'col_int': [10, 25, 30, 20],
+            'col_float': [1.0, 2.0, 3.0, 4.0],
+            'col_str': ['a', 'b', 'x', 'd'],
+        }
+    )
+    returned = pd_compare.compare(df1=df1, df2=df2, report_print=False, diff_stats=True)
+    diff_stats_df = returned[2]['variables']['diff_stats_df']
+    # Not numeric columns are not included
+    assert list(diff_stats_df.index) == ['col_float', 'col_int']
+    assert list(diff_stats_df.columns) == [
+        'diff_count',
+        'nan_mismatch_count',
+        'max_abs_diff',
+        'mean_abs_diff',
+        'max_rel_diff',
+        'mean_rel_diff',
+    ]
+    assert diff_stats_df.loc['col_int', 'diff_count'] == 2
+    assert diff_stats_df.loc['col_int', 'nan_mismatch_count'] == 0
+    assert diff_stats_df.loc['col_int', 'max_abs_diff'] == 20
+    assert diff_stats_df.loc['col_int', 'mean_abs_diff'] == 12.5
+    assert diff_stats_df.loc['col_int', 'max_rel_diff'] == 0.5
+    assert diff_stats_df.loc['col_int', 'mean_rel_diff'] == 0.35
+    # Only a missing value is different, no differences to compute
+    assert diff_stats_df.loc['col_float', 'diff_count'] == 1
+    assert diff_stats_df.loc['col_float', 'nan_mismatch_count'] == 1
+    assert np.isnan(diff_stats_df.loc['col_float', 'max_abs_diff'])
+    assert (
+        '> 😓 Differences of numeric columns (count=2):\n'
+        + '  |---------|-----|---------|-------|--------|-------|--------|\n'
+        + '  |column   |diffs|nan_diffs|max_abs|mean_abs|max_rel|mean_rel|\n'
+        + '  |---------|-----|---------|-------|--------|-------|--------|\n'
+        + '  |col_float|    1|        1|    nan|     nan|    nan|     nan|\n'
+        + '  |col_int  |    2|        0|     20|    12.5|    0.5|    0.35|\n'
+        + '  |---------|-----|---------|-------|--------|-------|--------|\n'
+    ) in returned[2]['report']
+
+
+def test_top_k():
+    bdf = BaseDF()
+
+    for top_k in (0, 1.5, True):
+        with pytest.raises(
+            ValueError, match=re.escape('top_k must be None or a positive integer.')
+        ):
+            pd_compare.compare(df1=bdf.df1, df2=bdf.df2_diff_values, top_k=top_k)
+
+    df1 = pd.DataFrame(
+        {
+            'col_int': [10, 20, 30, 40, 50],
+            'col_float': [1.0, np.nan, 3.0, 4.0, 5.0],
+            'col_str': ['a', 'b', 'c', 'd', 'e'],
+        },
+        index=['a', 'b', 'c', 'd', 'e'],
+    )
+    df2 = pd.DataFrame(
+        {
+            'col_int': [15, 20, 0, 39, 70],
+            'col_float': [1.0, 2.0, 3.0, 4.0, 5.5],
+            'col_str': ['a', 'b', 'x', 'd', 'e'],
+        },
+        index=['a', 'b', 'c', 'd', 'e'],
+    )
+    returned = pd_compare.compare(
+        df1=df1,
+        df2=df2,
+        df1_name=bdf.df1_name,
+        df2_name=bdf.df2_name,
+        report_print=False,
+        top_k=2,
+    )
+    top_k_diffs_df = returned[2]['variables']['top_k_diffs_df']
+    assert list(top_k_diffs_df.columns) == ['column', 'index', 'first_df', 'second_df', 'delta']
+    # Largest absolute differences first, a missing value is not a difference
+    assert list(top_k_diffs_df.itertuples(index=False, name=None)) == [
+        ('col_float', 'e', 5.0, 5.5, 0.5),
+        ('col_int', 'c', 30.0, 0.0, -30.0),
+        ('col_int', 'e', 50.0, 70.0, 20.0),
+    ]
+    assert (
+        '# Finding the largest differences [top_k=2]\n'
+        + '  (for numeric columns)\n'
+        + '> 😓 col_float (count=1), (index, first_df, second_df, delta):\n'
+        + "  [('e', 5.0, 5.5, 0.5)]\n"
+        + '> 😓 col_int (count=2), (index, first_df, second_df, delta):\n'
+        + "  [('c', 30.0, 0.0, -30.0), ('e', 50.0, 70.0, 20.0)]\n"
+    ) in returned[2]['report']
+
+
+def test_diff_patterns():
+    bdf = BaseDF()
+
+    for diff_patterns in (0, 1.5, True):
+        with pytest.raises(
+            ValueError, match=re.escape('diff_patterns must be None or a positive integer.')
+        ):
+            pd_compare.compare(df1=bdf.df1, df2=bdf.df2_diff_values, diff_patterns=diff_patterns)
+
+    # More than 8 columns, so signatures have more than one byte
+    df1 = pd.DataFrame({f'col_{num:02}': range(6) for num in range(10)})
+    df2 = df1.copy()
+    df2.loc[[0, 2, 4], ['col_01', 'col_09']] = -1
+    df2.loc[[1, 5], 'col_09'] = -1
+    df2.loc[3, 'col_00'] = -1
+    returned = pd_compare.compare(df1=df1, df2=df2, report_print=False, diff_patterns=2)
+    assert returned[2]['variables']['diff_patterns_count'] == 3
+    diff_patterns_df = returned[2]['variables']['diff_patterns_df']
+    assert list(diff_patterns_df.columns) == ['columns', 'count', 'rows_sample']
+    assert list(diff_patterns_df.itertuples(index=False, name=None)) == [
+        (('col_01', 'col_09'), 3, [0, 2, 4]),
+        (('col_09',), 2, [1, 5]),
+    ]
+    assert (
+        '> 😓 Patterns of different columns (count=3), showing 2, (columns, rows count, rows sample):\n'
+        + "  [(('col_01', 'col_09'), 3, [0, 2, 4]), (('col_09',), 2, [1, 5])]\n"
+    ) in returned[2]['report']
+
+
+def test_change_types():
+    bdf = BaseDF()
+
+    with pytest.raises(ValueError, match=re.escape('change_types must be of type bool.')):
+        pd_compare.compare(df1=bdf.df1, df2=bdf.df2_diff_values, change_types=1)
+
+    df1 = pd.DataFrame(
+        {
+            'col_float': [1.0, np.nan, 3.0, 4.0, 5.0],
+            'col_int': [1, 2, 3, 4, 5],
+            'col_obj': ['a', None, 'c', 1, 'e'],
+        }
+    )
+    df2 = pd.DataFrame(
+        {
+            'col_float': [np.nan, 2.0, 1.0, 5.0, 5.0],
+            'col_int': [1, 2, 3, 4, 6],
+            'col_obj': ['x', 'b', None, '1', 'e'],
+        }
+    )
+    returned = pd_compare.compare(df1=df1, df2=df2, report_print=False, change_types=True)
+    change_types_df = returned[2]['variables']['change_types_df']
+    assert list(change_types_df.columns) == [
+        'null_to_value',
+        'value_to_null',
+        'type_change',
+        'increase',
+        'decrease',
+        'value_change',
+    ]
+    assert change_types_df.to_dict(orient='index') == {
+        'col_float': {
+            'null_to_value': 1,
+            'value_to_null': 1,
+            'type_change': 0,
+            'increase': 1,
+            'decrease': 1,
+            'value_change': 0,
+        },
+        'col_int': {
+            'null_to_value': 0,
+            'value_to_null': 0,
+            'type_change': 0,
+            'increase': 1,
+            'decrease': 0,
+            'value_change': 0,
+        },
+        'col_obj': {
+            'null_to_value': 1,
+            'value_to_null': 1,
+            'type_change': 1,
+            'increase': 0,
+            'decrease': 0,
+            'value_change': 1,
+        },
+    }
+    assert (
+        '> 😓 Changes by type (count=3 columns):\n'
+        + '  |---------|-------------|-------------|----|--------|--------|-----|\n'
+        + '  |column   |null_to_value|value_to_null|type|increase|decrease|value|\n'
+        + '  |---------|-------------|-------------|----|--------|--------|-----|\n'
+        + '  |col_float|            1|            1|   0|       1|       1|    0|\n'
+        + '  |col_int  |            0|            0|   0|       1|       0|    0|\n'
+        + '  |col_obj  |            1|            1|   1|       0|       0|    1|\n'
+        + '  |---------|-------------|-------------|----|--------|--------|-----|\n'
+    ) in returned[2]['report']
+
+
+def test_profile(tmp_path):
+    bdf = BaseDF()
+
+    with pytest.raises(ValueError, match=re.escape('profile must be of type bool.')):
+        pd_compare.compare(df1=bdf.df1, df2=bdf.df2_diff_values, profile=1)
+
+    # No profile by default
+    returned = pd_compare.compare(df1=bdf.df1, df2=bdf.df2_diff_values, report_print=False)
+    assert 'profile' not in returned[2]
+    assert '# Profiling stages\n' not in returned[2]['report']
+
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=bdf.df2_diff_values,
+        report_print=False,
+        diff_path=str(tmp_path / 'diff'),
+        diff_format='csv',
+        profile=True,
+    )
+    profile_df = returned[2]['profile']
+    assert list(profile_df.columns) == [
+        'wall_time',
+        'cpu_time',
+        'mem_peak',
+        'mem_net',
+        'df1_shape',
+        'df2_shape',
+    ]
+    # Only stages that ran are included, in order
+    assert list(profile_df.index) == [
+        'COPY',
+        'EQLTY FULL',
+        'COMPARE COLUMNS',
+        'COMPARE INDEXES',
+        'EQLTY 4 COMMON',
+        'UNIFY CATEGORIES',
+        'DTYPES COMP',
+        'COMPARE VALUES',
+        'JOINED DF',
+        'DIFF FILES',
+        'RETURN',
+        'EXPORTS',
+    ]
+    assert (profile_df['wall_time'] >= 0).all()
+    assert (profile_df['mem_peak'] >= 0).all()
+    assert profile_df.loc['COPY', 'df1_shape'] == bdf.df1.shape
+    assert '# Profiling stages\n' in returned[2]['report']
+    assert '|COMPARE VALUES  |' in returned[2]['report']
+    # tracemalloc is stopped if it was started by compare()
+    assert tracemalloc.is_tracing() is False
+
+    # Returning early
+    returned = pd_compare.compare(df1=bdf.df1, df2=bdf.df1, report_print=False, profile=True)
+    assert list(returned[2]['profile'].index) == ['COPY', 'EQLTY FULL']
+
+    # tracemalloc is stopped if a stage raises
+    def raising_comparator(series1, series2):
+        raise RuntimeError('comparator error')
+
+    with pytest.raises(RuntimeError, match='comparator error'):
+        pd_compare.compare(
+            df1=bdf.df1,
+            df2=bdf.df2_diff_values,
+            report_print=False,
+            comparators={'col_int': raising_comparator},
+            profile=True,
+        )
+    assert tracemalloc.is_tracing() is False
+
+    # tracemalloc is stopped if the comparison is abandoned
+    results = pd_compare.compare_iter(
+        df1=bdf.df1, df2=bdf.df2_diff_values, report_print=False, profile=True
+    )
+    next(results)
+    assert tracemalloc.is_tracing() is True
+    results.close()
+    assert tracemalloc.is_tracing() is False
+
+
+def test_progress():
+    bdf = BaseDF()
+
+    with pytest.raises(ValueError, match=re.escape('progress must be None or a function.')):
+        pd_compare.compare(df1=bdf.df1, df2=bdf.df2_diff_values, progress=1)
+
+    events = []
+    pd_compare.compare(
+        df1=bdf.df1,
+        df2=bdf.df2_diff_values,
+        report_print=False,
+        progress=lambda event, stage, fraction: events.append((event, stage, fraction)),
+    )
+    # Every stage starts and ends, in order
+    stages_events = [event for event in events if event[0] != 'progress']
+    assert stages_events[:4] == [
+        ('start', 'COPY', 0.0),
+        ('end', 'COPY', 1.0),
+        ('start', 'EQLTY FULL', 0.0),
+        ('end', 'EQLTY FULL', 1.0),
+    ]
+    assert stages_events[-2:] == [('start', 'RETURN', 0.0), ('end', 'RETURN', 1.0)]
+    assert stages_events[::2] == [('start', stage, 0.0) for _, stage, _ in stages_events[1::2]]
+    # Fractional progress while comparing values
+    values_fractions = [fraction for event, stage, fraction in events if event == 'progress']
+    assert all(stage == 'COMPARE VALUES' for event, stage, _ in events if event == 'progress')
+    assert values_fractions == sorted(values_fractions)
+    assert values_fractions[-1] == 1.0
+
+
+def test_deadline_and_cancel_event(tmp_path):
+    bdf = BaseDF()
+
+    with pytest.raises(
+        ValueError,
+        match=re.escape('deadline must be None or a number (seconds since the epoch).'),
+    ):
+        pd_compare.compare(df1=bdf.df1, df2=bdf.df2_diff_values, deadline='now')
+    with pytest.raises(
+        ValueError,
+        match=re.escape(
+            'cancel_event must be None or an event with an is_set() method, like threading.Event.'
+        ),
+    ):
+        pd_compare.compare(df1=bdf.df1, df2=bdf.df2_diff_values, cancel_event=True)
+
+    # Not cancelled
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=bdf.df2_diff_values,
+        report_print=False,
+        deadline=time.time() + 3600,
+        cancel_event=threading.Event(),
+    )
+    assert returned[2]['cancelled'] is False
+    assert 'joined_df' in returned[2]['variables']
+    # No 'cancelled' key if cancellation can't happen
+    returned = pd_compare.compare(df1=bdf.df1, df2=bdf.df2_diff_values, report_print=False)
+    assert 'cancelled' not in returned[2]
+
+    # Deadline reached before starting
+    returned = pd_compare.compare(
+        df1=bdf.df1, df2=bdf.df2_diff_values, report_print=False, deadline=time.time() - 1
+    )
+    assert returned[0] is False
+    assert returned[1] is False
+    assert returned[2]['cancelled'] is True
+    assert returned[2]['variables'] == {}
+    assert (
+        '# Cancelled\n'
+        + '  (deadline reached)\n'
+        + '> ⛔ Stage COPY and the next ones were not done\n'
+    ) in returned[2]['report']
+
+    # Event set while comparing values, the metadata gathered so far is returned
+    cancel_event = threading.Event()
+
+    def progress(event, stage, fraction):
+        if stage == 'COMPARE VALUES' and event == 'progress':
+            cancel_event.set()
+
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=bdf.df2_diff_values,
+        report_print=False,
+        progress=progress,
+        cancel_event=cancel_event,
+    )
+    assert returned[2]['cancelled'] is True
+    assert returned[2]['variables']['common_cols_dtypes_equality'] is True
+    assert 'equality_df' not in returned[2]['variables']
+    assert (
+        '# Cancelled\n'
+        + '  (cancel_event set)\n'
+        + '> ⛔ Stage COMPARE VALUES and the next ones were not done\n'
+    ) in returned[2]['report']
+
+    # Event set after planning the files, they are not saved
+    cancel_event = threading.Event()
+
+    def progress(event, stage, fraction):
+        if stage == 'DIFF FILES' and event == 'end':
+            cancel_event.set()
+
+    xls_path = tmp_path / 'compare.xlsx'
+    diff_path = tmp_path / 'diff'
+    returned = pd_compare.compare(
+        df1=bdf.df1,
+        df2=bdf.df2_diff_values,
+        report_print=False,
+        xls_path=str(xls_path),
+        diff_path=str(diff_path),
+        diff_format='csv',
+        progress=progress,
+        cancel_event=cancel_event,
+    )
+    assert returned[2]['cancelled'] is True
+    assert 'joined_df' in returned[2]['variables']
+    for var_name in ('xls_path', 'xls_sheets', 'diff_files'):
+        assert var_name not in returned[2]['variables']
+    assert not xls_path.exists()
+    assert not diff_path.exists()
+    assert (
+        '> ⛔ Stage RETURN and the next ones were not done\n'
+        + f'> ⛔ Files not saved (count={1 + len(_module_diff_files.DIFF_FILES_NAMES)}):\n'
+        + f"  ['{os.path.realpath(xls_path)}',\n"
+    ) in returned[2]['report']
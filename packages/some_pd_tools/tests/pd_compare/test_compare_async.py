@@ -0,0 +1,122 @@
+import asyncio
+import concurrent.futures
+import re
+import time
+
+import pytest
+
+from some_pd_tools import pd_compare
+
+from ..basedf import BaseDF
+
+
+def _slow_comparator(values1, values2):
+    '''A comparator taking some time, module level so it can be pickled.'''
+    time.sleep(2)
+    return (values1 == values2).to_numpy()
+
+
+def test_wrong_executor():
+    bdf = BaseDF()
+
+    with pytest.raises(
+        ValueError,
+        match=re.escape("executor must be 'thread', 'process' or a concurrent.futures.Executor."),
+    ):
+        asyncio.run(pd_compare.compare_async(bdf.df1, bdf.df2_diff_values, executor='fiber'))
+    with pytest.raises(
+        ValueError,
+        match=re.escape(
+            "progress, cancel_event and export_in_background can't be used with a process executor."
+        ),
+    ):
+        asyncio.run(
+            pd_compare.compare_async(
+                bdf.df1, bdf.df2_diff_values, executor='process', progress=print
+            )
+        )
+    # Parameters are validated like in compare()
+    with pytest.raises(ValueError, match=re.escape('diff_stats must be of type bool.')):
+        asyncio.run(pd_compare.compare_async(bdf.df1, bdf.df2_diff_values, diff_stats=1))
+
+
+def test_same_result_as_compare():
+    bdf = BaseDF()
+    expected = pd_compare.compare(bdf.df1, bdf.df2_diff_values, report_print=False, diff_stats=True)
+
+    async def compare_concurrently():
+        return await asyncio.gather(
+            pd_compare.compare_async(
+                bdf.df1, bdf.df2_diff_values, report_print=False, diff_stats=True
+            ),
+            pd_compare.compare_async(
+                bdf.df1,
+                bdf.df2_diff_values,
+                executor=concurrent.futures.ThreadPoolExecutor(max_workers=1),
+                report_print=False,
+                diff_stats=True,
+            ),
+            pd_compare.compare_async(
+                bdf.df1,
+                bdf.df2_diff_values,
+                executor='process',
+                report_print=False,
+                diff_stats=True,
+            ),
+        )
+
+    for returned in asyncio.run(compare_concurrently()):
+        assert returned[0] == expected[0]
+        assert returned[1] == expected[1]
+        assert returned[2]['report'] == expected[2]['report']
+        assert returned[2]['variables']['diff_stats_df'].equals(
+            expected[2]['variables']['diff_stats_df']
+        )
+
+
+def test_task_cancellation():
+    bdf = BaseDF()
+    stages = []
+
+    async def cancel_while_comparing():
+        task = asyncio.create_task(
+            pd_compare.compare_async(
+                bdf.df1,
+                bdf.df2_diff_values,
+                report_print=False,
+                progress=lambda event, stage, fraction: stages.append(stage),
+            )
+        )
+        # Cancelled as soon as the first stage is done
+        while len(stages) == 0:
+            await asyncio.sleep(0)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel_while_comparing())
+    assert 'RETURN' not in stages
+
+
+def test_process_task_cancellation():
+    bdf = BaseDF()
+
+    async def cancel_while_comparing():
+        task = asyncio.create_task(
+            pd_compare.compare_async(
+                bdf.df1,
+                bdf.df2_diff_values,
+                executor='process',
+                report_print=False,
+                comparators={'col_int': _slow_comparator},
+            )
+        )
+        await asyncio.sleep(0.5)
+        task.cancel()
+        # The event loop isn't blocked until the worker ends
+        cancelled_at = time.perf_counter()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return time.perf_counter() - cancelled_at
+
+    assert asyncio.run(cancel_while_comparing()) < 1
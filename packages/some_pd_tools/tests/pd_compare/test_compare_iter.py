@@ -0,0 +1,69 @@
+import re
+
+import pytest
+
+from some_pd_tools import pd_compare
+
+from ..basedf import BaseDF
+
+
+def test_wrong_params():
+    bdf = BaseDF()
+
+    results = pd_compare.compare_iter(bdf.df1, bdf.df2_diff_values, diff_stats=1)
+    # Validated when requesting the first result
+    with pytest.raises(ValueError, match=re.escape('diff_stats must be of type bool.')):
+        next(results)
+
+
+def test_all_stages():
+    bdf = BaseDF()
+    expected = pd_compare.compare(bdf.df1, bdf.df2_diff_values, report_print=False)
+
+    results = list(pd_compare.compare_iter(bdf.df1, bdf.df2_diff_values, report_print=False))
+    assert [result['stage'] for result in results] == [
+        'COPY',
+        'EQLTY FULL',
+        'COMPARE COLUMNS',
+        'COMPARE INDEXES',
+        'EQLTY 4 COMMON',
+        'UNIFY CATEGORIES',
+        'DTYPES COMP',
+        'COMPARE VALUES',
+        'JOINED DF',
+        'RETURN',
+    ]
+    assert [result['done'] for result in results] == [False] * 9 + [True]
+    assert all(result['result'] is None for result in results[:-1])
+    # The metadata is gathered stage by stage
+    assert 'cols_compare_equality' not in results[1]['equality_metadata']['variables']
+    assert results[2]['equality_metadata']['variables']['cols_compare_equality'] is True
+    assert results[2]['report'].startswith('————————————————————\n# Equality check\n')
+
+    returned = results[-1]['result']
+    assert returned[0] is expected[0]
+    assert returned[1] is expected[1]
+    assert returned[2]['report'] == expected[2]['report']
+    assert results[-1]['report'] == expected[2]['report']
+
+
+def test_stop_early():
+    bdf = BaseDF()
+    stages = []
+
+    for result in pd_compare.compare_iter(
+        bdf.df1,
+        bdf.df2_diff_values,
+        report_print=False,
+        progress=lambda event, stage, fraction: stages.append(stage),
+    ):
+        if result['stage'] == 'DTYPES COMP':
+            assert result['equality_metadata']['variables']['common_cols_dtypes_equality'] is True
+            break
+    # Values are never compared
+    assert 'COMPARE VALUES' not in stages
+
+    # Equal DataFrames, returns after the full equality check
+    results = list(pd_compare.compare_iter(bdf.df1, bdf.df1.copy(), report_print=False))
+    assert [result['stage'] for result in results] == ['COPY', 'EQLTY FULL']
+    assert results[-1]['result'][0] is True
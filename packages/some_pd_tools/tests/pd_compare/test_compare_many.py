@@ -0,0 +1,102 @@
+import functools
+import re
+
+import pandas as pd
+import pytest
+
+from some_pd_tools import pd_compare
+
+from ..basedf import BaseDF
+
+
+def _load_df1() -> pd.DataFrame:
+    return BaseDF().df1
+
+
+def _load_df(name: str) -> pd.DataFrame:
+    return getattr(BaseDF(), name)
+
+
+def test_wrong_params():
+    bdf = BaseDF()
+
+    with pytest.raises(
+        ValueError, match=re.escape('pairs must be a dict whose values are (df1, df2) tuples.')
+    ):
+        pd_compare.compare_many({'pair': (bdf.df1,)})
+    for n_jobs in (0, -2, 1.5, True):
+        with pytest.raises(ValueError, match=re.escape('n_jobs must be a positive integer or -1.')):
+            pd_compare.compare_many({'pair': (bdf.df1, bdf.df1)}, n_jobs=n_jobs)
+    with pytest.raises(ValueError, match=re.escape('return_results must be of type bool.')):
+        pd_compare.compare_many({'pair': (bdf.df1, bdf.df1)}, return_results=1)
+    with pytest.raises(ValueError, match=re.escape('progress must be None or a function.')):
+        pd_compare.compare_many({'pair': (bdf.df1, bdf.df1)}, progress=1)
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_compare_many(tmp_path, n_jobs):
+    bdf = BaseDF()
+    bdf.df1.to_pickle(tmp_path / 'df1.pickle')
+    bdf.df2_diff_values.to_pickle(tmp_path / 'df2.pkl')
+
+    pairs = {
+        'files': (str(tmp_path / 'df1.pickle'), str(tmp_path / 'df2.pkl')),
+        'functions': (_load_df1, functools.partial(_load_df, 'df1')),
+        'dataframes': (bdf.df1, bdf.df2_diff_values),
+        'missing_file': (str(tmp_path / 'missing.parquet'), bdf.df1),
+        'unknown_extension': (str(tmp_path / 'df1.txt'), bdf.df1),
+    }
+    progress_calls = []
+    summary_df, results = pd_compare.compare_many(
+        pairs,
+        n_jobs=n_jobs,
+        return_results=True,
+        progress=lambda *args: progress_calls.append(args),
+        df1_name=bdf.df1_name,
+    )
+    expected = pd_compare.compare(
+        bdf.df1, bdf.df2_diff_values, report_print=False, df1_name=bdf.df1_name
+    )
+
+    assert list(summary_df.index) == list(pairs)
+    assert list(summary_df.columns) == [
+        'equality_full',
+        'equality_partial',
+        'cols_diff_count',
+        'rows_diff_count',
+        'seconds',
+        'error',
+        'report',
+    ]
+    for name in ('files', 'dataframes'):
+        assert not summary_df.loc[name, 'equality_full']
+        assert summary_df.loc[name, 'cols_diff_count'] == 4
+        assert summary_df.loc[name, 'rows_diff_count'] == 3
+        assert summary_df.loc[name, 'error'] is None
+        assert summary_df.loc[name, 'report'] == expected[2]['report']
+        assert results[name][2]['report'] == expected[2]['report']
+    assert summary_df.loc['functions', 'equality_full']
+    assert summary_df.loc['functions', 'cols_diff_count'] == 0
+    # Failures don't stop the other pairs
+    assert 'FileNotFoundError' in summary_df.loc['missing_file', 'error']
+    assert "Unknown file extension '.txt'" in summary_df.loc['unknown_extension', 'error']
+    assert results['missing_file'] is None
+    assert summary_df.loc['missing_file', 'equality_full'] is pd.NA
+    assert (summary_df['seconds'] >= 0).all()
+
+    assert sorted(name for _, name, _ in progress_calls) == sorted(pairs)
+    assert [fraction for _, _, fraction in progress_calls] == [0.2, 0.4, 0.6, 0.8, 1.0]
+
+
+def test_largest_first():
+    bdf = BaseDF()
+    order = []
+    pd_compare.compare_many(
+        {
+            'small': (bdf.df1.iloc[:1], bdf.df1.iloc[:1]),
+            'large': (pd.concat([bdf.df1] * 10), pd.concat([bdf.df1] * 10)),
+            'function': (_load_df1, _load_df1),
+        },
+        progress=lambda event, name, fraction: order.append(name),
+    )
+    assert order == ['large', 'small', 'function']
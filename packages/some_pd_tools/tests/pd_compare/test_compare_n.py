@@ -0,0 +1,139 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from some_pd_tools import pd_compare
+
+from ..basedf import BaseDF
+
+
+def test_wrong_params():
+    bdf = BaseDF()
+
+    with pytest.raises(ValueError, match=re.escape('df1 must be of type pd.DataFrame.')):
+        pd_compare.compare_n([1, 2], {'df2': bdf.df2})
+    for dfs in ({}, [bdf.df2], {'df2': [1, 2]}):
+        with pytest.raises(
+            ValueError, match=re.escape('dfs must be a non empty dict whose values are DataFrames.')
+        ):
+            pd_compare.compare_n(bdf.df1, dfs)
+    with pytest.raises(ValueError, match=re.escape('dfs must contain at most 64 DataFrames.')):
+        pd_compare.compare_n(bdf.df1, {f'df_{num}': bdf.df2 for num in range(65)})
+    for df1_name, dfs in (('df1', {1: bdf.df2}), (1, {'df2': bdf.df2}), ('df1', {'df1': bdf.df2})):
+        with pytest.raises(
+            ValueError,
+            match=re.escape('df1_name and the keys of dfs must be of type str and all different.'),
+        ):
+            pd_compare.compare_n(bdf.df1, dfs, df1_name=df1_name)
+    df_dup_idxs = bdf.df2
+    df_dup_idxs.index = [0, 0, 1, 2]
+    with pytest.raises(
+        ValueError,
+        match=re.escape('df1 and the DataFrames in dfs cannot have duplicated columns or indexes.'),
+    ):
+        pd_compare.compare_n(bdf.df1, {'df2': df_dup_idxs})
+    with pytest.raises(ValueError, match=re.escape('report_print must be of type bool.')):
+        pd_compare.compare_n(bdf.df1, {'df2': bdf.df2}, report_print=1)
+
+
+def test_equal():
+    bdf = BaseDF()
+
+    equality, metadata = pd_compare.compare_n(
+        bdf.df1, {'df2': bdf.df2, 'df3': bdf.df2_as_object}, report_print=False
+    )
+    assert equality is True
+    assert (metadata['summary_df'] == 0).all(axis=None)
+    assert metadata['diff_mask_df'].dtypes.eq('uint8').all()
+    assert (metadata['diff_mask_df'] == 0).all(axis=None)
+    assert len(metadata['mask_values_df'].index) == 0
+    assert '✅ All values are equal' in metadata['report']
+    assert metadata['report'].endswith('<<< 🥳 Equal >>>\n')
+
+
+def test_bitmask(capsys):
+    df1 = pd.DataFrame({'col_1': [1, 2, 3, 4], 'col_2': ['a', 'b', 'c', 'd']})
+    df_a = df1.copy()
+    df_a.loc[0, 'col_1'] = 10
+    df_b = df1.copy()
+    df_b.loc[[0, 1], 'col_1'] = [10, 20]
+    df_b['col_extra'] = 0
+    df_c = df1.drop(index=3)
+    df_c.loc[2, 'col_2'] = 'x'
+
+    equality, metadata = pd_compare.compare_n(df1, {'a': df_a, 'b': df_b, 'c': df_c})
+    assert equality is False
+    assert capsys.readouterr().out == metadata['report']
+
+    assert metadata['cols_common_list_sorted'] == ['col_1', 'col_2']
+    assert metadata['idxs_common_list_sorted'] == [0, 1, 2]
+    pd.testing.assert_frame_equal(
+        metadata['diff_mask_df'],
+        pd.DataFrame(
+            {
+                'col_1': np.array([0b011, 0b010, 0], dtype='uint8'),
+                'col_2': np.array([0, 0, 0b100], dtype='uint8'),
+            },
+            index=pd.Index([0, 1, 2]),
+        ),
+    )
+    pd.testing.assert_frame_equal(
+        metadata['diff_counts_df'],
+        pd.DataFrame({'a': [1, 0], 'b': [2, 0], 'c': [0, 1]}, index=pd.Index(['col_1', 'col_2'])),
+    )
+    pd.testing.assert_frame_equal(
+        metadata['summary_df'],
+        pd.DataFrame(
+            [[0, 0, 0, 0, 1, 1, 1], [0, 1, 0, 0, 1, 2, 2], [0, 0, 1, 0, 1, 1, 1]],
+            index=['a', 'b', 'c'],
+            columns=[
+                'cols_missing',
+                'cols_extra',
+                'idxs_missing',
+                'idxs_extra',
+                'cols_diff',
+                'rows_diff',
+                'cells_diff',
+            ],
+        ),
+    )
+    assert list(metadata['mask_values_df'].itertuples(index=False, name=None)) == [
+        (0b010, ('b',), 1),
+        (0b011, ('a', 'b'), 1),
+        (0b100, ('c',), 1),
+    ]
+    assert 'comparing only the columns (count=2) and indexes (count=3)' in metadata['report']
+
+
+def test_mask_dtype():
+    df1 = pd.DataFrame({'col_1': [1, 2]})
+    dfs = {f'df_{num}': df1 + 1 if num == 15 else df1 for num in range(16)}
+
+    _, metadata = pd_compare.compare_n(df1, dfs, report_print=False)
+    assert metadata['diff_mask_df'].dtypes.eq('uint16').all()
+    assert list(metadata['diff_mask_df']['col_1']) == [1 << 15, 1 << 15]
+    assert list(metadata['mask_values_df'].itertuples(index=False, name=None)) == [
+        (1 << 15, ('df_15',), 2)
+    ]
+
+
+def test_comparators_and_categories():
+    df1 = pd.DataFrame(
+        {'col_float': [1.0, 2.0], 'col_cat': pd.Categorical(['a', 'b'], categories=['a', 'b'])}
+    )
+    df2 = pd.DataFrame(
+        {
+            'col_float': [1.0000001, 2.5],
+            'col_cat': pd.Categorical(['a', 'b'], categories=['b', 'a', 'c']),
+        }
+    )
+
+    _, metadata = pd_compare.compare_n(
+        df1,
+        {'df2': df2},
+        comparators={'col_float': pd_compare.float_tolerance_comparator()},
+        report_print=False,
+    )
+    assert metadata['diff_counts_df'].to_dict() == {'df2': {'col_cat': 0, 'col_float': 1}}
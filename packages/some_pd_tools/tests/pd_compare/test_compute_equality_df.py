@@ -1,5 +1,6 @@
 import re
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -162,3 +163,191 @@ def test_diff_values():
     assert str(expected_df[['col_nan']]) == str(equality_df[['col_nan']])
     assert str(expected_df[['col_strnan']]) == str(equality_df[['col_strnan']])
     assert expected_df.equals(equality_df)
+
+
+def test_missing_values():
+    df1 = pd.DataFrame(
+        {
+            'col_float': [1.0, np.nan, 3.0],
+            'col_datetime': pd.to_datetime(['2020-01-01', None, '2020-01-03']),
+            'col_int_nullable': pd.array([1, None, 3], dtype='Int64'),
+            'col_str_nullable': pd.array(['a', None, 'c'], dtype='string'),
+            'col_obj': ['a', None, pd.NA],
+        }
+    )
+    df2 = df1.copy()
+    df2.iloc[2, :4] = [4.0, pd.Timestamp('2021-01-01'), 4, 'd']
+    expected_df = pd.DataFrame(
+        {
+            'col_float': [True, True, False],
+            'col_datetime': [True, True, False],
+            'col_int_nullable': [True, True, False],
+            'col_str_nullable': [True, True, False],
+            'col_obj': [True, True, True],
+        }
+    )
+
+    # same dtypes
+    # ************************************
+    equality_df = pd_compare.compute_equality_df(df1=df1, df2=df2)
+    assert expected_df.equals(equality_df)
+
+    # nullable dtypes compared to object (pd.NA can't be compared directly)
+    # ************************************
+    equality_df = pd_compare.compute_equality_df(df1=df1, df2=df2.astype(object))
+    assert expected_df.equals(equality_df)
+
+
+def test_same_dtype_columns():
+    # Columns with the same numpy dtype are compared together, including not contiguous ones
+    df1 = pd.DataFrame(
+        {
+            'col_float1': [1.0, np.nan, 3.0, np.nan],
+            'col_int': [1, 2, 3, 4],
+            'col_datetime': pd.to_datetime(['2020-01-01', None, '2020-01-03', None]),
+            'col_float2': [np.nan, 2.0, 3.0, 4.0],
+        }
+    )
+    df2 = pd.DataFrame(
+        {
+            'col_float1': [1.0, np.nan, np.nan, 4.0],
+            'col_int': [1, 2, 0, 4],
+            'col_datetime': pd.to_datetime(['2020-01-01', None, None, '2020-01-04']),
+            'col_float2': [np.nan, 2.0, 3.0, 0.0],
+        }
+    )
+    expected_df = pd.DataFrame(
+        {
+            'col_float1': [True, True, False, False],
+            'col_int': [True, True, False, True],
+            'col_datetime': [True, True, False, False],
+            'col_float2': [True, True, True, False],
+        }
+    )
+    equality_df = pd_compare.compute_equality_df(df1=df1, df2=df2)
+    assert expected_df.equals(equality_df)
+
+    # A single dtype for all columns
+    # ************************************
+    cols = ['col_float1', 'col_float2']
+    equality_df = pd_compare.compute_equality_df(df1=df1[cols], df2=df2[cols])
+    assert expected_df[cols].equals(equality_df)
+    equality_df = pd_compare.compute_equality_df(
+        df1=pd.DataFrame(df1[cols].to_numpy(), columns=cols),
+        df2=pd.DataFrame(df2[cols].to_numpy(), columns=cols),
+    )
+    assert expected_df[cols].equals(equality_df)
+
+
+def test_objects_not_comparable_directly():
+    # Values whose equality isn't a boolean (numpy arrays) and unhashable values
+    # ************************************
+    values1 = np.empty(6, dtype=object)
+    values1[:] = [np.array([1, 2]), np.array([1, 3]), [1], {'a': 1}, (1, 2), None]
+    values2 = np.empty(6, dtype=object)
+    values2[:] = [np.array([1, 2]), np.array([1, 2]), [1], {'a': 2}, (1, 2), np.nan]
+    equality_df = pd_compare.compute_equality_df(
+        df1=pd.DataFrame({'col_obj': values1}),
+        df2=pd.DataFrame({'col_obj': values2}),
+    )
+    assert equality_df['col_obj'].tolist() == [True, False, True, False, True, True]
+
+    # Hashable values, compared by joint factorization
+    # ************************************
+    values1 = np.empty(4, dtype=object)
+    values1[:] = [1, pd.NA, 'x', 2.0]
+    equality_df = pd_compare.compute_equality_df(
+        df1=pd.DataFrame({'col_int': pd.array([1, None, 2, 2], dtype='Int64')}),
+        df2=pd.DataFrame({'col_int': values1}),
+    )
+    assert equality_df['col_int'].tolist() == [True, True, False, True]
+
+
+def test_categorical():
+    df1 = pd.DataFrame({'col_cat': pd.Categorical(['a', 'b', None, 'q', 'a'])})
+    df2 = pd.DataFrame(
+        {'col_cat': pd.Categorical(['a', 'b', None, 'z', None], categories=['z', 'b', 'a'])}
+    )
+    equality_df = pd_compare.compute_equality_df(df1=df1, df2=df2)
+    assert equality_df['col_cat'].tolist() == [True, True, True, False, False]
+
+
+def test_comparators():
+    df1 = pd.DataFrame(
+        {
+            'col_float': [1.0, 2.0, np.nan],
+            'col_str': ['Hello  World', ' x', 'y'],
+            'd': [1.0, 2.0, 3.0],
+            'col_float2': [1.0, 2.0, 3.0],
+        }
+    )
+    df2 = pd.DataFrame(
+        {
+            'col_float': [1.0000001, 2.1, np.nan],
+            'col_str': ['hello world', 'X', None],
+            'd': [1.0000001, 2.0, 3.0],
+            'col_float2': [1.0000001, 2.0, 3.0],
+        }
+    )
+
+    # Wrong values
+    # ************************************
+    for comparators in ([], {'col_float': 1}):
+        with pytest.raises(
+            ValueError,
+            match=re.escape('comparators must be None or a dict whose values are functions.'),
+        ):
+            pd_compare.compute_equality_df(df1=df1, df2=df2, comparators=comparators)
+
+    # By column name
+    # ************************************
+    equality_df = pd_compare.compute_equality_df(
+        df1=df1,
+        df2=df2,
+        comparators={
+            'col_float': pd_compare.float_tolerance_comparator(),
+            'col_str': pd_compare.normalized_str_comparator(),
+        },
+    )
+    assert equality_df['col_float'].tolist() == [True, False, True]
+    assert equality_df['col_str'].tolist() == [True, True, False]
+    assert equality_df['d'].tolist() == [False, True, True]
+    assert equality_df['col_float2'].tolist() == [False, True, True]
+
+    # By dtype, a key that is a column name ('d' is also numpy's code for float64) is not a dtype
+    # ************************************
+    equality_df = pd_compare.compute_equality_df(
+        df1=df1,
+        df2=df2,
+        comparators={'d': pd_compare.float_tolerance_comparator()},
+    )
+    assert equality_df['d'].tolist() == [True, True, True]
+    assert equality_df['col_float2'].tolist() == [False, True, True]
+    equality_df = pd_compare.compute_equality_df(
+        df1=df1,
+        df2=df2,
+        comparators={'float64': pd_compare.float_tolerance_comparator()},
+    )
+    assert equality_df['col_float'].tolist() == [True, False, True]
+    assert equality_df['col_float2'].tolist() == [True, True, True]
+
+
+def test_progress():
+    bdf = BaseDF()
+
+    with pytest.raises(ValueError, match=re.escape('progress must be None or a function.')):
+        pd_compare.compute_equality_df(bdf.df1, bdf.df2_diff_values, progress=1)
+
+    # One call for every group of columns with the same numpy dtype ('a' and 'b', then 'd'),
+    # one for every other column
+    df1 = pd.DataFrame({'a': [1, 2], 'b': [3, 4], 'c': ['x', 'y'], 'd': [1.0, 2.0]})
+    fractions = []
+    pd_compare.compute_equality_df(df1, df1.copy(), progress=fractions.append)
+    assert fractions == [0.5, 0.75, 1.0]
+
+    # A single dtype
+    fractions = []
+    pd_compare.compute_equality_df(
+        df1[['a', 'b']], df1[['a', 'b']].copy(), progress=fractions.append
+    )
+    assert fractions == [1.0]
@@ -23,6 +23,7 @@ setup(
     install_requires=['pandas>=2'], # Might need review
     extras_require={
         'dev': ['pytest', 'twine', 'build'],
+        'diff': ['pyarrow'],
         # 'save_load': ['pytables>=3'],
     },
     python_requires='>=3.4',